@@ -0,0 +1,160 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Callable, Dict, List, Optional, Tuple
+
+from database_manager import DatabaseManager
+from pdf_export import (
+    DEFAULT_RENDERER, ExportCache, export_student_to_pdf, get_report_template, report_hash,
+    unique_pdf_names
+)
+
+# Rückmeldung über den Fortschritt: (fertige Schüler, Gesamtzahl)
+ProgressCallback = Callable[[int, int], None]
+
+# Renderer des jeweiligen Export-Prozesses, siehe _init_worker
+_worker_renderer: str = DEFAULT_RENDERER
+
+# Höchstens so viele Schüler pro Prozess gleichzeitig an den Pool übergeben,
+# damit die Daten nicht alle auf einmal im Speicher liegen
+_PENDING_PER_WORKER = 4
+
+def _init_worker(renderer: str) -> None:
+    """Bereitet einen Export-Prozess vor."""
+    global _worker_renderer
+    _worker_renderer = renderer
+    # Stile und Tabellenvorlagen einmal pro Prozess anlegen
+    get_report_template()
+
+def _export_student(report: Tuple[Tuple, Optional[Tuple], List[Tuple]],
+                    output_dir: str, name: str) -> str:
+    """Schreibt im Export-Prozess die PDF eines Schülers und gibt den Dateinamen zurück."""
+    (student_id, firstname, lastname, klass), student_details, work_titles = report
+    return export_student_to_pdf(
+        student_id, firstname, lastname, klass or "", student_details, work_titles,
+        output_dir, renderer=_worker_renderer, name=name
+    )
+
+def export_students_parallel(
+        db_path: str,
+        students: List[Tuple],
+        output_dir: str,
+        max_workers: Optional[int] = None,
+        progress: Optional[ProgressCallback] = None,
+        cancel_event: Optional[threading.Event] = None,
+        use_cache: bool = True,
+        renderer: str = DEFAULT_RENDERER
+    ) -> Tuple[List[str], List[Tuple[Tuple, str]]]:
+    """
+    Exportiert mehrere Schüler parallel in einem Prozesspool, je eine PDF pro Schüler.
+
+    Die Daten der Schüler werden im aufrufenden Prozess blockweise mit
+    DatabaseManager.iter_students_with_work_titles gelesen (zwei Abfragen pro
+    Block statt zwei pro Schüler) und an die Prozesse übergeben, die nur noch
+    die PDFs erstellen. Nach jedem fertigen Schüler wird progress aufgerufen.
+    Wird cancel_event gesetzt, werden keine weiteren Exporte begonnen und
+    die bereits an den Pool übergebenen, noch nicht gestarteten verworfen;
+    bereits laufende werden noch fertig geschrieben. Mit use_cache werden
+    Schüler übersprungen, deren PDF laut ExportCache noch aktuell ist; das
+    prüft der aufrufende Prozess, bevor ein Schüler an den Pool geht. Ist
+    nichts neu zu erstellen, wird der Pool gar nicht erst gestartet.
+
+    Die Prozesse werden auf allen Plattformen mit "spawn" gestartet: ein
+    fork aus dem QThread heraus kopiert die Sperren der übrigen Threads
+    (Oberfläche, DatabaseWorker) und kann den Export-Prozess blockieren.
+
+    Args:
+        db_path: Pfad zur SQLite-Datenbank
+        students: Schülerzeilen (id, firstname, lastname, class)
+        output_dir: Zielordner für die PDF-Dateien
+        max_workers: Anzahl Prozesse; None für die Anzahl der CPU-Kerne
+        progress: Optionaler Callback (fertig, gesamt), läuft im aufrufenden Thread
+        cancel_event: Optionales Event zum Abbrechen
+        use_cache: Unveränderte, bereits exportierte Schüler nicht neu erstellen
+        renderer: Einer von pdf_export.RENDERERS
+
+    Returns:
+        Tuple aus den erstellten Dateinamen und den Fehlern als (Schülerzeile, Meldung)
+    """
+    filenames: List[str] = []
+    errors: List[Tuple[Tuple, str]] = []
+    total = len(students)
+    if total == 0:
+        return filenames, errors
+
+    os.makedirs(output_dir, exist_ok=True)
+    cache = ExportCache(output_dir) if use_cache else None
+    workers = min(max_workers or os.cpu_count() or 1, total)
+    remaining = {student[0]: student for student in students}
+    # Gleichnamige Schüler einer Klasse nicht in dieselbe Datei schreiben
+    names = unique_pdf_names(students)
+    db = DatabaseManager(db_path, read_only=True)
+    # Erst beim ersten Schüler, dessen PDF neu erstellt werden muss
+    executor: Optional[ProcessPoolExecutor] = None
+    try:
+        reports = db.iter_students_with_work_titles(ids=list(remaining))
+        # Future -> (Schülerzeile, Prüfsumme der Eingaben für das Manifest)
+        pending: Dict[Future, Tuple[Tuple, Optional[str]]] = {}
+        done = 0
+        exhausted = False
+        while True:
+            cancelled = cancel_event is not None and cancel_event.is_set()
+            if cancelled:
+                # Noch nicht gestartete Exporte verwerfen, sie gelten als nicht exportiert
+                for future in [future for future in pending if future.cancel()]:
+                    del pending[future]
+            # Pool nachfüllen, solange Daten kommen und nicht abgebrochen wurde
+            while not cancelled and not exhausted and len(pending) < workers * _PENDING_PER_WORKER:
+                report = next(reports, None)
+                if report is None:
+                    exhausted = True
+                    break
+                (student_id, firstname, lastname, klass), student_details, work_titles = report
+                student = remaining.pop(student_id)
+                filename = os.path.join(output_dir, names[student_id])
+                digest = None
+                if cache is not None:
+                    digest = report_hash(firstname, lastname, klass or "", student_details,
+                                         work_titles, renderer)
+                    if cache.is_current(filename, digest):
+                        # Unverändert: weder Prozess noch Übertragung der Daten nötig
+                        filenames.append(filename)
+                        done += 1
+                        if progress is not None:
+                            progress(done, total)
+                        continue
+                    # Bis zum erfolgreichen Schreiben gilt die Datei als veraltet
+                    cache.forget(filename)
+                if executor is None:
+                    executor = ProcessPoolExecutor(
+                        max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                        initializer=_init_worker, initargs=(renderer,))
+                future = executor.submit(_export_student, report, output_dir, names[student_id])
+                pending[future] = (student, digest)
+            if not pending:
+                break
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                student, digest = pending.pop(future)
+                try:
+                    filename = future.result()
+                    filenames.append(filename)
+                    if cache is not None:
+                        cache.record(filename, digest)
+                except Exception as e:
+                    errors.append((student, str(e)))
+                done += 1
+                if progress is not None:
+                    progress(done, total)
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True)
+        db.close()
+
+    if exhausted:
+        # Nicht geliefert wurden nur Schüler, die inzwischen gelöscht wurden
+        errors.extend((student, "Schüler wurde inzwischen gelöscht") for student in remaining.values())
+    if cache is not None:
+        cache.save()
+    return filenames, errors
@@ -0,0 +1 @@
+"""Leistungsmessungen, aufzurufen aus dem Projektordner mit python -m benchmarks.<name>."""
@@ -0,0 +1,121 @@
+"""
+Misst die Laufzeit der DatabaseManager-Methoden bei verschiedenen Datenbankgrößen.
+
+Für jede Größe wird eine Testdatenbank erzeugt (benchmarks.generate_data)
+und auf einer Kopie gemessen, damit schreibende Methoden wie add_work_title
+und delete_student die Testdaten nicht verändern. Die Ergebnisse lassen
+sich als JSON speichern und mit einer früheren Messung vergleichen.
+
+Aufruf aus dem Projektordner:
+    python -m benchmarks.database [--groessen 100,2000,20000] [--arbeitstitel 10]
+        [--ausgabe ergebnis.json] [--baseline baseline.json] [--toleranz 0.25]
+"""
+import argparse
+import os
+import random
+import shutil
+import tempfile
+from typing import Callable, Dict, List, Optional
+
+from benchmarks.generate_data import FIRST_NAMES, LAST_NAMES, evaluation_text
+from benchmarks.harness import (
+    Results, dataset, measure, parse_sizes, print_results, report_baseline, save_results, summarize
+)
+from database_manager import DatabaseManager
+
+# Suchbegriffe abwechselnd: Namensteil, kurzer Begriff (LIKE), ganzer Name, ohne Treffer
+SEARCH_KEYWORDS = ("Mül", "an", "Schneider", "Sophie", "Xaver")
+EVALUATION_KEYWORDS = ("Perspektive", "Komposition", "zurückhaltend")
+
+def _cases(db: DatabaseManager, seed: int) -> Dict[str, Callable[[int], object]]:
+    """Die gemessenen Aufrufe; jeder erhält die laufende Nummer des Aufrufs."""
+    rng = random.Random(seed)
+    ids = [row[0] for row in db.conn.execute("SELECT id FROM students ORDER BY id")]
+    classes = db.get_unique_classes()
+    # Zu löschende Schüler vorab festlegen, damit jeder Aufruf einen anderen trifft
+    victims = rng.sample(ids, len(ids))
+    text = evaluation_text(random.Random(seed), rng.choice(FIRST_NAMES), 2)
+
+    def pick_class(i: int) -> str:
+        return classes[i % len(classes)]
+
+    return {
+        "get_students": lambda i: db.get_students(),
+        "get_students(Klasse)": lambda i: db.get_students(pick_class(i)),
+        "get_students_page": lambda i: db.get_students_page(None, 500),
+        "count_students": lambda i: db.count_students(),
+        "search_students": lambda i: db.search_students(SEARCH_KEYWORDS[i % len(SEARCH_KEYWORDS)]),
+        "search_students_ranked(Bewertungen)": lambda i: db.search_students_ranked(
+            EVALUATION_KEYWORDS[i % len(EVALUATION_KEYWORDS)], True),
+        "get_student_details": lambda i: db.get_student_details(rng.choice(ids)),
+        "get_work_titles": lambda i: db.get_work_titles(rng.choice(ids)),
+        "iter_students_with_work_titles(Klasse)": lambda i: sum(
+            1 for _ in db.iter_students_with_work_titles(pick_class(i))),
+        "get_unique_classes": lambda i: db.get_unique_classes(),
+        "add_student": lambda i: db.add_student(
+            rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES), pick_class(i)),
+        "add_work_title": lambda i: db.add_work_title(
+            rng.choice(ids), "Benchmark", "2", text, text, text, text, text, text),
+        "delete_student": lambda i: db.delete_student(victims[i % len(victims)]),
+    }
+
+def run(sizes: List[int], work_titles: int, repeat: int, data_dir: str,
+        seed: int = 1, only: Optional[List[str]] = None) -> Results:
+    results: Results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for students in sizes:
+            source = dataset(data_dir, students, work_titles, seed)
+            # Auf einer Kopie messen, die Testdaten bleiben unverändert
+            work_copy = os.path.join(tmp, f"bench_{students}.db")
+            shutil.copyfile(source, work_copy)
+            db = DatabaseManager(work_copy)
+            work_title_count = db.conn.execute("SELECT COUNT(*) FROM work_titles").fetchone()[0]
+            print(f"Messe {students} Schüler mit {work_title_count} Arbeitstiteln ...")
+            group: Dict[str, Dict[str, float]] = {}
+            try:
+                for name, case in _cases(db, seed).items():
+                    if only and name not in only:
+                        continue
+                    # Gelöscht werden kann höchstens jeder Schüler einmal
+                    runs = min(repeat, students - 1) if name == "delete_student" else repeat
+                    group[name] = summarize(measure(case, runs))
+            finally:
+                db.close()
+            results[f"{students} Schüler"] = group
+    return results
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Misst die DatabaseManager-Methoden bei verschiedenen Größen.")
+    parser.add_argument("--groessen", default="100,2000,20000",
+                        help="Anzahl Schüler je Testdatenbank, kommagetrennt (Standard: 100,2000,20000)")
+    parser.add_argument("--arbeitstitel", type=int, default=10,
+                        help="Durchschnittliche Arbeitstitel pro Schüler (Standard: 10)")
+    parser.add_argument("--wiederholungen", type=int, default=30,
+                        help="Messungen pro Methode und Größe (Standard: 30)")
+    parser.add_argument("--nur", action="append", default=None,
+                        help="Nur diese Messung (mehrfach angebbar)")
+    parser.add_argument("--daten", default=os.path.join(tempfile.gettempdir(), "schueler_benchmark"),
+                        help="Ordner für die wiederverwendeten Testdatenbanken")
+    parser.add_argument("--seed", type=int, default=1, help="Startwert für Testdaten und Zufallsauswahl")
+    parser.add_argument("--ausgabe", default=None, help="Ergebnisse als JSON hierhin schreiben")
+    parser.add_argument("--baseline", default=None, help="Mit diesen gespeicherten Ergebnissen vergleichen")
+    parser.add_argument("--toleranz", type=float, default=0.25,
+                        help="Erlaubte Verlangsamung des Medians als Anteil (Standard: 0.25)")
+    args = parser.parse_args(argv)
+
+    try:
+        sizes = parse_sizes(args.groessen)
+    except ValueError as e:
+        parser.error(str(e))
+    results = run(sizes, args.arbeitstitel, args.wiederholungen, args.daten, args.seed, args.nur)
+    print_results(results)
+    if args.ausgabe:
+        save_results(args.ausgabe, results, {
+            "groessen": sizes, "arbeitstitel": args.arbeitstitel,
+            "wiederholungen": args.wiederholungen, "seed": args.seed,
+        })
+        print(f"\nErgebnisse gespeichert: {args.ausgabe}")
+    return report_baseline(results, args.baseline, args.toleranz)
+
+if __name__ == "__main__":
+    raise SystemExit(main())
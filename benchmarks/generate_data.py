@@ -0,0 +1,174 @@
+"""
+Füllt eine Datenbank mit reproduzierbaren, realistisch aussehenden Testdaten.
+
+Vor- und Nachnamen, Klassen (5a bis 13d), Noten und mehrabsätzige
+Bewertungstexte werden aus einem festen Seed erzeugt; gleiche Parameter
+ergeben also immer dieselbe Datenbank. Das Schema legt DatabaseManager an,
+eingefügt wird in einer Transaktion mit executemany.
+
+Aufruf aus dem Projektordner:
+    python -m benchmarks.generate_data testdaten.db [--schueler 1000] [--arbeitstitel 5]
+"""
+import argparse
+import os
+import random
+import time
+from typing import Iterator, List, Optional, Tuple
+
+from database_manager import STUDENT_DETAIL_COLUMNS, WORK_TITLE_COLUMNS, DatabaseManager
+
+FIRST_NAMES = (
+    "Anna", "Ben", "Clara", "David", "Elif", "Emil", "Emma", "Felix", "Finn", "Greta",
+    "Hannah", "Henri", "Ida", "Jakob", "Jonas", "Julia", "Karl", "Lea", "Leon", "Lina",
+    "Luca", "Luisa", "Maja", "Marie", "Mats", "Mia", "Mila", "Moritz", "Noah", "Nora",
+    "Ole", "Paul", "Paula", "Philipp", "Sophie", "Theo", "Tim", "Yusuf", "Zoe", "Jürgen",
+    "Ömer", "Lukas", "Sarah", "Selin", "Tobias", "Vincent", "Merle", "Frieda", "Anton", "Lotta",
+)
+LAST_NAMES = (
+    "Müller", "Schmidt", "Schneider", "Fischer", "Weber", "Meyer", "Wagner", "Becker",
+    "Schulz", "Hoffmann", "Schäfer", "Koch", "Bauer", "Richter", "Klein", "Wolf",
+    "Schröder", "Neumann", "Schwarz", "Zimmermann", "Braun", "Krüger", "Hofmann", "Hartmann",
+    "Lange", "Schmitt", "Werner", "Schmitz", "Krause", "Meier", "Lehmann", "Schmid",
+    "Schulze", "Maier", "Köhler", "Herrmann", "König", "Walter", "Mayer", "Huber",
+    "Kaiser", "Fuchs", "Peters", "Lang", "Scholz", "Möller", "Weiß", "Jung", "Hahn", "Yılmaz",
+)
+WORK_TITLES = (
+    "Selbstporträt", "Stillleben mit Obst", "Landschaft in Aquarell", "Collage Stadt",
+    "Perspektivzeichnung", "Tonfigur", "Druckgrafik", "Farbkreis", "Comic-Geschichte",
+    "Architekturmodell", "Schattenstudie", "Plakatgestaltung", "Fotoserie", "Mosaik",
+)
+
+_OPENINGS = (
+    "{name} arbeitet im Unterricht", "Im laufenden Halbjahr zeigt {name}",
+    "Bei der Gestaltung der Aufgabe zeigt {name}", "Während der Gruppenarbeit wirkt {name}",
+    "Insgesamt präsentiert sich {name}",
+)
+_QUALITIES = (
+    "sorgfältig und konzentriert", "zuverlässig und selbstständig", "meist aufmerksam",
+    "mit großer Ausdauer", "gelegentlich etwas unruhig", "sehr kreativ und ideenreich",
+    "hilfsbereit gegenüber Mitschülerinnen und Mitschülern", "noch etwas zurückhaltend",
+)
+_DETAILS = (
+    "Die Materialien sind in der Regel vollständig vorhanden.",
+    "Arbeitsaufträge werden pünktlich und vollständig erledigt.",
+    "Die Farbwahl und Komposition überzeugen durch klare Entscheidungen.",
+    "Skizzen werden gründlich vorbereitet und sauber ausgearbeitet.",
+    "Beim Aufräumen des Arbeitsplatzes ist noch Unterstützung nötig.",
+    "Eigene Ideen werden im Gespräch nachvollziehbar begründet.",
+    "Techniken wie Schraffur und Lasur werden sicher angewendet.",
+    "Die Mitarbeit im Unterrichtsgespräch könnte noch aktiver sein.",
+    "Rückmeldungen werden aufgenommen und in der Überarbeitung umgesetzt.",
+    "Die Perspektive ist stimmig, Proportionen gelingen überwiegend.",
+)
+
+def class_codes(count: int) -> List[str]:
+    """Klassenbezeichnungen 5a, 5b, ... bis count Klassen (höchstens 9 Stufen à 4)."""
+    codes = [f"{grade}{letter}" for grade in range(5, 14) for letter in "abcd"]
+    return codes[:max(1, min(count, len(codes)))]
+
+def evaluation_text(rng: random.Random, name: str, paragraphs: int) -> str:
+    """Erzeugt einen Bewertungstext aus paragraphs Absätzen mit je 2 bis 5 Sätzen."""
+    result = []
+    for _ in range(paragraphs):
+        sentences = [f"{rng.choice(_OPENINGS).format(name=name)} {rng.choice(_QUALITIES)}."]
+        sentences.extend(rng.choice(_DETAILS) for _ in range(rng.randint(1, 4)))
+        result.append(" ".join(sentences))
+    return "\n\n".join(result)
+
+def generate_rows(students: int, work_titles: int, seed: int = 1, classes: int = 24,
+                  max_paragraphs: int = 3
+                  ) -> Iterator[Tuple[Tuple, List[Tuple]]]:
+    """
+    Liefert reproduzierbare Schüler als (Schülerspalten, Arbeitstitelspalten).
+
+    Schülerspalten: firstname, lastname, class und STUDENT_DETAIL_COLUMNS;
+    Arbeitstitelspalten je Titel: WORK_TITLE_COLUMNS. Die Anzahl der
+    Arbeitstitel schwankt um work_titles (0 bis 2 * work_titles).
+    """
+    rng = random.Random(seed)
+    codes = class_codes(classes)
+    for _ in range(students):
+        firstname = rng.choice(FIRST_NAMES)
+        lastname = rng.choice(LAST_NAMES)
+        details = tuple(
+            evaluation_text(rng, firstname, rng.randint(1, max_paragraphs))
+            for _ in STUDENT_DETAIL_COLUMNS
+        )
+        student = (firstname, lastname, rng.choice(codes)) + details
+        titles = []
+        for _ in range(rng.randint(0, 2 * work_titles) if work_titles else 0):
+            texts = tuple(
+                evaluation_text(rng, firstname, rng.randint(1, max_paragraphs))
+                for _ in WORK_TITLE_COLUMNS[2:]
+            )
+            titles.append((rng.choice(WORK_TITLES), str(rng.randint(1, 6))) + texts)
+        yield student, titles
+
+def generate_database(db_path: str, students: int, work_titles: int = 5, seed: int = 1,
+                      classes: int = 24, max_paragraphs: int = 3) -> Tuple[int, int]:
+    """
+    Legt db_path neu an und füllt sie mit generate_rows.
+
+    Returns:
+        Anzahl der angelegten Schüler und Arbeitstitel
+
+    Raises:
+        FileExistsError: Wenn db_path bereits existiert
+    """
+    if os.path.exists(db_path):
+        raise FileExistsError(f"Datenbank existiert bereits: {db_path}")
+    db = DatabaseManager(db_path)
+    student_sql = (
+        f"INSERT INTO students (firstname, lastname, class, {', '.join(STUDENT_DETAIL_COLUMNS)}) "
+        f"VALUES ({', '.join('?' * (3 + len(STUDENT_DETAIL_COLUMNS)))})"
+    )
+    work_title_sql = (
+        f"INSERT INTO work_titles (student_id, {', '.join(WORK_TITLE_COLUMNS)}) "
+        f"VALUES ({', '.join('?' * (1 + len(WORK_TITLE_COLUMNS)))})"
+    )
+    work_title_count = 0
+    try:
+        cursor = db.conn.cursor()
+        cursor.execute("BEGIN")
+        for student, titles in generate_rows(students, work_titles, seed, classes, max_paragraphs):
+            cursor.execute(student_sql, student)
+            student_id = cursor.lastrowid
+            cursor.executemany(work_title_sql, ((student_id,) + title for title in titles))
+            work_title_count += len(titles)
+        db.conn.commit()
+        db.conn.execute("ANALYZE")
+    except Exception:
+        db.conn.rollback()
+        raise
+    finally:
+        db.close()
+    return students, work_title_count
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Erzeugt eine Testdatenbank mit synthetischen Schülern.")
+    parser.add_argument("db_path", help="Pfad der neuen Datenbank")
+    parser.add_argument("--schueler", type=int, default=1000, help="Anzahl Schüler (Standard: 1000)")
+    parser.add_argument("--arbeitstitel", type=int, default=5,
+                        help="Durchschnittliche Arbeitstitel pro Schüler (Standard: 5)")
+    parser.add_argument("--klassen", type=int, default=24, help="Anzahl Klassen (Standard: 24)")
+    parser.add_argument("--absaetze", type=int, default=3,
+                        help="Höchstzahl Absätze pro Bewertungstext (Standard: 3)")
+    parser.add_argument("--seed", type=int, default=1, help="Startwert des Zufallsgenerators (Standard: 1)")
+    parser.add_argument("--ueberschreiben", action="store_true", help="Vorhandene Datei ersetzen")
+    args = parser.parse_args(argv)
+
+    if args.ueberschreiben and os.path.exists(args.db_path):
+        os.remove(args.db_path)
+    start = time.perf_counter()
+    try:
+        students, work_titles = generate_database(
+            args.db_path, args.schueler, args.arbeitstitel, args.seed, args.klassen, args.absaetze)
+    except FileExistsError as e:
+        print(f"{e} (mit --ueberschreiben ersetzen)")
+        return 1
+    print(f"{students} Schüler und {work_titles} Arbeitstitel in "
+          f"{time.perf_counter() - start:.1f} s nach {args.db_path} geschrieben.")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
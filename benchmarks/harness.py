@@ -0,0 +1,156 @@
+"""
+Gemeinsame Hilfen der Benchmarks: Zeitmessung, Perzentile, Ergebnisse als
+JSON und Vergleich mit einer gespeicherten Baseline.
+
+Ergebnisse haben die Form {"meta": {...}, "results": {Gruppe: {Messung: Kennzahlen}}};
+Gruppe ist z. B. eine Datenbankgröße, Kennzahlen kommen aus summarize().
+"""
+import json
+import os
+import platform
+import sqlite3
+import sys
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from benchmarks.generate_data import generate_database
+
+Results = Dict[str, Dict[str, Dict[str, float]]]
+
+def measure(func: Callable[[int], Any], repeat: int, warmup: int = 1) -> List[float]:
+    """Ruft func(i) warmup + repeat mal auf und gibt die gemessenen Sekunden zurück."""
+    for i in range(warmup):
+        func(i)
+    timings = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        func(warmup + i)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+def percentile(values: Sequence[float], fraction: float) -> float:
+    """Perzentil mit linearer Interpolation, fraction zwischen 0 und 1."""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    position = (len(ordered) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+def summarize(timings: Sequence[float]) -> Dict[str, float]:
+    """Kennzahlen einer Messreihe in Millisekunden."""
+    return {
+        "runs": len(timings),
+        "min_ms": min(timings) * 1000,
+        "median_ms": percentile(timings, 0.5) * 1000,
+        "p90_ms": percentile(timings, 0.9) * 1000,
+        "p95_ms": percentile(timings, 0.95) * 1000,
+        "p99_ms": percentile(timings, 0.99) * 1000,
+        "max_ms": max(timings) * 1000,
+    }
+
+def environment() -> Dict[str, str]:
+    """Angaben zur Umgebung, damit Ergebnisse vergleichbar bleiben."""
+    return {
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": str(os.cpu_count()),
+    }
+
+def save_results(path: str, results: Results, parameters: Optional[Dict[str, Any]] = None) -> None:
+    data = {"meta": environment(), "parameters": parameters or {}, "results": results}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=1)
+
+def load_results(path: str) -> Results:
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, dict) or not isinstance(data.get("results"), dict):
+        raise ValueError(f"Keine Benchmark-Ergebnisse in {path}")
+    return data["results"]
+
+def compare(results: Results, baseline: Results, tolerance: float = 0.25,
+            metric: str = "median_ms", min_delta: float = 0.05) -> List[str]:
+    """
+    Vergleicht results mit baseline und gibt die Regressionen als Meldungen zurück.
+
+    Eine Messung gilt als langsamer, wenn metric um mehr als tolerance (Anteil)
+    und zugleich um mehr als min_delta (in der Einheit von metric) über der
+    Baseline liegt. Die zweite Schwelle verhindert Fehlalarme bei sehr
+    kurzen Messungen, die vor allem Rauschen sind. Kennzahlen, bei denen
+    größer besser ist (z. B. Durchsatz), enden auf "_per_second".
+    """
+    regressions = []
+    higher_is_better = metric.endswith("_per_second")
+    for group, measurements in results.items():
+        for name, values in measurements.items():
+            base = baseline.get(group, {}).get(name, {}).get(metric)
+            value = values.get(metric)
+            if base is None or value is None or base <= 0:
+                continue
+            ratio = value / base
+            if higher_is_better:
+                slower = ratio < 1 - tolerance and base - value > min_delta
+            else:
+                slower = ratio > 1 + tolerance and value - base > min_delta
+            if slower:
+                regressions.append(f"{group} / {name}: {metric} {base:.3f} -> {value:.3f} ({ratio:.2f}x)")
+    return regressions
+
+def print_results(results: Results, metrics: Sequence[str] = ("median_ms", "p95_ms", "max_ms")) -> None:
+    """Gibt die Ergebnisse als Tabelle je Gruppe aus."""
+    for group, measurements in results.items():
+        print(f"\n{group}")
+        width = max((len(name) for name in measurements), default=0)
+        print(f"  {'':<{width}}  " + "  ".join(f"{metric:>14}" for metric in metrics))
+        for name, values in measurements.items():
+            cells = "  ".join(f"{values.get(metric, float('nan')):14.3f}" for metric in metrics)
+            print(f"  {name:<{width}}  {cells}")
+
+def report_baseline(results: Results, baseline_path: Optional[str], tolerance: float,
+                    metric: str = "median_ms", min_delta: float = 0.05) -> int:
+    """Vergleicht mit der Baseline (falls angegeben) und gibt den Exit-Code zurück."""
+    if not baseline_path:
+        return 0
+    regressions = compare(results, load_results(baseline_path), tolerance, metric, min_delta)
+    if not regressions:
+        print(f"\nKeine Regressionen gegenüber {baseline_path} (Toleranz {tolerance:.0%}).")
+        return 0
+    print(f"\nRegressionen gegenüber {baseline_path} (Toleranz {tolerance:.0%}):")
+    for message in regressions:
+        print(f"  {message}")
+    return 1
+
+def parse_sizes(text: str) -> List[int]:
+    """Liest eine Liste von Größen wie "100,2000,20000"."""
+    try:
+        sizes = [int(part) for part in text.split(",") if part.strip()]
+    except ValueError:
+        raise ValueError(f"Ungültige Größenangabe: {text}")
+    if not sizes or min(sizes) <= 0:
+        raise ValueError(f"Ungültige Größenangabe: {text}")
+    return sizes
+
+def dataset(directory: str, students: int, work_titles: int, seed: int = 1,
+            max_paragraphs: int = 3) -> str:
+    """
+    Pfad einer generierten Testdatenbank; sie wird nur beim ersten Mal erzeugt.
+
+    Dieselben Parameter ergeben dieselben Daten, deshalb kann ein Ordner
+    (--daten) über mehrere Läufe wiederverwendet werden.
+    """
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"bench_{students}s_{work_titles}w_{max_paragraphs}p_seed{seed}.db")
+    if not os.path.exists(path):
+        print(f"Erzeuge Testdaten: {students} Schüler, etwa {work_titles} Arbeitstitel pro Schüler ...")
+        partial = path + ".partial"
+        if os.path.exists(partial):
+            os.remove(partial)
+        generate_database(partial, students, work_titles, seed, max_paragraphs=max_paragraphs)
+        os.replace(partial, path)
+    return path
@@ -0,0 +1,133 @@
+"""
+Vergleicht die PDF-Renderer "platypus" und "canvas" (pdf_export.RENDERERS).
+
+Erstellt für synthetische Schüler je eine PDF mit beiden Renderern, misst
+die Zeit pro Schüler und prüft, dass beide PDFs denselben Text in derselben
+Reihenfolge enthalten (Zeilenumbrüche werden dabei ignoriert).
+
+Aufruf aus dem Projektordner:
+    python -m benchmarks.pdf_renderers [--schueler 200] [--arbeitstitel 4]
+"""
+import argparse
+import base64
+import random
+import re
+import statistics
+import tempfile
+import time
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+from pdf_export import RENDERERS, export_student_to_pdf
+
+_WORDS = (
+    "arbeitet", "sorgfältig", "zuverlässig", "Ideen", "Farben", "Gestaltung",
+    "Material", "pünktlich", "selbstständig", "Gruppe", "Skizze", "Technik",
+    "überzeugend", "Ausführung", "Konzept", "hilfsbereit", "Collage", "Perspektive",
+)
+
+def synthetic_students(count: int, work_titles: int, seed: int = 1
+                       ) -> List[Tuple[Tuple, Tuple, List[Tuple]]]:
+    """Erzeugt reproduzierbare Schüler als (Schülerzeile, Details, Arbeitstitel)."""
+    rng = random.Random(seed)
+
+    def text(words: int) -> str:
+        return " ".join(rng.choice(_WORDS) for _ in range(words))
+
+    students = []
+    for student_id in range(1, count + 1):
+        row = (student_id, f"Vorname{student_id}", f"Nachname{student_id}", f"{rng.randint(5, 10)}a")
+        details = tuple(text(rng.randint(2, 40)) for _ in range(6))
+        works = [
+            (work_id, f"Werk {work_id}", str(rng.randint(1, 6)))
+            + tuple(text(rng.randint(0, 60)) for _ in range(6))
+            for work_id in range(1, work_titles + 1)
+        ]
+        students.append((row, details, works))
+    return students
+
+_STREAM = re.compile(rb"<<(.*?)>>\s*stream\r?\n(.*?)endstream", re.S)
+_SHOW_TEXT = re.compile(rb"\(((?:\\.|[^\\)])*)\)\s*Tj")
+_ESCAPE = re.compile(rb"\\([0-7]{1,3}|.)", re.S)
+_ESCAPES = {b"n": b"\n", b"r": b"\r", b"t": b"\t", b"b": b"\b", b"f": b"\f"}
+
+def _unescape(literal: bytes) -> bytes:
+    def replace(match: "re.Match") -> bytes:
+        code = match.group(1)
+        if code[:1].isdigit():
+            return bytes([int(code, 8) & 0xFF])
+        return _ESCAPES.get(code, code)
+    return _ESCAPE.sub(replace, literal)
+
+def extract_words(filename: str) -> List[str]:
+    """
+    Liest den mit Tj gezeichneten Text aller Inhaltsströme einer von
+    reportlab erzeugten PDF (Standardschriften, WinAnsi) als Wortliste.
+    """
+    with open(filename, "rb") as f:
+        data = f.read()
+    words: List[str] = []
+    for header, stream in _STREAM.findall(data):
+        if b"ASCII85Decode" in header:
+            stream = stream.strip()
+            if stream.endswith(b"~>"):
+                stream = stream[:-2]
+            stream = base64.a85decode(stream)
+        if b"FlateDecode" in header:
+            try:
+                stream = zlib.decompress(stream)
+            except zlib.error:
+                continue
+        for literal in _SHOW_TEXT.findall(stream):
+            words.extend(_unescape(literal).decode("cp1252").split())
+    return words
+
+def run(count: int, work_titles: int, output_dir: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+    students = synthetic_students(count, work_titles)
+    results: Dict[str, Dict[str, float]] = {}
+    files: Dict[str, List[str]] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for renderer in RENDERERS:
+            target = tempfile.mkdtemp(prefix=f"{renderer}_", dir=output_dir or tmp)
+            timings = []
+            files[renderer] = []
+            for (student_id, firstname, lastname, klass), details, works in students:
+                start = time.perf_counter()
+                files[renderer].append(export_student_to_pdf(
+                    student_id, firstname, lastname, klass, details, works, target, renderer=renderer))
+                timings.append(time.perf_counter() - start)
+            results[renderer] = {
+                "students_per_second": len(timings) / sum(timings),
+                "median_ms": statistics.median(timings) * 1000,
+                "max_ms": max(timings) * 1000,
+            }
+
+        mismatches = 0
+        for reference, candidate in zip(*(files[renderer] for renderer in RENDERERS)):
+            if extract_words(reference) != extract_words(candidate):
+                mismatches += 1
+                print(f"Textunterschied: {reference} <-> {candidate}")
+        results["comparison"] = {"checked": len(students), "mismatches": mismatches}
+    return results
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Vergleicht die PDF-Renderer platypus und canvas.")
+    parser.add_argument("--schueler", type=int, default=200, help="Anzahl Schüler (Standard: 200)")
+    parser.add_argument("--arbeitstitel", type=int, default=4, help="Arbeitstitel pro Schüler (Standard: 4)")
+    parser.add_argument("--ausgabe", default=None, help="PDFs hier behalten statt in einem temporären Ordner")
+    args = parser.parse_args()
+
+    results = run(args.schueler, args.arbeitstitel, args.ausgabe)
+    for renderer in RENDERERS:
+        r = results[renderer]
+        print(f"{renderer:>9}: {r['students_per_second']:8.1f} Schüler/s, "
+              f"Median {r['median_ms']:6.1f} ms, Max {r['max_ms']:6.1f} ms")
+    base, fast = (results[renderer]["students_per_second"] for renderer in RENDERERS)
+    print(f"Faktor {RENDERERS[1]}/{RENDERERS[0]}: {fast / base:.2f}")
+    comparison = results["comparison"]
+    print(f"Textvergleich: {comparison['checked'] - comparison['mismatches']} von "
+          f"{comparison['checked']} PDFs identisch")
+    return 1 if comparison["mismatches"] else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,239 @@
+"""
+Misst den Durchsatz des PDF-Exports, wie er am Zeugnistag anfällt.
+
+Drei Datenprofile (wenige, typische und sehr viele Arbeitstitel mit langen
+Kommentaren) werden auf drei Wegen exportiert:
+    - seriell, Schüler für Schüler, mit Zeiten je Phase: Daten holen
+      (iter_students_with_work_titles), Flowables aufbauen
+      (ReportTemplate.student_flowables) und doc.build
+    - parallel über batch_export.export_students_parallel
+    - als ein gemeinsames Heft aller Schüler (export_class_booklet)
+
+reportlab wird vor der Messung geladen; beim parallelen Export zählt der
+Start der Prozesse dagegen mit, weil er an jedem Zeugnistag anfällt.
+Jeder Lauf startet in einem eigenen Prozess, damit der Spitzenwert des
+Arbeitsspeichers (peak RSS) nur diesen Lauf misst; beim parallelen Export
+zählt der größte Export-Prozess. Berichtet werden Schüler pro Sekunde,
+peak RSS, mittlere Dateigröße und die Phasenzeiten pro Schüler.
+
+Aufruf aus dem Projektordner:
+    python -m benchmarks.pdf_throughput [--schueler 200] [--renderer platypus]
+        [--prozesse 4] [--ausgabe ergebnis.json] [--baseline baseline.json]
+"""
+import argparse
+import multiprocessing
+import os
+import queue
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+from benchmarks.harness import Results, dataset, print_results, report_baseline, save_results
+from database_manager import DatabaseManager
+from pdf_export import RENDERERS, DEFAULT_RENDERER
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Profil -> (durchschnittliche Arbeitstitel pro Schüler, höchste Absatzzahl pro Text)
+PROFILES: Dict[str, Dict[str, int]] = {
+    "wenige Arbeitstitel": {"work_titles": 1, "max_paragraphs": 1},
+    "typisch": {"work_titles": 5, "max_paragraphs": 2},
+    "viele Arbeitstitel, lange Kommentare": {"work_titles": 25, "max_paragraphs": 6},
+}
+MODES = ("seriell", "parallel", "Klassenheft")
+
+METRICS = ("students_per_second", "peak_rss_mb", "avg_file_kb",
+           "fetch_ms", "flowables_ms", "build_ms")
+
+def peak_rss_mb(include_children: bool = False) -> Optional[float]:
+    """Höchster Arbeitsspeicher dieses Prozesses (und ggf. beendeter Kindprozesse) in MB."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if include_children:
+        peak = max(peak, resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # Linux meldet KB, macOS Bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def _serial(db_path: str, output_dir: str, renderer: str) -> Dict[str, float]:
+    from pdf_canvas import get_canvas_renderer
+    from pdf_export import _create_document, get_report_template
+
+    template = get_report_template()
+    phases = {"fetch": 0.0, "flowables": 0.0, "build": 0.0}
+    sizes: List[int] = []
+    db = DatabaseManager(db_path, read_only=True)
+    start = time.perf_counter()
+    try:
+        reports = db.iter_students_with_work_titles()
+        while True:
+            t = time.perf_counter()
+            report = next(reports, None)
+            phases["fetch"] += time.perf_counter() - t
+            if report is None:
+                break
+            (student_id, firstname, lastname, klass), details, work_titles = report
+            filename = os.path.join(output_dir, f"{student_id}.pdf")
+            if renderer == "canvas":
+                # Der Canvas-Renderer hat keine getrennte Satzphase
+                t = time.perf_counter()
+                get_canvas_renderer().render(filename, firstname, lastname, klass, details, work_titles)
+                phases["build"] += time.perf_counter() - t
+            else:
+                t = time.perf_counter()
+                doc = _create_document(filename)
+                elements = list(template.student_flowables(firstname, lastname, klass, details, work_titles))
+                phases["flowables"] += time.perf_counter() - t
+                t = time.perf_counter()
+                doc.build(elements)
+                phases["build"] += time.perf_counter() - t
+            sizes.append(os.path.getsize(filename))
+    finally:
+        db.close()
+    total = time.perf_counter() - start
+    count = len(sizes)
+    return {
+        "students": count,
+        "total_s": total,
+        "students_per_second": count / total if total else 0.0,
+        "avg_file_kb": sum(sizes) / count / 1024 if count else 0.0,
+        "fetch_ms": phases["fetch"] / max(count, 1) * 1000,
+        "flowables_ms": phases["flowables"] / max(count, 1) * 1000,
+        "build_ms": phases["build"] / max(count, 1) * 1000,
+    }
+
+def _parallel(db_path: str, output_dir: str, renderer: str, workers: int) -> Dict[str, float]:
+    from batch_export import export_students_parallel
+
+    db = DatabaseManager(db_path, read_only=True)
+    try:
+        students = db.get_students()
+    finally:
+        db.close()
+    start = time.perf_counter()
+    filenames, errors = export_students_parallel(
+        db_path, students, output_dir, max_workers=workers, use_cache=False, renderer=renderer)
+    total = time.perf_counter() - start
+    if errors:
+        raise RuntimeError(f"{len(errors)} Exporte fehlgeschlagen, z. B. {errors[0][1]}")
+    sizes = [os.path.getsize(filename) for filename in filenames]
+    return {
+        "students": len(filenames),
+        "total_s": total,
+        "students_per_second": len(filenames) / total if total else 0.0,
+        "avg_file_kb": sum(sizes) / len(sizes) / 1024 if sizes else 0.0,
+    }
+
+def _booklet(db_path: str, output_dir: str) -> Dict[str, float]:
+    from pdf_export import export_class_booklet, get_report_template
+
+    # reportlab wie beim seriellen Lauf vor der Messung laden
+    get_report_template()
+    db = DatabaseManager(db_path, read_only=True)
+    try:
+        count = db.count_students()
+        start = time.perf_counter()
+        filename = export_class_booklet("", db.iter_students_with_work_titles(), output_dir)
+        total = time.perf_counter() - start
+    finally:
+        db.close()
+    return {
+        "students": count,
+        "total_s": total,
+        "students_per_second": count / total if total else 0.0,
+        # Ein Heft für alle, umgerechnet auf einen Schüler
+        "avg_file_kb": os.path.getsize(filename) / max(count, 1) / 1024,
+    }
+
+def _run_mode(mode: str, db_path: str, renderer: str, workers: int,
+              results: "multiprocessing.Queue") -> None:
+    """Läuft im eigenen Prozess und legt die Kennzahlen in results ab."""
+    try:
+        with tempfile.TemporaryDirectory() as output_dir:
+            if mode == "seriell":
+                values = _serial(db_path, output_dir, renderer)
+            elif mode == "parallel":
+                values = _parallel(db_path, output_dir, renderer, workers)
+            else:
+                values = _booklet(db_path, output_dir)
+        rss = peak_rss_mb(include_children=mode == "parallel")
+        if rss is not None:
+            values["peak_rss_mb"] = rss
+        results.put(("ok", values))
+    except Exception as e:
+        results.put(("error", f"{type(e).__name__}: {e}"))
+
+def run_isolated(mode: str, db_path: str, renderer: str, workers: int) -> Dict[str, Any]:
+    """Führt einen Lauf in einem frischen Prozess aus (für einen sauberen peak RSS)."""
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    process = context.Process(target=_run_mode, args=(mode, db_path, renderer, workers, results))
+    process.start()
+    try:
+        while True:
+            try:
+                status, values = results.get(timeout=1)
+                break
+            except queue.Empty:
+                if not process.is_alive():
+                    raise RuntimeError(f"Messprozess für '{mode}' wurde unerwartet beendet")
+    finally:
+        process.join()
+    if status != "ok":
+        raise RuntimeError(f"Lauf '{mode}' fehlgeschlagen: {values}")
+    return values
+
+def run(students: int, renderer: str, workers: int, data_dir: str, seed: int = 1,
+        profiles: Optional[List[str]] = None, modes: Optional[List[str]] = None) -> Results:
+    results: Results = {}
+    for name, profile in PROFILES.items():
+        if profiles and name not in profiles:
+            continue
+        # Alle Exporte lesen nur, die Testdaten werden direkt verwendet
+        db_path = dataset(data_dir, students, profile["work_titles"], seed, profile["max_paragraphs"])
+        results[name] = {}
+        for mode in MODES:
+            if modes and mode not in modes:
+                continue
+            print(f"{name}: {mode} ...")
+            results[name][mode] = run_isolated(mode, db_path, renderer, workers)
+    return results
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Misst Durchsatz, Speicher und Phasen des PDF-Exports.")
+    parser.add_argument("--schueler", type=int, default=200, help="Schüler pro Profil (Standard: 200)")
+    parser.add_argument("--renderer", choices=RENDERERS, default=DEFAULT_RENDERER,
+                        help=f"PDF-Renderer (Standard: {DEFAULT_RENDERER})")
+    parser.add_argument("--prozesse", type=int, default=os.cpu_count() or 1,
+                        help="Prozesse für den parallelen Export (Standard: Anzahl CPU-Kerne)")
+    parser.add_argument("--profil", action="append", choices=list(PROFILES), default=None,
+                        help="Nur dieses Profil (mehrfach angebbar)")
+    parser.add_argument("--modus", action="append", choices=MODES, default=None,
+                        help="Nur diesen Exportweg (mehrfach angebbar)")
+    parser.add_argument("--daten", default=os.path.join(tempfile.gettempdir(), "schueler_benchmark"),
+                        help="Ordner für die wiederverwendeten Testdatenbanken")
+    parser.add_argument("--seed", type=int, default=1, help="Startwert für die Testdaten")
+    parser.add_argument("--ausgabe", default=None, help="Ergebnisse als JSON hierhin schreiben")
+    parser.add_argument("--baseline", default=None, help="Mit diesen gespeicherten Ergebnissen vergleichen")
+    parser.add_argument("--toleranz", type=float, default=0.15,
+                        help="Erlaubter Rückgang der Schüler pro Sekunde als Anteil (Standard: 0.15)")
+    args = parser.parse_args(argv)
+
+    results = run(args.schueler, args.renderer, args.prozesse, args.daten, args.seed,
+                  args.profil, args.modus)
+    print_results(results, METRICS)
+    if args.ausgabe:
+        save_results(args.ausgabe, results, {
+            "schueler": args.schueler, "renderer": args.renderer,
+            "prozesse": args.prozesse, "seed": args.seed,
+        })
+        print(f"\nErgebnisse gespeichert: {args.ausgabe}")
+    return report_baseline(results, args.baseline, args.toleranz,
+                           metric="students_per_second", min_delta=0.5)
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,212 @@
+"""
+Misst die teuren Wege der Oberfläche ohne Bildschirm (QT_QPA_PLATFORM=offscreen).
+
+Für jede Datenbankgröße werden gemessen:
+    - Erstellen und Anzeigen des Hauptfensters, ohne und mit Sitzungsstand
+    - Laden der Schülerliste bis alle Aufträge verarbeitet sind (load_students)
+    - Filterlatenz pro Tastendruck, in Namen und in Bewertungen (apply_filters)
+    - Wechsel des Klassenfilters
+    - Öffnen und Schließen des Detaildialogs (StudentDetailDialog.load_work_titles)
+
+Eine Messung endet, wenn der DatabaseWorker keine offenen Aufträge mehr hat
+und die Ereignisse der Oberfläche verarbeitet sind. Ergebnisse, Baseline und
+Perzentile wie bei benchmarks.database.
+
+Aufruf aus dem Projektordner:
+    python -m benchmarks.ui [--groessen 100,2000,20000] [--ausgabe ergebnis.json]
+"""
+import os
+
+# Muss vor dem ersten Import von PyQt6 gesetzt sein
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import argparse
+import random
+import shutil
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional
+
+from PyQt6.QtCore import QEventLoop
+from PyQt6.QtWidgets import QApplication
+
+from benchmarks.harness import (
+    Results, dataset, parse_sizes, print_results, report_baseline, save_results, summarize
+)
+from dialogs import StudentDetailDialog
+from main_window import MainWindow
+from session_snapshot import SessionSnapshot
+
+# Wird beim Tippen Buchstabe für Buchstabe eingegeben
+TYPED_KEYWORDS = ("Schneider", "Perspektive")
+
+def wait_until(app: QApplication, condition: Callable[[], bool], timeout: float = 120.0) -> None:
+    """Verarbeitet Ereignisse, bis condition() wahr ist."""
+    deadline = time.perf_counter() + timeout
+    while True:
+        app.processEvents(QEventLoop.ProcessEventsFlag.AllEvents)
+        if condition():
+            return
+        if time.perf_counter() > deadline:
+            raise TimeoutError("Zeitüberschreitung beim Warten auf die Oberfläche")
+        # Dem Worker-Thread den Interpreter überlassen
+        time.sleep(0.0002)
+
+def wait_idle(app: QApplication, window: MainWindow) -> None:
+    """Wartet, bis alle Datenbankaufträge verteilt und die Ereignisse verarbeitet sind."""
+    wait_until(app, lambda: window.db_worker.pending_count() == 0)
+    app.processEvents(QEventLoop.ProcessEventsFlag.AllEvents)
+
+def timed(func: Callable[[], None]) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+def _open_window(app: QApplication, timings: Dict[str, List[float]], series: str,
+                 load_series: str) -> MainWindow:
+    """Erstellt und zeigt das Fenster, dann werden die Daten geladen."""
+    holder: List[MainWindow] = []
+
+    def construct() -> None:
+        window = MainWindow()
+        window.show()
+        app.processEvents(QEventLoop.ProcessEventsFlag.AllEvents)
+        holder.append(window)
+
+    timings[series].append(timed(construct))
+    window = holder[0]
+
+    def load() -> None:
+        window.start_loading()
+        wait_until(app, lambda: window.table_stack.currentWidget() is window.student_table
+                   and window.db_worker.pending_count() == 0)
+
+    timings[load_series].append(timed(load))
+    return window
+
+def _type(app: QApplication, window: MainWindow, keyword: str, in_evaluations: bool) -> List[float]:
+    """Tippt keyword Buchstabe für Buchstabe und misst jeden Filterschritt."""
+    window.search_evaluations_check.blockSignals(True)
+    window.search_evaluations_check.setChecked(in_evaluations)
+    window.search_evaluations_check.blockSignals(False)
+    timings = []
+    for length in range(1, len(keyword) + 1):
+        # Ohne Signal, damit nicht der Entprell-Timer, sondern die Messung filtert
+        window.search_edit.blockSignals(True)
+        window.search_edit.setText(keyword[:length])
+        window.search_edit.blockSignals(False)
+
+        def step() -> None:
+            window.apply_filters()
+            wait_idle(app, window)
+
+        timings.append(timed(step))
+    window.search_edit.blockSignals(True)
+    window.search_edit.clear()
+    window.search_edit.blockSignals(False)
+    window.apply_filters()
+    wait_idle(app, window)
+    return timings
+
+def run_size(app: QApplication, db_path: str, repeat: int, dialogs: int, seed: int
+             ) -> Dict[str, Dict[str, float]]:
+    rng = random.Random(seed)
+    timings: Dict[str, List[float]] = {
+        "Fenster erstellen": [],
+        "Fenster mit Sitzungsstand": [],
+        "Schülerliste laden": [],
+        "Schülerliste laden mit Sitzungsstand": [],
+        "Tastendruck (Namen)": [],
+        "Tastendruck (Bewertungen)": [],
+        "Klassenwechsel": [],
+        "Detaildialog öffnen/schließen": [],
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        # MainWindow öffnet students.db im Arbeitsverzeichnis
+        shutil.copyfile(db_path, os.path.join(tmp, "students.db"))
+        cwd = os.getcwd()
+        os.chdir(tmp)
+        try:
+            for _ in range(repeat):
+                snapshot_path = SessionSnapshot.path_for("students.db")
+                # Erster Start jeder Runde ohne, zweiter mit Sitzungsstand
+                if os.path.exists(snapshot_path):
+                    os.remove(snapshot_path)
+                window = _open_window(app, timings, "Fenster erstellen", "Schülerliste laden")
+                # Beim Schließen wird der Sitzungsstand für den zweiten Start geschrieben
+                window.close()
+                window.deleteLater()
+                window = _open_window(app, timings, "Fenster mit Sitzungsstand",
+                                      "Schülerliste laden mit Sitzungsstand")
+
+                timings["Tastendruck (Namen)"].extend(_type(app, window, TYPED_KEYWORDS[0], False))
+                timings["Tastendruck (Bewertungen)"].extend(_type(app, window, TYPED_KEYWORDS[1], True))
+
+                combo = window.class_filter_combo
+                for index in list(range(1, combo.count())) + [0]:
+                    def switch(index: int = index) -> None:
+                        combo.setCurrentIndex(index)
+                        wait_idle(app, window)
+                    timings["Klassenwechsel"].append(timed(switch))
+
+                students = window.student_model.rows()
+                for student in rng.sample(students, min(dialogs, len(students))):
+                    def open_close(student=student) -> None:
+                        dialog = StudentDetailDialog(student, window.db_worker)
+                        dialog.show()
+                        wait_idle(app, window)
+                        dialog.reject()
+                        dialog.deleteLater()
+                        app.processEvents(QEventLoop.ProcessEventsFlag.AllEvents)
+                    timings["Detaildialog öffnen/schließen"].append(timed(open_close))
+
+                window.close()
+                window.deleteLater()
+                app.processEvents(QEventLoop.ProcessEventsFlag.AllEvents)
+        finally:
+            os.chdir(cwd)
+    return {name: summarize(values) for name, values in timings.items() if values}
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Misst Start, Filter und Dialoge der Oberfläche ohne Bildschirm.")
+    parser.add_argument("--groessen", default="100,2000,20000",
+                        help="Anzahl Schüler je Testdatenbank, kommagetrennt (Standard: 100,2000,20000)")
+    parser.add_argument("--arbeitstitel", type=int, default=10,
+                        help="Durchschnittliche Arbeitstitel pro Schüler (Standard: 10)")
+    parser.add_argument("--wiederholungen", type=int, default=3,
+                        help="Programmstarts pro Größe (Standard: 3)")
+    parser.add_argument("--dialoge", type=int, default=10,
+                        help="Geöffnete Detaildialoge pro Start (Standard: 10)")
+    parser.add_argument("--daten", default=os.path.join(tempfile.gettempdir(), "schueler_benchmark"),
+                        help="Ordner für die wiederverwendeten Testdatenbanken")
+    parser.add_argument("--seed", type=int, default=1, help="Startwert für Testdaten und Zufallsauswahl")
+    parser.add_argument("--ausgabe", default=None, help="Ergebnisse als JSON hierhin schreiben")
+    parser.add_argument("--baseline", default=None, help="Mit diesen gespeicherten Ergebnissen vergleichen")
+    parser.add_argument("--toleranz", type=float, default=0.25,
+                        help="Erlaubte Verlangsamung des Medians als Anteil (Standard: 0.25)")
+    args = parser.parse_args(argv)
+
+    try:
+        sizes = parse_sizes(args.groessen)
+    except ValueError as e:
+        parser.error(str(e))
+
+    app = QApplication.instance() or QApplication([])
+    results: Results = {}
+    for students in sizes:
+        db_path = dataset(args.daten, students, args.arbeitstitel, args.seed)
+        print(f"Messe Oberfläche mit {students} Schülern ...")
+        results[f"{students} Schüler"] = run_size(app, db_path, args.wiederholungen, args.dialoge, args.seed)
+
+    print_results(results, ("median_ms", "p90_ms", "p99_ms", "max_ms"))
+    if args.ausgabe:
+        save_results(args.ausgabe, results, {
+            "groessen": sizes, "arbeitstitel": args.arbeitstitel,
+            "wiederholungen": args.wiederholungen, "dialoge": args.dialoge, "seed": args.seed,
+            "qt_platform": os.environ.get("QT_QPA_PLATFORM", ""),
+        })
+        print(f"\nErgebnisse gespeichert: {args.ausgabe}")
+    return report_baseline(results, args.baseline, args.toleranz)
+
+if __name__ == "__main__":
+    raise SystemExit(main())
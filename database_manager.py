@@ -1,11 +1,117 @@
 import sqlite3
-from typing import List, Tuple, Optional
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Tuple, Optional
+
+# Bewertungsspalten eines Schülers, in der Reihenfolge von get_student_details
+STUDENT_DETAIL_COLUMNS: Tuple[str, ...] = (
+    "soziale_kompetenz", "aktive_mitarbeit", "sauberkeit", "material",
+    "puenktlichkeit", "kommentar"
+)
+# Spalten eines Arbeitstitels, in der Reihenfolge von get_work_titles (ohne id)
+WORK_TITLE_COLUMNS: Tuple[str, ...] = (
+    "title", "note", "soziale_kompetenz", "aktive_mitarbeit", "sauberkeit",
+    "material", "puenktlichkeit", "kommentar"
+)
+
+# Freitextspalten, die in den Volltextindex aufgenommen werden
+STUDENT_TEXT_COLUMNS: Tuple[str, ...] = (
+    "firstname", "lastname", "class", "soziale_kompetenz", "aktive_mitarbeit",
+    "sauberkeit", "material", "puenktlichkeit", "kommentar"
+)
+WORK_TITLE_TEXT_COLUMNS: Tuple[str, ...] = (
+    "title", "note", "soziale_kompetenz", "aktive_mitarbeit", "sauberkeit",
+    "material", "puenktlichkeit", "kommentar"
+)
+
+# Unterhalb dieser Länge kann der Trigramm-Index nicht genutzt werden
+FTS_MIN_KEYWORD_LENGTH: int = 3
+
+def _fts_statements(table: str, columns: Tuple[str, ...]) -> Tuple[str, ...]:
+    """Erzeugt eine FTS5-Tabelle mit externem Inhalt samt Sync-Triggern."""
+    fts = f"{table}_fts"
+    cols = ", ".join(columns)
+    new_values = ", ".join(f"new.{c}" for c in columns)
+    old_values = ", ".join(f"old.{c}" for c in columns)
+    insert_new = f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_values});"
+    delete_old = f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_values});"
+    return (
+        # Trigramme erlauben Teilwortsuche wie bisher mit LIKE '%...%'
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"{cols}, content='{table}', content_rowid='id', tokenize='trigram')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN {insert_new} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN {delete_old} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE ON {table} BEGIN {delete_old} {insert_new} END",
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+    )
+
+def _generation_statements(tables: Tuple[str, ...]) -> Tuple[str, ...]:
+    """Erzeugt den Generationszähler, den jede Änderung an tables erhöht."""
+    bump = "UPDATE meta SET value = value + 1 WHERE key = 'generation';"
+    return (
+        "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)",
+        "INSERT OR IGNORE INTO meta (key, value) VALUES ('generation', 0)",
+    ) + tuple(
+        f"CREATE TRIGGER IF NOT EXISTS {table}_generation_{event.lower()} "
+        f"AFTER {event} ON {table} BEGIN {bump} END"
+        for table in tables
+        for event in ("INSERT", "UPDATE", "DELETE")
+    )
+
+# Schema-Migrationen, geordnet nach Version. Eintrag i hebt die Datenbank
+# von PRAGMA user_version i auf i + 1. Bestehende Einträge nie ändern,
+# sondern immer eine neue Migration anhängen.
+MIGRATIONS: List[Tuple[str, ...]] = [
+    # Version 1: Indizes für Arbeitstitel-Abfragen, Klassensortierung und Namen
+    (
+        "CREATE INDEX IF NOT EXISTS idx_work_titles_student ON work_titles(student_id)",
+        "CREATE INDEX IF NOT EXISTS idx_students_class_name ON students(class, lastname, firstname)",
+        "CREATE INDEX IF NOT EXISTS idx_students_lastname ON students(lastname, firstname)",
+        "CREATE INDEX IF NOT EXISTS idx_students_firstname ON students(firstname)",
+        "ANALYZE",
+    ),
+    # Version 2: Volltextsuche über Namen, Klasse und alle Bewertungstexte
+    _fts_statements("students", STUDENT_TEXT_COLUMNS)
+    + _fts_statements("work_titles", WORK_TITLE_TEXT_COLUMNS),
+    # Version 3: Keine NULL-Klassen, damit der Seitenschlüssel immer vergleichbar ist
+    (
+        "UPDATE students SET class = '' WHERE class IS NULL",
+    ),
+    # Version 4: Generationszähler, z. B. um einen Sitzungsstand auf Aktualität zu prüfen
+    _generation_statements(("students", "work_titles")),
+]
+
+# Sortierschlüssel einer Schülerzeile für die seitenweise Abfrage:
+# (class, lastname, firstname, id), passend zu idx_students_class_name
+PageKey = Tuple[str, str, str, int]
+
+# Empfänger von Änderungsmeldungen: (entity, action, record_id, payload)
+#   entity:  "student" oder "work_title"
+#   action:  "insert", "update" oder "delete"
+#   payload: bei Schülern die Listenzeile (id, firstname, lastname, class) oder
+#            None, wenn sich nur Details geändert haben; bei Arbeitstiteln die
+#            Schüler-ID
+ChangeListener = Callable[[str, str, int, Any], None]
+
+SCHEMA_VERSION: int = len(MIGRATIONS)
 
 class DatabaseManager:
-    def __init__(self, db_path: str = "students.db") -> None:
+    def __init__(self, db_path: str = "students.db", read_only: bool = False) -> None:
+        """
+        Args:
+            db_path: Pfad zur SQLite-Datenbank
+            read_only: Öffnet eine bestehende Datenbank nur lesend, ohne Tabellen
+                       anzulegen oder zu migrieren (z. B. in Export-Prozessen)
+        """
         self.db_path: str = db_path
-        self.conn: sqlite3.Connection = sqlite3.connect(self.db_path)
+        self.read_only: bool = read_only
+        self._change_listeners: List[ChangeListener] = []
+        if read_only:
+            uri = f"{Path(db_path).resolve().as_uri()}?mode=ro"
+            self.conn: sqlite3.Connection = sqlite3.connect(uri, uri=True)
+            return
+        self.conn = sqlite3.connect(self.db_path)
         self.create_tables()
+        self.migrate()
 
     def create_tables(self) -> None:
         cursor = self.conn.cursor()
@@ -42,62 +148,364 @@ class DatabaseManager:
         """)
         self.conn.commit()
 
-    def add_student(self, firstname: str, lastname: str, klass: str) -> None:
+    def get_schema_version(self) -> int:
+        """Gibt die Schema-Version der Datenbank (PRAGMA user_version) zurück."""
+        return self.conn.execute("PRAGMA user_version").fetchone()[0]
+
+    def migrate(self) -> None:
+        """Hebt eine bestehende Datenbank schrittweise auf SCHEMA_VERSION an.
+
+        Jede Migration läuft in einer eigenen Transaktion zusammen mit dem
+        Setzen von user_version, sodass ein Abbruch keine halb migrierte
+        Datenbank hinterlässt.
+        """
+        version = self.get_schema_version()
+        if version > SCHEMA_VERSION:
+            raise RuntimeError(
+                f"Die Datenbank hat Schema-Version {version}, dieses Programm "
+                f"unterstützt höchstens Version {SCHEMA_VERSION}."
+            )
+
+        cursor = self.conn.cursor()
+        for target in range(version + 1, SCHEMA_VERSION + 1):
+            try:
+                cursor.execute("BEGIN")
+                for statement in MIGRATIONS[target - 1]:
+                    cursor.execute(statement)
+                # PRAGMA erlaubt keine Parameter, target ist aber immer ein int
+                cursor.execute(f"PRAGMA user_version = {int(target)}")
+                self.conn.commit()
+            except Exception:
+                self.conn.rollback()
+                raise
+
+    def get_generation(self) -> int:
+        """
+        Gibt den Generationszähler der Datenbank zurück.
+
+        Jede Änderung an Schülern oder Arbeitstiteln erhöht ihn (per Trigger,
+        also auch bei Änderungen durch andere Programme). Ist er unverändert,
+        sind seit dem letzten Lesen keine Daten geändert worden.
+        """
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'generation'").fetchone()
+        return row[0] if row else 0
+
+    def add_change_listener(self, listener: ChangeListener) -> None:
+        """Registriert einen Empfänger, der nach jeder erfolgreichen Änderung aufgerufen wird."""
+        self._change_listeners.append(listener)
+
+    def _notify(self, entity: str, action: str, record_id: int, payload: Any = None) -> None:
+        for listener in self._change_listeners:
+            listener(entity, action, record_id, payload)
+
+    def add_student(self, firstname: str, lastname: str, klass: str) -> int:
+        """Legt einen Schüler an und gibt dessen ID zurück."""
         if not firstname or not lastname:
             raise ValueError("Vor- und Nachname dürfen nicht leer sein")
         
+        klass = klass or ""
         cursor = self.conn.cursor()
         cursor.execute(
             "INSERT INTO students (firstname, lastname, class) VALUES (?, ?, ?)",
             (firstname, lastname, klass)
         )
         self.conn.commit()
+        student_id = cursor.lastrowid
+        self._notify("student", "insert", student_id, (student_id, firstname, lastname, klass))
+        return student_id
 
     def update_student_details(
         self, student_id: int, soziale_kompetenz: str, aktive_mitarbeit: str,
         sauberkeit: str, material: str, puenktlichkeit: str, kommentar: str
     ) -> None:
+        self.update_student_fields(student_id, dict(zip(STUDENT_DETAIL_COLUMNS, (
+            soziale_kompetenz, aktive_mitarbeit, sauberkeit, material, puenktlichkeit, kommentar
+        ))))
+
+    def update_student_fields(self, student_id: int, fields: Dict[str, str]) -> None:
+        """
+        Schreibt nur die übergebenen Bewertungsspalten eines Schülers.
+
+        Args:
+            student_id: Die ID des Schülers
+            fields: Spaltenname aus STUDENT_DETAIL_COLUMNS -> neuer Wert
+        """
         if not isinstance(student_id, int) or student_id <= 0:
             raise ValueError("Ungültige Schüler-ID")
-            
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            UPDATE students
-            SET soziale_kompetenz = ?, aktive_mitarbeit = ?, sauberkeit = ?,
-                material = ?, puenktlichkeit = ?, kommentar = ?
-            WHERE id = ?
-        """, (soziale_kompetenz, aktive_mitarbeit, sauberkeit, material, puenktlichkeit, kommentar, student_id))
-        self.conn.commit()
+        if not fields:
+            return
+        self._update_columns("students", student_id, fields, STUDENT_DETAIL_COLUMNS)
+        self._notify("student", "update", student_id)
+
+    def _update_columns(self, table: str, record_id: int, fields: Dict[str, str],
+                        allowed: Tuple[str, ...]) -> None:
+        # Spaltennamen nur aus der festen Liste, da sie ins SQL eingesetzt werden
+        unknown = set(fields) - set(allowed)
+        if unknown:
+            raise ValueError(f"Unbekannte Spalten: {', '.join(sorted(unknown))}")
+        columns = [column for column in allowed if column in fields]
+        assignments = ", ".join(f"{column} = ?" for column in columns)
+        params = [fields[column] for column in columns] + [record_id]
+        # Alle Spalten in einer Transaktion schreiben
+        with self.conn:
+            self.conn.execute(f"UPDATE {table} SET {assignments} WHERE id = ?", params)
 
     def delete_student(self, student_id: int) -> None:
         if not isinstance(student_id, int) or student_id <= 0:
             raise ValueError("Ungültige Schüler-ID")
             
         cursor = self.conn.cursor()
+        row = cursor.execute(
+            "SELECT id, firstname, lastname, class FROM students WHERE id = ?", (student_id,)
+        ).fetchone()
         cursor.execute("DELETE FROM work_titles WHERE student_id = ?", (student_id,))
         cursor.execute("DELETE FROM students WHERE id = ?", (student_id,))
         self.conn.commit()
+        if row is not None:
+            self._notify("student", "delete", student_id, row)
 
     def search_students(self, keyword: str) -> List[Tuple]:
+        """Sucht Schüler nach Vor- oder Nachname (sortiert nach Relevanz)."""
+        return self.search_students_ranked(keyword, include_evaluations=False)
+
+    def search_students_ranked(self, keyword: str, include_evaluations: bool = True,
+                               class_filter: Optional[str] = None) -> List[Tuple]:
+        """Volltextsuche über den FTS5-Index, beste Treffer zuerst.
+
+        Ohne include_evaluations werden nur Vor- und Nachname durchsucht,
+        sonst zusätzlich Klasse, Schülerdetails sowie Titel, Note und alle
+        Bewertungstexte der Arbeitstitel. Begriffe, die kürzer als
+        FTS_MIN_KEYWORD_LENGTH sind, werden per LIKE in den Namen gesucht,
+        mit include_evaluations auch in der Klasse (z. B. "5a").
+        """
+        keyword = keyword.strip()
+        if not keyword:
+            return self.get_students(class_filter)
+        if len(keyword) < FTS_MIN_KEYWORD_LENGTH:
+            return self._search_names_like(keyword, class_filter, include_evaluations)
+
+        # Als FTS5-Zeichenkette quoten, damit Operatoren im Suchtext nicht greifen
+        phrase = '"' + keyword.replace('"', '""') + '"'
+        student_query = phrase if include_evaluations else f"{{firstname lastname}} : {phrase}"
+
+        work_title_hits = ""
+        params: List = [student_query]
+        if include_evaluations:
+            work_title_hits = """
+                UNION ALL
+                SELECT w.student_id, work_titles_fts.rank
+                FROM work_titles_fts JOIN work_titles w ON w.id = work_titles_fts.rowid
+                WHERE work_titles_fts MATCH ?
+            """
+            params.append(phrase)
+
+        class_clause = ""
+        if class_filter:
+            class_clause = "WHERE s.class = ?"
+            params.append(class_filter)
+
         cursor = self.conn.cursor()
-        keyword = f"%{keyword}%"
-        cursor.execute("""
+        cursor.execute(f"""
+            WITH hits(student_id, score) AS (
+                SELECT rowid, rank FROM students_fts
+                WHERE students_fts MATCH ?
+                {work_title_hits}
+            )
+            SELECT s.id, s.firstname, s.lastname, s.class
+            FROM (SELECT student_id, MIN(score) AS score FROM hits GROUP BY student_id) h
+            JOIN students s ON s.id = h.student_id
+            {class_clause}
+            ORDER BY h.score, s.class, s.lastname, s.firstname
+        """, params)
+        return cursor.fetchall()
+
+    def _search_names_like(self, keyword: str, class_filter: Optional[str] = None,
+                           include_class: bool = False) -> List[Tuple]:
+        conditions, params = self._like_condition(keyword, include_class)
+        if class_filter:
+            conditions += " AND class = ?"
+            params.append(class_filter)
+        cursor = self.conn.cursor()
+        cursor.execute(f"""
             SELECT id, firstname, lastname, class FROM students
-            WHERE firstname LIKE ? OR lastname LIKE ? 
-            ORDER BY class
-        """, (keyword, keyword))
+            WHERE {conditions}
+            ORDER BY class, lastname, firstname
+        """, params)
         return cursor.fetchall()
 
-    def get_students(self) -> List[Tuple]:
+    @staticmethod
+    def _like_condition(keyword: str, include_class: bool) -> Tuple[str, List]:
+        """LIKE-Bedingung für kurze Suchbegriffe über die Namen und ggf. die Klasse."""
+        pattern = f"%{keyword}%"
+        columns = ("firstname", "lastname", "class") if include_class else ("firstname", "lastname")
+        condition = "(" + " OR ".join(f"{column} LIKE ?" for column in columns) + ")"
+        return condition, [pattern] * len(columns)
+
+    def get_students(self, class_filter: Optional[str] = None) -> List[Tuple]:
         cursor = self.conn.cursor()
         # Standardmäßig nach Klasse sortieren (class ist Spalte 3)
-        cursor.execute("SELECT id, firstname, lastname, class FROM students ORDER BY class")
+        if class_filter:
+            cursor.execute("""
+                SELECT id, firstname, lastname, class FROM students
+                WHERE class = ? ORDER BY class, lastname, firstname
+            """, (class_filter,))
+        else:
+            cursor.execute("""
+                SELECT id, firstname, lastname, class FROM students
+                ORDER BY class, lastname, firstname
+            """)
         return cursor.fetchall()
 
+    @staticmethod
+    def page_key(student: Tuple) -> PageKey:
+        """Seitenschlüssel einer Zeile (id, firstname, lastname, class)."""
+        return (student[3], student[2], student[1], student[0])
+
+    def _student_filter(self, class_filter: Optional[str], keyword: Optional[str],
+                        include_evaluations: bool) -> Tuple[List[str], List]:
+        """Baut die WHERE-Bedingungen für Klassen- und Suchfilter der Listenabfragen."""
+        conditions: List[str] = []
+        params: List = []
+        if class_filter:
+            conditions.append("class = ?")
+            params.append(class_filter)
+
+        keyword = (keyword or "").strip()
+        if keyword and len(keyword) < FTS_MIN_KEYWORD_LENGTH:
+            # Kurze Begriffe wie Klassen ("5a") sind für den FTS-Index zu kurz
+            condition, like_params = self._like_condition(keyword, include_evaluations)
+            conditions.append(condition)
+            params.extend(like_params)
+        elif keyword:
+            phrase = '"' + keyword.replace('"', '""') + '"'
+            if include_evaluations:
+                conditions.append("""(
+                    id IN (SELECT rowid FROM students_fts WHERE students_fts MATCH ?)
+                    OR id IN (SELECT student_id FROM work_titles WHERE id IN (
+                        SELECT rowid FROM work_titles_fts WHERE work_titles_fts MATCH ?))
+                )""")
+                params.extend((phrase, phrase))
+            else:
+                conditions.append("id IN (SELECT rowid FROM students_fts WHERE students_fts MATCH ?)")
+                params.append(f"{{firstname lastname}} : {phrase}")
+        return conditions, params
+
+    def get_students_page(self, after: Optional[PageKey] = None, limit: int = 500,
+                          class_filter: Optional[str] = None, keyword: Optional[str] = None,
+                          include_evaluations: bool = False) -> List[Tuple]:
+        """
+        Gibt die nächste Seite der nach Klasse und Name sortierten Schülerliste zurück.
+
+        Args:
+            after: Seitenschlüssel der letzten bereits geladenen Zeile (siehe
+                   page_key), None für die erste Seite
+            limit: Maximale Anzahl Zeilen, -1 für alle restlichen
+            class_filter: Nur Schüler dieser Klasse
+            keyword: Optionaler Suchbegriff (wie bei search_students_ranked)
+            include_evaluations: Suchbegriff auch in den Bewertungstexten suchen
+
+        Returns:
+            List[Tuple]: Zeilen (id, firstname, lastname, class)
+        """
+        conditions, params = self._student_filter(class_filter, keyword, include_evaluations)
+        if after is not None:
+            conditions.append("(class, lastname, firstname, id) > (?, ?, ?, ?)")
+            params.extend(after)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        params.append(limit)
+
+        cursor = self.conn.cursor()
+        cursor.execute(f"""
+            SELECT id, firstname, lastname, class FROM students
+            {where}
+            ORDER BY class, lastname, firstname, id
+            LIMIT ?
+        """, params)
+        return cursor.fetchall()
+
+    def count_students(self, class_filter: Optional[str] = None, keyword: Optional[str] = None,
+                       include_evaluations: bool = False) -> int:
+        """Zählt die Schüler, die get_students_page mit denselben Filtern liefern würde."""
+        conditions, params = self._student_filter(class_filter, keyword, include_evaluations)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        cursor = self.conn.cursor()
+        cursor.execute(f"SELECT COUNT(*) FROM students {where}", params)
+        return cursor.fetchone()[0]
+
+    def iter_students_with_work_titles(
+            self, class_filter: Optional[str] = None, ids: Optional[List[int]] = None,
+            keyword: Optional[str] = None, include_evaluations: bool = False,
+            batch_size: int = 500) -> Iterator[Tuple[Tuple, Tuple, List[Tuple]]]:
+        """
+        Liefert Schüler mit Details und allen Arbeitstiteln für Berichte und Exporte.
+
+        Statt pro Schüler get_student_details und get_work_titles aufzurufen
+        (2N Abfragen), werden je Block von batch_size Schülern nur zwei Abfragen
+        gestellt: eine für die Schüler samt Details und eine für die
+        Arbeitstitel aller Schüler des Blocks, die in einem Durchgang den
+        Schülern zugeordnet werden. Die Ergebnisse werden blockweise geliefert,
+        sodass auch sehr große Mengen nur wenig Speicher belegen. Jede Abfrage
+        ist beendet, bevor ihr Block geliefert wird: Ein langsamer Verbraucher
+        (z. B. das Klassenheft) hält so keine Lesesperre, die das Speichern in
+        der Oberfläche blockieren würde.
+
+        Args:
+            class_filter: Nur Schüler dieser Klasse
+            ids: Nur diese Schüler, in der Reihenfolge von ids; nicht (mehr)
+                 vorhandene IDs werden übersprungen
+            keyword: Optionaler Suchbegriff (wie bei get_students_page)
+            include_evaluations: Suchbegriff auch in den Bewertungstexten suchen
+            batch_size: Anzahl Schüler pro Abfrageblock
+
+        Yields:
+            (Schülerzeile (id, firstname, lastname, class), Details wie
+            get_student_details, Arbeitstitel wie get_work_titles)
+        """
+        conditions, params = self._student_filter(class_filter, keyword, include_evaluations)
+        query = f"""
+            SELECT id, firstname, lastname, class, {", ".join(STUDENT_DETAIL_COLUMNS)}
+            FROM students
+        """
+        if ids is None:
+            # Erst nur die IDs vollständig lesen; eine offene Abfrage über die
+            # ganze Ausgabe hielte sonst die Lesesperre bis zum letzten Schüler
+            where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+            ids = [row[0] for row in self.conn.execute(
+                f"SELECT id FROM students {where} ORDER BY class, lastname, firstname, id", params)]
+            conditions, params = [], []
+
+        # IDs blockweise abfragen, damit die Anzahl der Parameter begrenzt bleibt
+        for start in range(0, len(ids), batch_size):
+            chunk = ids[start:start + batch_size]
+            chunk_conditions = conditions + [f"id IN ({', '.join('?' * len(chunk))})"]
+            cursor = self.conn.execute(
+                f"{query} WHERE {' AND '.join(chunk_conditions)}", params + list(chunk))
+            rows_by_id = {row[0]: row for row in cursor}
+            yield from self._attach_work_titles(
+                [rows_by_id[student_id] for student_id in chunk if student_id in rows_by_id])
+
+    def _attach_work_titles(self, rows: List[Tuple]) -> Iterator[Tuple[Tuple, Tuple, List[Tuple]]]:
+        """Holt die Arbeitstitel zu einem Block von Schülerzeilen mit einer Abfrage."""
+        work_titles: Dict[int, List[Tuple]] = {row[0]: [] for row in rows}
+        if rows:
+            ids = list(work_titles)
+            # Sortiert wie get_work_titles über idx_work_titles_student
+            cursor = self.conn.execute(f"""
+                SELECT student_id, id, {", ".join(WORK_TITLE_COLUMNS)}
+                FROM work_titles
+                WHERE student_id IN ({', '.join('?' * len(ids))})
+                ORDER BY student_id, id
+            """, ids)
+            for work in cursor:
+                work_titles[work[0]].append(work[1:])
+        for row in rows:
+            yield row[:4], row[4:], work_titles[row[0]]
+
     def add_work_title(self, student_id: int, title: str, note: str,
                        soziale_kompetenz: str, aktive_mitarbeit: str,
                        sauberkeit: str, material: str, puenktlichkeit: str,
-                       kommentar: str) -> None:
+                       kommentar: str) -> int:
+        """Legt einen Arbeitstitel an und gibt dessen ID zurück."""
         if not isinstance(student_id, int) or student_id <= 0:
             raise ValueError("Ungültige Schüler-ID")
             
@@ -110,31 +518,48 @@ class DatabaseManager:
         """, (student_id, title, note, soziale_kompetenz, aktive_mitarbeit,
               sauberkeit, material, puenktlichkeit, kommentar))
         self.conn.commit()
+        work_id = cursor.lastrowid
+        self._notify("work_title", "insert", work_id, student_id)
+        return work_id
 
     def update_work_title(self, work_id: int, title: str, note: str,
                           soziale_kompetenz: str, aktive_mitarbeit: str,
                           sauberkeit: str, material: str, puenktlichkeit: str,
                           kommentar: str) -> None:
+        self.update_work_title_fields(work_id, dict(zip(WORK_TITLE_COLUMNS, (
+            title, note, soziale_kompetenz, aktive_mitarbeit, sauberkeit,
+            material, puenktlichkeit, kommentar
+        ))))
+
+    def update_work_title_fields(self, work_id: int, fields: Dict[str, str]) -> None:
+        """
+        Schreibt nur die übergebenen Spalten eines Arbeitstitels.
+
+        Args:
+            work_id: Die ID des Arbeitstitels
+            fields: Spaltenname aus WORK_TITLE_COLUMNS -> neuer Wert
+        """
         if not isinstance(work_id, int) or work_id <= 0:
             raise ValueError("Ungültige Arbeitstitel-ID")
-            
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            UPDATE work_titles
-            SET title = ?, note = ?, soziale_kompetenz = ?, aktive_mitarbeit = ?,
-                sauberkeit = ?, material = ?, puenktlichkeit = ?, kommentar = ?
-            WHERE id = ?
-        """, (title, note, soziale_kompetenz, aktive_mitarbeit, sauberkeit,
-              material, puenktlichkeit, kommentar, work_id))
-        self.conn.commit()
+        if not fields:
+            return
+        self._update_columns("work_titles", work_id, fields, WORK_TITLE_COLUMNS)
+        self._notify("work_title", "update", work_id, self._work_title_owner(work_id))
 
     def delete_work_title(self, work_id: int) -> None:
         if not isinstance(work_id, int) or work_id <= 0:
             raise ValueError("Ungültige Arbeitstitel-ID")
             
+        student_id = self._work_title_owner(work_id)
         cursor = self.conn.cursor()
         cursor.execute("DELETE FROM work_titles WHERE id = ?", (work_id,))
         self.conn.commit()
+        if student_id is not None:
+            self._notify("work_title", "delete", work_id, student_id)
+
+    def _work_title_owner(self, work_id: int) -> Optional[int]:
+        row = self.conn.execute("SELECT student_id FROM work_titles WHERE id = ?", (work_id,)).fetchone()
+        return row[0] if row else None
 
     def get_work_titles(self, student_id: int) -> List[Tuple]:
         if not isinstance(student_id, int) or student_id <= 0:
@@ -149,7 +574,39 @@ class DatabaseManager:
         """, (student_id,))
         return cursor.fetchall()
 
+    def get_work_title_list(self, student_id: int) -> List[Tuple[int, str, str]]:
+        """Schlanke Listenansicht der Arbeitstitel: nur (id, title, note), ohne Bewertungstexte."""
+        if not isinstance(student_id, int) or student_id <= 0:
+            raise ValueError("Ungültige Schüler-ID")
+            
+        cursor = self.conn.cursor()
+        cursor.execute(
+            "SELECT id, title, note FROM work_titles WHERE student_id = ?",
+            (student_id,)
+        )
+        return cursor.fetchall()
+
+    def get_work_title(self, work_id: int) -> Optional[Tuple]:
+        """Holt einen einzelnen Arbeitstitel mit allen Spalten wie get_work_titles."""
+        if not isinstance(work_id, int) or work_id <= 0:
+            raise ValueError("Ungültige Arbeitstitel-ID")
+            
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT id, title, note, soziale_kompetenz, aktive_mitarbeit,
+                   sauberkeit, material, puenktlichkeit, kommentar
+            FROM work_titles
+            WHERE id = ?
+        """, (work_id,))
+        return cursor.fetchone()
+
     def close(self) -> None:
+        # Statistiken für den Query-Planer auffrischen, falls nötig (billig)
+        if not self.read_only:
+            try:
+                self.conn.execute("PRAGMA optimize")
+            except sqlite3.Error:
+                pass
         self.conn.close()
 
     def get_unique_classes(self) -> List[str]:
@@ -0,0 +1,181 @@
+import itertools
+import queue
+import threading
+from typing import Any, Callable, Dict, NamedTuple, Optional, Set, Tuple, Union
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from database_manager import DatabaseManager
+
+ResultCallback = Callable[[Any], None]
+ErrorCallback = Callable[[Exception], None]
+
+class _Job(NamedTuple):
+    job_id: int
+    task: Union[str, Callable[..., Any]]
+    args: Tuple
+
+class DatabaseWorker(QThread):
+    """
+    Führt alle Datenbankzugriffe in einem eigenen Thread mit eigener
+    SQLite-Verbindung aus, damit die Oberfläche nie auf SQLite wartet.
+
+    Aufträge werden mit submit() eingereiht und nacheinander abgearbeitet.
+    Ergebnisse und Fehler kommen über Signale zurück und werden im GUI-Thread
+    an die übergebenen Callbacks verteilt. Aufträge mit demselben key ersetzen
+    einander: ein neuer Auftrag bricht den älteren ab bzw. verwirft dessen
+    Ergebnis (z. B. eine veraltete Suchanfrage).
+    """
+
+    result_ready = pyqtSignal(int, object)
+    error_occurred = pyqtSignal(int, object)
+    connection_failed = pyqtSignal(object)
+    # Fehler eines Auftrags ohne on_error, damit die Oberfläche ihn anzeigt
+    job_failed = pyqtSignal(object)
+    # Änderungsmeldungen des DatabaseManager (entity, action, record_id, payload)
+    data_changed = pyqtSignal(str, str, int, object)
+
+    def __init__(self, db_path: str = "students.db", parent=None) -> None:
+        super().__init__(parent)
+        self.db_path: str = db_path
+        self._queue: "queue.Queue[Optional[_Job]]" = queue.Queue()
+        self._job_ids = itertools.count(1)
+        self._callbacks: Dict[int, Tuple[Optional[ResultCallback], Optional[ErrorCallback]]] = {}
+        self._latest_by_key: Dict[str, int] = {}
+        # Zugriff aus GUI- und Worker-Thread, daher durch _lock geschützt
+        self._lock = threading.Lock()
+        self._cancelled: Set[int] = set()
+        self._current_job: Optional[int] = None
+        self._db: Optional[DatabaseManager] = None
+
+        self.result_ready.connect(self._dispatch_result)
+        self.error_occurred.connect(self._dispatch_error)
+
+    def submit(self, task: Union[str, Callable[..., Any]], *args: Any,
+               key: Optional[str] = None,
+               on_result: Optional[ResultCallback] = None,
+               on_error: Optional[ErrorCallback] = None) -> int:
+        """
+        Reiht einen Datenbankauftrag ein und gibt dessen ID zurück.
+
+        Args:
+            task: Name einer DatabaseManager-Methode oder eine Funktion, die
+                  den DatabaseManager als erstes Argument erhält
+            args: Argumente für die Methode bzw. Funktion
+            key: Optionaler Schlüssel; ein älterer Auftrag mit demselben
+                 Schlüssel wird abgebrochen
+            on_result: Wird im GUI-Thread mit dem Ergebnis aufgerufen
+            on_error: Wird im GUI-Thread mit der Exception aufgerufen
+        """
+        job_id = next(self._job_ids)
+        if key is not None:
+            previous = self._latest_by_key.get(key)
+            if previous is not None:
+                self.cancel(previous)
+            self._latest_by_key[key] = job_id
+        self._callbacks[job_id] = (on_result, on_error)
+        self._queue.put(_Job(job_id, task, args))
+        return job_id
+
+    def cancel(self, job_id: int) -> None:
+        """Bricht einen Auftrag ab; ein bereits laufendes Statement wird unterbrochen."""
+        if self._callbacks.pop(job_id, None) is None:
+            # Schon verteilt oder abgebrochen: nichts mehr vormerken, sonst
+            # bliebe die ID für immer in _cancelled liegen
+            return
+        with self._lock:
+            self._cancelled.add(job_id)
+            if job_id == self._current_job and self._db is not None:
+                self._db.conn.interrupt()
+
+    def cancel_key(self, key: str) -> None:
+        """Bricht den zuletzt unter key eingereihten Auftrag ab."""
+        job_id = self._latest_by_key.pop(key, None)
+        if job_id is not None:
+            self.cancel(job_id)
+
+    def pending_count(self) -> int:
+        """Anzahl der Aufträge, deren Ergebnis noch nicht im GUI-Thread verteilt wurde."""
+        return len(self._callbacks)
+
+    def stop(self) -> None:
+        """Arbeitet ausstehende Aufträge ab, beendet den Thread und schließt die Verbindung."""
+        if self.isRunning():
+            self._queue.put(None)
+            self.wait()
+
+    def run(self) -> None:
+        try:
+            self._db = DatabaseManager(self.db_path)
+            self._db.add_change_listener(self.data_changed.emit)
+        except Exception as e:
+            self.connection_failed.emit(e)
+            return
+
+        try:
+            while True:
+                job = self._queue.get()
+                if job is None:
+                    break
+                with self._lock:
+                    if job.job_id in self._cancelled:
+                        self._cancelled.discard(job.job_id)
+                        continue
+                    self._current_job = job.job_id
+                try:
+                    if isinstance(job.task, str):
+                        result = getattr(self._db, job.task)(*job.args)
+                    else:
+                        result = job.task(self._db, *job.args)
+                except Exception as e:
+                    # Eine halb ausgeführte Änderung darf nicht mit dem nächsten
+                    # Auftrag festgeschrieben werden, egal welche Ausnahme sie beendet hat
+                    if self._db.conn.in_transaction:
+                        self._db.conn.rollback()
+                    # Ein abgebrochener Auftrag meldet keinen Fehler mehr, auch wenn
+                    # die Unterbrechung (OperationalError) eine andere Ausnahme auslöst
+                    if self._is_cancelled(job.job_id):
+                        continue
+                    self.error_occurred.emit(job.job_id, e)
+                    continue
+                finally:
+                    with self._lock:
+                        self._current_job = None
+                if not self._is_cancelled(job.job_id):
+                    self.result_ready.emit(job.job_id, result)
+        finally:
+            self._db.close()
+            self._db = None
+
+    def _is_cancelled(self, job_id: int) -> bool:
+        with self._lock:
+            if job_id in self._cancelled:
+                self._cancelled.discard(job_id)
+                return True
+            return False
+
+    def _dispatch_result(self, job_id: int, result: object) -> None:
+        on_result, _ = self._callbacks.pop(job_id, (None, None))
+        self._forget(job_id)
+        if on_result is not None:
+            on_result(result)
+
+    def _dispatch_error(self, job_id: int, error: object) -> None:
+        callbacks = self._callbacks.pop(job_id, None)
+        self._forget(job_id)
+        if callbacks is None:
+            # Inzwischen abgebrochen, der Fehler interessiert niemanden mehr
+            return
+        _, on_error = callbacks
+        if on_error is not None:
+            on_error(error)
+        else:
+            self.job_failed.emit(error)
+
+    def _forget(self, job_id: int) -> None:
+        with self._lock:
+            # Erst nach dem Senden abgebrochen: die Vormerkung wird nicht mehr gebraucht
+            self._cancelled.discard(job_id)
+        for key, latest in list(self._latest_by_key.items()):
+            if latest == job_id:
+                del self._latest_by_key[key]
@@ -1,4 +1,4 @@
-from typing import Tuple, Optional
+from typing import Callable, Dict, List, Set, Tuple, Optional
 
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton,
@@ -7,10 +7,25 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont
 
-from database_manager import DatabaseManager
+from database_manager import STUDENT_DETAIL_COLUMNS, WORK_TITLE_COLUMNS
+from db_worker import DatabaseWorker
+
+def _field_text(field) -> str:
+    """Aktueller, getrimmter Text eines QLineEdit oder QTextEdit."""
+    text = field.text() if isinstance(field, QLineEdit) else field.toPlainText()
+    return text.strip()
+
+def _ask_save_changes(parent: QDialog) -> QMessageBox.StandardButton:
+    return QMessageBox.question(
+        parent, "Ungespeicherte Änderungen",
+        "Es gibt ungespeicherte Änderungen. Möchten Sie diese speichern?",
+        QMessageBox.StandardButton.Save | QMessageBox.StandardButton.Discard
+        | QMessageBox.StandardButton.Cancel,
+        QMessageBox.StandardButton.Save
+    )
 
 class WorkTitleEditDialog(QDialog):
-    def __init__(self, student_id: int, db_manager: DatabaseManager,
+    def __init__(self, student_id: int, db_worker: DatabaseWorker,
                  work_data: Optional[Tuple] = None) -> None:
         """
         Falls work_data None ist, wird ein neuer Arbeitstitel angelegt.
@@ -18,8 +33,10 @@ class WorkTitleEditDialog(QDialog):
         """
         super().__init__()
         self.student_id: int = student_id
-        self.db_manager: DatabaseManager = db_manager
+        self.db_worker: DatabaseWorker = db_worker
         self.work_data: Optional[Tuple] = work_data
+        # True, sobald der Arbeitstitel in der Datenbank geändert wurde
+        self.changed: bool = False
         self.setWindowTitle("Arbeitstitel bearbeiten" if work_data else "Neuen Arbeitstitel anlegen")
         # Deutlich größeres Fenster
         self.setMinimumSize(1200, 700)  
@@ -96,40 +113,79 @@ class WorkTitleEditDialog(QDialog):
             self.puenktlichkeit_edit.setText(self.work_data[7] if self.work_data[7] else "")
             self.kommentar_edit.setText(self.work_data[8] if self.work_data[8] else "")
 
+        # Felder in der Spaltenreihenfolge der Datenbank, Ausgangswerte für die Änderungserkennung
+        self._fields = dict(zip(WORK_TITLE_COLUMNS, (
+            self.title_edit, self.note_edit, self.soziale_kompetenz_edit,
+            self.aktive_mitarbeit_edit, self.sauberkeit_edit, self.material_edit,
+            self.puenktlichkeit_edit, self.kommentar_edit
+        )))
+        self._original_values: Dict[str, str] = self.current_values()
+
+    def current_values(self) -> Dict[str, str]:
+        return {column: _field_text(field) for column, field in self._fields.items()}
+
+    def dirty_fields(self) -> Dict[str, str]:
+        """Nur die Felder, die sich seit dem Öffnen geändert haben."""
+        return {
+            column: value for column, value in self.current_values().items()
+            if value != self._original_values[column]
+        }
+
     def save_work_title(self) -> None:
         try:
-            title = self.title_edit.text().strip()
-            note = self.note_edit.text().strip()
-            soziale_kompetenz = self.soziale_kompetenz_edit.toPlainText().strip()
-            aktive_mitarbeit = self.aktive_mitarbeit_edit.toPlainText().strip()
-            sauberkeit = self.sauberkeit_edit.toPlainText().strip()
-            material = self.material_edit.toPlainText().strip()
-            puenktlichkeit = self.puenktlichkeit_edit.toPlainText().strip()
-            kommentar = self.kommentar_edit.toPlainText().strip()
+            dirty = self.dirty_fields()
+            if self.work_data and not dirty:
+                # Nichts geändert: ohne Schreibzugriff schließen
+                self.accept()
+                return
 
+            # Bis zur Rückmeldung des Workers doppeltes Speichern verhindern
+            self.save_button.setEnabled(False)
             if self.work_data:
-                work_id = self.work_data[0]
-                self.db_manager.update_work_title(
-                    work_id, title, note, soziale_kompetenz, aktive_mitarbeit,
-                    sauberkeit, material, puenktlichkeit, kommentar
+                self.db_worker.submit(
+                    "update_work_title_fields", self.work_data[0], dirty,
+                    on_result=self._on_saved, on_error=self._on_save_failed
                 )
             else:
-                self.db_manager.add_work_title(
-                    self.student_id, title, note, soziale_kompetenz, aktive_mitarbeit,
-                    sauberkeit, material, puenktlichkeit, kommentar
+                values = self.current_values()
+                self.db_worker.submit(
+                    "add_work_title", self.student_id,
+                    *(values[column] for column in WORK_TITLE_COLUMNS),
+                    on_result=self._on_saved, on_error=self._on_save_failed
                 )
-            self.accept()
         except Exception as e:
-            QMessageBox.critical(self, "Fehler", f"Fehler beim Speichern des Arbeitstitels:\n{str(e)}")
+            self._on_save_failed(e)
+
+    def reject(self) -> None:
+        if self.dirty_fields():
+            reply = _ask_save_changes(self)
+            if reply == QMessageBox.StandardButton.Save:
+                self.save_work_title()
+                return
+            if reply == QMessageBox.StandardButton.Cancel:
+                return
+        super().reject()
+
+    def _on_saved(self, _result: object) -> None:
+        self.changed = True
+        self.accept()
+
+    def _on_save_failed(self, error: Exception) -> None:
+        self.save_button.setEnabled(True)
+        QMessageBox.critical(self, "Fehler", f"Fehler beim Speichern des Arbeitstitels:\n{str(error)}")
 
 class StudentDetailDialog(QDialog):
-    def __init__(self, student_data: Tuple, db_manager: DatabaseManager) -> None:
+    def __init__(self, student_data: Tuple, db_worker: DatabaseWorker) -> None:
         """
         student_data: (id, firstname, lastname, class)
         """
         super().__init__()
         self.student_data: Tuple = student_data
-        self.db_manager: DatabaseManager = db_manager
+        self.db_worker: DatabaseWorker = db_worker
+        # Geänderte Bereiche ("student_details", "work_titles") für den Aufrufer
+        self.changed_entities: Set[str] = set()
+        # Vollständig geladene Arbeitstitel nach ID, bis zur nächsten Änderung gültig
+        self._work_title_cache: Dict[int, Tuple] = {}
         self.setWindowTitle(f"Schülerdetails: {student_data[1]} {student_data[2]}")
         # Größeres Dialog-Fenster für mehr Platz für die Arbeitstitel
         self.setMinimumSize(1000, 1000)
@@ -165,6 +221,10 @@ class StudentDetailDialog(QDialog):
         """)
         
         schueler_layout = QVBoxLayout(schueler_group)
+        # Bis die Schülerdetails geladen sind, gesperrt: Eingaben würden sonst
+        # beim Eintreffen der Daten ohne Rückfrage überschrieben
+        self.schueler_group: QGroupBox = schueler_group
+        self.schueler_group.setEnabled(False)
         
         # Erstellen der Eingabefelder für Schülerdetails
         self.soziale_kompetenz_edit = QTextEdit()
@@ -174,15 +234,19 @@ class StudentDetailDialog(QDialog):
         self.puenktlichkeit_edit = QTextEdit()
         self.kommentar_edit = QTextEdit()
         
-        # Daten laden, falls vorhanden
-        result = self.db_manager.get_student_details(self.student_data[0])
-        if result:
-            self.soziale_kompetenz_edit.setText(result[0] if result[0] else "")
-            self.aktive_mitarbeit_edit.setText(result[1] if result[1] else "")
-            self.sauberkeit_edit.setText(result[2] if result[2] else "")
-            self.material_edit.setText(result[3] if result[3] else "")
-            self.puenktlichkeit_edit.setText(result[4] if result[4] else "")
-            self.kommentar_edit.setText(result[5] if result[5] else "")
+        # Felder in der Spaltenreihenfolge der Datenbank, Ausgangswerte für die Änderungserkennung
+        self._detail_fields = dict(zip(STUDENT_DETAIL_COLUMNS, (
+            self.soziale_kompetenz_edit, self.aktive_mitarbeit_edit, self.sauberkeit_edit,
+            self.material_edit, self.puenktlichkeit_edit, self.kommentar_edit
+        )))
+        self._original_details: Dict[str, str] = self.current_details()
+        
+        # Daten im Hintergrund laden, falls vorhanden
+        self.db_worker.submit(
+            "get_student_details", self.student_data[0], on_result=self.fill_student_details,
+            on_error=lambda e: QMessageBox.critical(
+                self, "Fehler", f"Fehler beim Laden der Schülerdaten:\n{str(e)}")
+        )
         
         # Labels und Eingabefelder hinzufügen
         fields = [
@@ -308,25 +372,73 @@ class StudentDetailDialog(QDialog):
         # Gesamtlayout anwenden
         self.setLayout(main_layout)
 
+    def fill_student_details(self, result: Optional[Tuple]) -> None:
+        if result:
+            self.soziale_kompetenz_edit.setText(result[0] if result[0] else "")
+            self.aktive_mitarbeit_edit.setText(result[1] if result[1] else "")
+            self.sauberkeit_edit.setText(result[2] if result[2] else "")
+            self.material_edit.setText(result[3] if result[3] else "")
+            self.puenktlichkeit_edit.setText(result[4] if result[4] else "")
+            self.kommentar_edit.setText(result[5] if result[5] else "")
+        self._original_details = self.current_details()
+        self.schueler_group.setEnabled(True)
+
+    def current_details(self) -> Dict[str, str]:
+        return {column: _field_text(field) for column, field in self._detail_fields.items()}
+
+    def dirty_details(self) -> Dict[str, str]:
+        """Nur die Schülerdetails, die seit dem Laden bzw. Speichern geändert wurden."""
+        return {
+            column: value for column, value in self.current_details().items()
+            if value != self._original_details[column]
+        }
+
     def save_student_details(self) -> None:
+        if not self.dirty_details():
+            QMessageBox.information(self, "Hinweis", "Keine Änderungen zum Speichern.")
+            return
+        self._write_dirty_details(
+            lambda: QMessageBox.information(self, "Erfolg", "Schülerdaten aktualisiert."))
+
+    def _write_dirty_details(self, on_saved: Callable[[], None]) -> None:
+        """Schreibt nur die geänderten Spalten in einer Transaktion."""
         try:
-            soziale_kompetenz = self.soziale_kompetenz_edit.toPlainText().strip()
-            aktive_mitarbeit = self.aktive_mitarbeit_edit.toPlainText().strip()
-            sauberkeit = self.sauberkeit_edit.toPlainText().strip()
-            material = self.material_edit.toPlainText().strip()
-            puenktlichkeit = self.puenktlichkeit_edit.toPlainText().strip()
-            kommentar = self.kommentar_edit.toPlainText().strip()
-            self.db_manager.update_student_details(
-                self.student_data[0], soziale_kompetenz, aktive_mitarbeit, sauberkeit,
-                material, puenktlichkeit, kommentar
+            dirty = self.dirty_details()
+            
+            def saved(_result: object) -> None:
+                self._original_details.update(dirty)
+                self.changed_entities.add("student_details")
+                on_saved()
+            
+            self.db_worker.submit(
+                "update_student_fields", self.student_data[0], dirty,
+                on_result=saved,
+                on_error=lambda e: QMessageBox.critical(
+                    self, "Fehler", f"Fehler beim Speichern der Schülerdaten:\n{str(e)}")
             )
-            QMessageBox.information(self, "Erfolg", "Schülerdaten aktualisiert.")
         except Exception as e:
             QMessageBox.critical(self, "Fehler", f"Fehler beim Speichern der Schülerdaten:\n{str(e)}")
 
+    def reject(self) -> None:
+        if self.dirty_details():
+            reply = _ask_save_changes(self)
+            if reply == QMessageBox.StandardButton.Save:
+                self._write_dirty_details(super().reject)
+                return
+            if reply == QMessageBox.StandardButton.Cancel:
+                return
+        super().reject()
+
     def load_work_titles(self) -> None:
+        self.db_worker.submit(
+            "get_work_title_list", self.student_data[0], key=f"work_titles:{self.student_data[0]}",
+            on_result=self.fill_work_titles,
+            on_error=lambda e: QMessageBox.critical(
+                self, "Fehler", f"Fehler beim Laden der Arbeitstitel:\n{str(e)}")
+        )
+
+    def fill_work_titles(self, work_titles: List[Tuple]) -> None:
         try:
-            work_titles = self.db_manager.get_work_titles(self.student_data[0])
             self.work_title_table.setRowCount(0)
             for row_index, wt in enumerate(work_titles):
                 self.work_title_table.insertRow(row_index)
@@ -338,8 +450,9 @@ class StudentDetailDialog(QDialog):
             QMessageBox.critical(self, "Fehler", f"Fehler beim Laden der Arbeitstitel:\n{str(e)}")
 
     def add_work_title(self) -> None:
-        dialog = WorkTitleEditDialog(self.student_data[0], self.db_manager)
-        if dialog.exec() == QDialog.DialogCode.Accepted:
+        dialog = WorkTitleEditDialog(self.student_data[0], self.db_worker)
+        if dialog.exec() == QDialog.DialogCode.Accepted and dialog.changed:
+            self.changed_entities.add("work_titles")
             self.load_work_titles()
 
     def delete_work_title(self) -> None:
@@ -349,25 +462,47 @@ class StudentDetailDialog(QDialog):
             return
         try:
             work_id = int(self.work_title_table.item(selected_row, 0).text())
-            self.db_manager.delete_work_title(work_id)
-            self.load_work_titles()
+            self.db_worker.submit(
+                "delete_work_title", work_id,
+                on_result=lambda _: self._on_work_title_deleted(work_id),
+                on_error=lambda e: QMessageBox.critical(
+                    self, "Fehler", f"Fehler beim Löschen des Arbeitstitels:\n{str(e)}")
+            )
         except Exception as e:
             QMessageBox.critical(self, "Fehler", f"Fehler beim Löschen des Arbeitstitels:\n{str(e)}")
 
+    def _on_work_title_deleted(self, work_id: int) -> None:
+        self._work_title_cache.pop(work_id, None)
+        self.changed_entities.add("work_titles")
+        self.load_work_titles()
+
     def edit_work_title(self, row: int, column: int) -> None:
         try:
             work_id = int(self.work_title_table.item(row, 0).text())
-            work_titles = self.db_manager.get_work_titles(self.student_data[0])
-            work_data: Optional[Tuple] = None
-            for wt in work_titles:
-                if wt[0] == work_id:
-                    work_data = wt
-                    break
+            cached = self._work_title_cache.get(work_id)
+            if cached is not None:
+                self.open_work_title_editor(work_id, cached)
+                return
+            self.db_worker.submit(
+                "get_work_title", work_id,
+                on_result=lambda work_data: self.open_work_title_editor(work_id, work_data),
+                on_error=lambda e: QMessageBox.critical(
+                    self, "Fehler", f"Fehler beim Bearbeiten des Arbeitstitels:\n{str(e)}")
+            )
+        except Exception as e:
+            QMessageBox.critical(self, "Fehler", f"Fehler beim Bearbeiten des Arbeitstitels:\n{str(e)}")
+
+    def open_work_title_editor(self, work_id: int, work_data: Optional[Tuple]) -> None:
+        try:
             if not work_data:
                 QMessageBox.warning(self, "Fehler", "Arbeitstiteldaten nicht gefunden.")
                 return
-            dialog = WorkTitleEditDialog(self.student_data[0], self.db_manager, work_data)
-            if dialog.exec() == QDialog.DialogCode.Accepted:
+            self._work_title_cache[work_id] = work_data
+            dialog = WorkTitleEditDialog(self.student_data[0], self.db_worker, work_data)
+            if dialog.exec() == QDialog.DialogCode.Accepted and dialog.changed:
+                # Zwischengespeicherte Texte sind veraltet
+                self._work_title_cache.pop(work_id, None)
+                self.changed_entities.add("work_titles")
                 self.load_work_titles()
         except Exception as e:
             QMessageBox.critical(self, "Fehler", f"Fehler beim Bearbeiten des Arbeitstitels:\n{str(e)}")
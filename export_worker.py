@@ -0,0 +1,124 @@
+import os
+import threading
+from typing import Iterator, List, Optional, Tuple
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from batch_export import export_students_parallel
+from database_manager import DatabaseManager
+from pdf_export import ExportCache, export_class_booklet, export_student_to_pdf
+
+class StudentExportWorker(QThread):
+    """Erstellt die PDF eines einzelnen Schülers, ohne den GUI-Thread zu blockieren."""
+
+    export_finished = pyqtSignal(str)
+    export_failed = pyqtSignal(object)
+
+    def __init__(self, student: Tuple, student_details: Optional[Tuple], work_titles: List[Tuple],
+                 output_dir: str = "", parent=None) -> None:
+        super().__init__(parent)
+        self.student: Tuple = student
+        self.student_details: Optional[Tuple] = student_details
+        self.work_titles: List[Tuple] = work_titles
+        self.output_dir: str = output_dir
+
+    def run(self) -> None:
+        student_id, firstname, lastname, klass = self.student
+        try:
+            # Unveränderte Schüler werden nicht neu erstellt
+            cache = ExportCache(self.output_dir)
+            filename = export_student_to_pdf(
+                student_id, firstname, lastname, klass or "",
+                self.student_details, self.work_titles, self.output_dir, cache
+            )
+            cache.save()
+        except Exception as e:
+            self.export_failed.emit(e)
+            return
+        self.export_finished.emit(filename)
+
+class BatchExportWorker(QThread):
+    """
+    Steuert den parallelen PDF-Export mehrerer Schüler aus einem eigenen
+    Thread, damit die Oberfläche während des Exports bedienbar bleibt.
+    """
+
+    # (fertige Schüler, Gesamtzahl)
+    progress_changed = pyqtSignal(int, int)
+    # (erstellte Dateien, Fehler als (Schülerzeile, Meldung), abgebrochen)
+    export_finished = pyqtSignal(object, object, bool)
+    export_failed = pyqtSignal(object)
+
+    def __init__(self, db_path: str, students: List[Tuple], output_dir: str, parent=None) -> None:
+        super().__init__(parent)
+        self.db_path: str = db_path
+        self.students: List[Tuple] = students
+        self.output_dir: str = output_dir
+        self._cancel_event = threading.Event()
+
+    def cancel(self) -> None:
+        """Verwirft alle noch nicht begonnenen Exporte."""
+        self._cancel_event.set()
+
+    def run(self) -> None:
+        try:
+            filenames, errors = export_students_parallel(
+                self.db_path, self.students, self.output_dir,
+                progress=self.progress_changed.emit, cancel_event=self._cancel_event
+            )
+        except Exception as e:
+            self.export_failed.emit(e)
+            return
+        self.export_finished.emit(filenames, errors, self._cancel_event.is_set())
+
+class BookletExportWorker(QThread):
+    """
+    Erstellt das Klassenheft in einem eigenen Thread mit eigener, nur lesender
+    Datenbankverbindung. Die Schüler werden während des Setzens gelesen.
+    """
+
+    # (fertige Schüler, Gesamtzahl)
+    progress_changed = pyqtSignal(int, int)
+    # (Dateiname, abgebrochen)
+    booklet_finished = pyqtSignal(str, bool)
+    export_failed = pyqtSignal(object)
+
+    def __init__(self, db_path: str, klass: str, output_dir: str, parent=None) -> None:
+        super().__init__(parent)
+        self.db_path: str = db_path
+        self.klass: str = klass
+        self.output_dir: str = output_dir
+        self._cancel_event = threading.Event()
+
+    def cancel(self) -> None:
+        """Bricht das Heft nach dem aktuellen Schüler ab; die Datei wird verworfen."""
+        self._cancel_event.set()
+
+    def run(self) -> None:
+        db = None
+        try:
+            db = DatabaseManager(self.db_path, read_only=True)
+            total = db.count_students(self.klass or None)
+            self.progress_changed.emit(0, total)
+            filename = export_class_booklet(
+                self.klass, self._reports(db, total), self.output_dir)
+        except Exception as e:
+            self.export_failed.emit(e)
+            return
+        finally:
+            if db is not None:
+                db.close()
+
+        cancelled = self._cancel_event.is_set()
+        if cancelled and os.path.exists(filename):
+            os.remove(filename)
+        self.booklet_finished.emit(filename, cancelled)
+
+    def _reports(self, db: DatabaseManager, total: int) -> Iterator[Tuple]:
+        done = 0
+        for report in db.iter_students_with_work_titles(self.klass or None):
+            if self._cancel_event.is_set():
+                return
+            yield report
+            done += 1
+            self.progress_changed.emit(done, total)
@@ -1,9 +1,11 @@
 import sys
 import multiprocessing
 
+from PyQt6.QtCore import QTimer
 from PyQt6.QtWidgets import QApplication
 
 from main_window import MainWindow
+from pdf_export import warm_up_in_background
 
 def main() -> None:
     # Notwendig für Windows-Anwendungen mit PyInstaller
@@ -17,6 +19,13 @@ def main() -> None:
     window = MainWindow()
     window.showMaximized()  # Maximiert das Fenster
     
+    # Datenbank erst öffnen, wenn das leere Fenster gezeichnet ist; ein Timer
+    # mit 0 ms läuft erst nach den bereits anstehenden Zeichenereignissen
+    QTimer.singleShot(0, window.start_loading)
+    
+    # reportlab erst nach dem ersten Zeichnen des Fensters im Hintergrund laden
+    QTimer.singleShot(500, warm_up_in_background)
+    
     sys.exit(app.exec())
 
 if __name__ == "__main__":
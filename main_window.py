@@ -1,20 +1,43 @@
+import os
+from typing import List, Optional, Tuple
+
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel,
-    QLineEdit, QPushButton, QMessageBox, QTableWidget, QTableWidgetItem,
-    QComboBox
+    QLineEdit, QPushButton, QMessageBox, QTableView, QAbstractItemView,
+    QComboBox, QCheckBox, QFileDialog, QProgressDialog, QProgressBar, QDockWidget,
+    QStackedWidget
 )
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QFont
+from PyQt6.QtCore import Qt, QTimer, QModelIndex, QThread, QUrl, QPoint
+from PyQt6.QtGui import QFont, QCloseEvent, QDesktopServices
 
-from database_manager import DatabaseManager
+from db_worker import DatabaseWorker
+from export_worker import BatchExportWorker, BookletExportWorker, StudentExportWorker
 from dialogs import StudentDetailDialog
-from pdf_export import export_student_to_pdf, open_pdf, REPORTLAB_AVAILABLE
+from student_model import StudentTableModel, StudentFilterProxyModel
+from pdf_export import open_pdf, REPORTLAB_AVAILABLE
+from pdf_preview import PdfPreviewWidget, QTPDF_AVAILABLE
+from session_snapshot import SNAPSHOT_ROWS, SessionSnapshot
+
+# Wartezeit nach dem letzten Tastendruck, bevor gesucht wird
+SEARCH_DEBOUNCE_MS = 250
+
+# Anzahl Schüler, die pro Seite aus der Datenbank nachgeladen werden
+STUDENT_PAGE_SIZE = 500
+
+# Bis zu dieser Größe wird die ganze Schülerliste im Hintergrund geladen und
+# danach im Speicher gefiltert; größere Listen werden seitenweise abgefragt
+FULL_ROSTER_LIMIT = 20000
 
 class MainWindow(QMainWindow):
     def __init__(self) -> None:
         super().__init__()
         self.setWindowTitle("Schülerverwaltung")
-        self.db_manager = DatabaseManager()
+        # Alle Datenbankzugriffe laufen im Hintergrund-Thread des Workers;
+        # gestartet wird er erst mit start_loading(), nachdem das Fenster steht
+        self.db_worker = DatabaseWorker()
+        self.db_worker.connection_failed.connect(self.on_connection_failed)
+        self.db_worker.job_failed.connect(self.on_database_error)
+        self.db_worker.data_changed.connect(self.on_data_changed)
 
         # Fenstergröße basierend auf Bildschirmauflösung einstellen
         screen = QApplication.primaryScreen()
@@ -27,12 +50,161 @@ class MainWindow(QMainWindow):
         else:
             self.setMinimumSize(600, 600)  # Minimale Fenstergröße als Fallback
 
-        self.setup_ui()
-        self.load_students()
-        
+        # Letztes Suchergebnis (Suchbegriff, Klasse, Bewertungssuche, Zeilen) für
+        # die Eingrenzung im Speicher, wenn der Suchbegriff nur verlängert wird
+        self._last_result: Optional[Tuple[str, str, bool, List[Tuple]]] = None
+        # Klassenfilter der seitenweise geladenen Liste
+        self._page_class_filter: str = ""
+        # Filter (Suchbegriff, Klasse, Bewertungssuche) der angezeigten Liste
+        # und Gesamtzahl der Treffer, für das Einpflegen einzelner Änderungen
+        self._shown_filter: Tuple[str, str, bool] = ("", "", False)
+        self._shown_total: int = 0
+        # Zuletzt angeforderter Filter; Ergebnisse zu älteren Filtern werden verworfen
+        self._requested_filter: Tuple[str, str, bool] = ("", "", False)
+        # Die ungefilterte Schülerliste wird gerade vollständig nachgeladen
+        self._roster_loading: bool = False
+        # Laufender Sammelexport bzw. Klassenheft mit Fortschrittsdialog
+        self._export_worker: Optional[QThread] = None
+        self._export_progress: Optional[QProgressDialog] = None
+        # Laufende Einzelexporte, angezeigt in der Statusleiste
+        self._student_exports: List[StudentExportWorker] = []
+
         # Flag für die Initialisierung des Klassenfilters
         self.class_filter_initialized = False
 
+        # Stand der letzten Sitzung; wird angezeigt, bis die echten Daten da sind
+        self._snapshot: Optional[SessionSnapshot] = SessionSnapshot.load(self.db_worker.db_path)
+
+        self.setup_ui()
+        if self._snapshot is not None:
+            self.show_snapshot(self._snapshot)
+        else:
+            self.show_loading("Datenbank wird geöffnet...")
+
+    def start_loading(self) -> None:
+        """
+        Öffnet die Datenbank und lädt die Schülerliste im Hintergrund.
+
+        Wird nach dem ersten Anzeigen des Fensters aufgerufen, damit das Fenster
+        sofort erscheint, unabhängig von der Größe der Datenbank. Bis die erste
+        Seite da ist, zeigt die Tabelle den Stand der letzten Sitzung oder
+        einen Ladehinweis.
+        """
+        if self.db_worker.isRunning():
+            return
+        self.db_worker.start()
+        if self._snapshot is not None:
+            self.db_worker.submit("get_generation", on_result=self._check_snapshot)
+        self.load_students()
+
+    def show_snapshot(self, snapshot: SessionSnapshot) -> None:
+        """Zeigt Filter und Liste der letzten Sitzung, ohne die Datenbank zu öffnen."""
+        filter_widgets = (self.search_edit, self.search_evaluations_check, self.class_filter_combo)
+        for widget in filter_widgets:
+            widget.blockSignals(True)
+        self.search_edit.setText(snapshot.keyword)
+        self.search_evaluations_check.setChecked(snapshot.in_evaluations)
+        self.class_filter_combo.clear()
+        self.class_filter_combo.addItem("Alle Klassen")
+        self.class_filter_combo.addItems(snapshot.classes)
+        index = self.class_filter_combo.findText(snapshot.class_filter) if snapshot.class_filter else 0
+        self.class_filter_combo.setCurrentIndex(max(index, 0))
+        for widget in filter_widgets:
+            widget.blockSignals(False)
+
+        self._shown_filter = (snapshot.keyword, snapshot.class_filter, snapshot.in_evaluations)
+        self._shown_total = snapshot.total
+        # Die Zeilen liegen bereits in Anzeigereihenfolge vor
+        self.student_proxy.set_filter("", "")
+        self.student_model.set_students(snapshot.rows)
+        order = Qt.SortOrder.DescendingOrder if snapshot.sort_descending else Qt.SortOrder.AscendingOrder
+        if snapshot.sort_column >= 0:
+            self.student_table.sortByColumn(snapshot.sort_column, order)
+        else:
+            self.student_table.horizontalHeader().setSortIndicator(-1, order)
+        if snapshot.top_student_id is not None:
+            QTimer.singleShot(0, lambda: self._scroll_to_student(snapshot.top_student_id))
+
+        # Bis feststeht, dass der Stand aktuell ist, keine Aktionen auf seinen Zeilen
+        self.student_table.setEnabled(False)
+        self.statusBar().showMessage("Stand der letzten Sitzung, Daten werden geladen...")
+
+    def _check_snapshot(self, generation: int) -> None:
+        """Vergleicht den Generationszähler der Datenbank mit dem des angezeigten Stands."""
+        if self._snapshot is None:
+            # Die echten Daten sind schon da
+            return
+        if generation == self._snapshot.generation:
+            # Seit der letzten Sitzung unverändert: Zeilen sind schon benutzbar
+            self.student_table.setEnabled(True)
+        else:
+            self.statusBar().showMessage(
+                "Daten wurden seit der letzten Sitzung geändert, Liste wird aktualisiert...")
+
+    def _end_snapshot(self) -> Optional[int]:
+        """
+        Beendet die Anzeige des Sitzungsstands, bevor die echten Daten gesetzt werden.
+
+        Returns:
+            ID der obersten sichtbaren Zeile, um sie danach wieder oben anzuzeigen
+        """
+        if self._snapshot is None:
+            return None
+        self._snapshot = None
+        self.student_table.setEnabled(True)
+        return self._top_student_id()
+
+    def _top_student_id(self) -> Optional[int]:
+        index = self.student_table.indexAt(QPoint(0, 0))
+        student = self.student_proxy.student_at(index.row()) if index.isValid() else None
+        return student[0] if student else None
+
+    def _scroll_to_student(self, student_id: int) -> None:
+        """Scrollt den Schüler an den oberen Rand der Tabelle, falls er geladen ist."""
+        row = self.student_model.row_of(student_id)
+        if row < 0:
+            return
+        while self.student_model.rowCount() <= row and self.student_model.canFetchMore():
+            self.student_model.fetchMore()
+        index = self.student_proxy.mapFromSource(self.student_model.index(row, 1))
+        if index.isValid():
+            self.student_table.scrollTo(index, QAbstractItemView.ScrollHint.PositionAtTop)
+
+    def _save_snapshot(self) -> None:
+        """Speichert Filter und angezeigte Zeilen für den nächsten Start."""
+        if not self.db_worker.isRunning() or self._snapshot is not None:
+            # Ohne echte Daten bleibt der bisherige Stand gültig
+            return
+        if self.db_worker.pending_count() > 0:
+            # Eine Änderung ist noch nicht in der Liste angekommen; der alte Stand
+            # passt dann nicht mehr zum Zähler und wird beim Start neu geladen
+            return
+        header = self.student_table.horizontalHeader()
+        rows = [self.student_proxy.student_at(row)
+                for row in range(min(self.student_proxy.rowCount(), SNAPSHOT_ROWS))]
+        snapshot = SessionSnapshot(
+            keyword=self.search_edit.text(),
+            class_filter=self._class_filter_text(self.class_filter_combo.currentText()),
+            in_evaluations=self.search_evaluations_check.isChecked(),
+            classes=[self.class_filter_combo.itemText(i) for i in range(1, self.class_filter_combo.count())],
+            rows=[row for row in rows if row is not None],
+            total=self.student_proxy.rowCount() if self.student_proxy.is_filtering() else self._shown_total,
+            sort_column=header.sortIndicatorSection(),
+            sort_descending=header.sortIndicatorOrder() == Qt.SortOrder.DescendingOrder,
+            top_student_id=self._top_student_id(),
+        )
+        db_path = self.db_worker.db_path
+
+        def save(db) -> None:
+            # Es steht kein Auftrag mehr aus, alle Änderungen sind in den Zeilen
+            # angekommen: der Zähler gehört zu genau diesem Stand
+            snapshot.generation = db.get_generation()
+            snapshot.save(db_path)
+
+        # Ohne gespeicherten Stand zeigt der nächste Start nur den Ladehinweis,
+        # ein Fehler beim Schreiben wird deshalb bewusst verworfen
+        self.db_worker.submit(save, on_error=lambda e: None)
+
     def setup_ui(self) -> None:
         layout = QVBoxLayout()
         
@@ -70,9 +242,22 @@ class MainWindow(QMainWindow):
         self.search_edit = QLineEdit()
         self.search_edit.setPlaceholderText("Nach Schüler suchen...")
         self.search_edit.setMinimumHeight(35)
-        self.search_edit.textChanged.connect(self.apply_filters)
+        self.search_edit.textChanged.connect(self.schedule_search)
         filter_layout.addWidget(self.search_edit)
         
+        # Suche erst nach einer kurzen Tipp-Pause auslösen
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.apply_filters)
+        
+        # Optional auch Arbeitstitel und Bewertungstexte durchsuchen
+        self.search_evaluations_check = QCheckBox("In Bewertungen suchen")
+        self.search_evaluations_check.setToolTip(
+            "Durchsucht zusätzlich Klasse, Schülerdetails, Arbeitstitel und alle Bewertungstexte")
+        self.search_evaluations_check.toggled.connect(self.apply_filters)
+        filter_layout.addWidget(self.search_evaluations_check)
+        
         # Klassenfilter-ComboBox
         self.class_filter_combo = QComboBox()
         self.class_filter_combo.setMinimumHeight(35)
@@ -91,10 +276,16 @@ class MainWindow(QMainWindow):
         layout.addLayout(filter_layout)
 
         # Tabelle der Schüler
-        self.student_table = QTableWidget()
-        self.student_table.setColumnCount(4)
-        self.student_table.setHorizontalHeaderLabels(["", "Vorname", "Nachname", "Klasse"])
-        self.student_table.cellDoubleClicked.connect(self.open_student_details)
+        self.student_model = StudentTableModel(self)
+        self.student_model.more_rows_requested.connect(self.load_more_students)
+        # Klassen- und Namensfilter ohne Datenbankabfrage, sobald alle Schüler geladen sind
+        self.student_proxy = StudentFilterProxyModel(self)
+        self.student_proxy.setSourceModel(self.student_model)
+        self.student_table = QTableView()
+        self.student_table.setModel(self.student_proxy)
+        self.student_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.student_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.student_table.doubleClicked.connect(self.open_student_details)
         
         # ID-Spalte komplett ausblenden
         self.student_table.setColumnHidden(0, True)
@@ -102,7 +293,7 @@ class MainWindow(QMainWindow):
         # Tabelle soll den verfügbaren Platz nutzen
         self.student_table.horizontalHeader().setStretchLastSection(True)
         # Verbinden der row selection mit der Aktivierung des PDF-Export-Buttons
-        self.student_table.itemSelectionChanged.connect(self.update_button_states)
+        self.student_table.selectionModel().selectionChanged.connect(self.update_button_states)
         
         # Sortierung aktivieren
         self.student_table.setSortingEnabled(True)
@@ -112,10 +303,29 @@ class MainWindow(QMainWindow):
         # Spalte für ID kleiner machen, da sie kein Label mehr hat
         header = self.student_table.horizontalHeader()
         # Alle Spalten gleich breit
-        for i in range(self.student_table.columnCount()):
+        for i in range(self.student_model.columnCount()):
             header.setSectionResizeMode(i, header.ResizeMode.Stretch)
         
-        layout.addWidget(self.student_table)
+        # Ladehinweis anstelle der Tabelle, bis die erste Seite geladen ist
+        self.loading_label = QLabel()
+        self.loading_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.loading_label.setStyleSheet("color: #666666;")
+        loading_bar = QProgressBar()
+        loading_bar.setRange(0, 0)  # Unbestimmte Dauer
+        loading_bar.setMaximumWidth(250)
+        loading_layout = QVBoxLayout()
+        loading_layout.addStretch()
+        loading_layout.addWidget(self.loading_label)
+        loading_layout.addWidget(loading_bar, 0, Qt.AlignmentFlag.AlignHCenter)
+        loading_layout.addStretch()
+        self.loading_page = QWidget()
+        self.loading_page.setLayout(loading_layout)
+        self.loading_bar = loading_bar
+
+        self.table_stack = QStackedWidget()
+        self.table_stack.addWidget(self.student_table)
+        self.table_stack.addWidget(self.loading_page)
+        layout.addWidget(self.table_stack)
 
         # Button-Layouts für Aktionen unter der Schülertabelle
         buttons_layout = QHBoxLayout()
@@ -134,6 +344,26 @@ class MainWindow(QMainWindow):
         self.export_pdf_button.setEnabled(False)  # Initial deaktiviert
         buttons_layout.addWidget(self.export_pdf_button)
         
+        # Sammelexport: alle Schüler der gewählten Klasse als einzelne PDFs
+        self.export_class_button = QPushButton("Klasse exportieren")
+        self.export_class_button.setMinimumHeight(40)
+        self.export_class_button.setStyleSheet("background-color: #55AA55;")
+        self.export_class_button.clicked.connect(self.export_class_to_pdf)
+        if not REPORTLAB_AVAILABLE:
+            self.export_class_button.setEnabled(False)
+            self.export_class_button.setToolTip("Reportlab-Bibliothek nicht verfügbar. Bitte installieren Sie 'reportlab'.")
+        buttons_layout.addWidget(self.export_class_button)
+        
+        # Ein gemeinsames PDF-Heft für die gewählte Klasse
+        self.export_booklet_button = QPushButton("Klassenheft erstellen")
+        self.export_booklet_button.setMinimumHeight(40)
+        self.export_booklet_button.setStyleSheet("background-color: #55AA55;")
+        self.export_booklet_button.clicked.connect(self.export_class_booklet)
+        if not REPORTLAB_AVAILABLE:
+            self.export_booklet_button.setEnabled(False)
+            self.export_booklet_button.setToolTip("Reportlab-Bibliothek nicht verfügbar. Bitte installieren Sie 'reportlab'.")
+        buttons_layout.addWidget(self.export_booklet_button)
+        
         # Beenden-Button hinzufügen
         self.exit_button = QPushButton("Beenden")
         self.exit_button.setMinimumHeight(40)
@@ -146,11 +376,38 @@ class MainWindow(QMainWindow):
         central_widget = QWidget()
         central_widget.setLayout(layout)
         self.setCentralWidget(central_widget)
+        
+        # Fortschrittsanzeige für PDF-Exporte im Hintergrund
+        self.export_progress_bar = QProgressBar()
+        self.export_progress_bar.setRange(0, 0)  # Unbestimmte Dauer
+        self.export_progress_bar.setMaximumWidth(150)
+        self.export_progress_bar.setVisible(False)
+        self.statusBar().addPermanentWidget(self.export_progress_bar)
+        
+        # Vorschau exportierter PDFs in der App, falls QtPdf verfügbar ist
+        self.pdf_preview: Optional[PdfPreviewWidget] = None
+        if QTPDF_AVAILABLE:
+            self.pdf_preview = PdfPreviewWidget(self)
+            self.pdf_preview.open_external_requested.connect(self.open_pdf_external)
+            self.preview_dock = QDockWidget("PDF-Vorschau", self)
+            self.preview_dock.setWidget(self.pdf_preview)
+            self.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, self.preview_dock)
+            self.preview_dock.hide()
     
+    def show_loading(self, text: str) -> None:
+        """Zeigt statt der Tabelle einen Ladehinweis."""
+        self.loading_label.setText(text)
+        self.loading_bar.setVisible(True)
+        self.table_stack.setCurrentWidget(self.loading_page)
+        self.statusBar().showMessage(text)
+
+    def hide_loading(self) -> None:
+        self.table_stack.setCurrentWidget(self.student_table)
+
     def update_button_states(self) -> None:
         """Aktiviert oder deaktiviert Buttons basierend auf der Schülerauswahl"""
-        selected_rows = self.student_table.selectedItems()
-        self.export_pdf_button.setEnabled(len(selected_rows) > 0)
+        has_selection = self.student_table.selectionModel().hasSelection()
+        self.export_pdf_button.setEnabled(has_selection)
         # Nur bei verfügbarer reportlab Bibliothek aktivieren
         if not REPORTLAB_AVAILABLE:
             self.export_pdf_button.setEnabled(False)
@@ -163,72 +420,245 @@ class MainWindow(QMainWindow):
                                 "Reportlab-Bibliothek nicht verfügbar. Bitte installieren Sie 'reportlab' mit dem Befehl:\npip install reportlab")
             return
             
-        selected_row = self.student_table.currentRow()
-        if selected_row == -1:
+        student = self.student_proxy.student_at(self.student_table.currentIndex().row())
+        if student is None:
             QMessageBox.warning(self, "Warnung", "Bitte wählen Sie einen Schüler aus.")
             return
         
+        student_id, firstname, lastname, klass = student
+        
+        self.statusBar().showMessage(f"PDF für {firstname} {lastname} wird erstellt...")
+        self.export_progress_bar.setVisible(True)
+        
+        # Details und Arbeitstitel des Schülers in einem Auftrag abrufen
+        self.db_worker.submit(
+            lambda db: (db.get_student_details(student_id), db.get_work_titles(student_id)),
+            on_result=lambda data: self._write_pdf(student, *data),
+            on_error=self._on_pdf_export_failed
+        )
+
+    def _write_pdf(self, student: Tuple, student_details: Optional[Tuple], work_titles: List[Tuple]) -> None:
+        # PDF im Hintergrund erstellen, die Oberfläche bleibt bedienbar
+        worker = StudentExportWorker(student, student_details, work_titles, parent=self)
+        worker.export_finished.connect(self._on_pdf_exported)
+        worker.export_failed.connect(self._on_pdf_export_failed)
+        worker.finished.connect(lambda: self._forget_student_export(worker))
+        self._student_exports.append(worker)
+        worker.start()
+
+    def _forget_student_export(self, worker: StudentExportWorker) -> None:
+        if worker in self._student_exports:
+            self._student_exports.remove(worker)
+        worker.deleteLater()
+        self.export_progress_bar.setVisible(bool(self._student_exports))
+
+    def _on_pdf_exported(self, filename: str) -> None:
+        self.statusBar().showMessage(f"PDF wurde erfolgreich erstellt: {filename}", 10000)
+        self.open_pdf_viewer(filename)
+
+    def _on_pdf_export_failed(self, error: Exception) -> None:
+        self.export_progress_bar.setVisible(bool(self._student_exports))
+        self.statusBar().clearMessage()
+        if isinstance(error, ImportError):
+            QMessageBox.critical(self, "Fehler", "Reportlab-Bibliothek nicht verfügbar.")
+        else:
+            QMessageBox.critical(self, "Fehler", f"Fehler beim Erstellen oder Öffnen der PDF:\n{str(error)}")
+
+    def open_pdf_viewer(self, filename: str) -> None:
+        """Zeigt eine PDF in der Vorschau, ohne QtPdf im Standardbetrachter."""
+        self.show_pdf_preview([filename])
+
+    def show_pdf_preview(self, filenames: List[str]) -> None:
+        """Zeigt eine oder mehrere PDFs zum Durchblättern in der Vorschau."""
+        if not filenames:
+            return
+        if self.pdf_preview is None:
+            self.open_pdf_external(filenames[0])
+            return
+        self.pdf_preview.show_files(filenames)
+        self.preview_dock.show()
+        self.preview_dock.raise_()
+
+    def open_pdf_external(self, filename: str) -> None:
+        """Öffnet eine PDF im Standardbetrachter, ohne auf dessen Start zu warten."""
+        if QDesktopServices.openUrl(QUrl.fromLocalFile(os.path.abspath(filename))):
+            return
         try:
-            student_id = int(self.student_table.item(selected_row, 0).text())
-            firstname = self.student_table.item(selected_row, 1).text()
-            lastname = self.student_table.item(selected_row, 2).text()
-            klass = self.student_table.item(selected_row, 3).text()
-            
-            # Alle Daten des Schülers abrufen
-            student_details = self.db_manager.get_student_details(student_id)
-            
-            # Arbeitstitel des Schülers abrufen
-            work_titles = self.db_manager.get_work_titles(student_id)
-            
-            # PDF erstellen
-            filename = export_student_to_pdf(student_id, firstname, lastname, klass, student_details, work_titles)
-            
-            # Erfolgsmeldung anzeigen
-            QMessageBox.information(self, "Erfolg", f"PDF wurde erfolgreich erstellt:\n{filename}")
-            
-            # PDF öffnen
             open_pdf(filename)
-                
-        except ImportError:
-            QMessageBox.critical(self, "Fehler", "Reportlab-Bibliothek nicht verfügbar.")
         except Exception as e:
-            QMessageBox.critical(self, "Fehler", f"Fehler beim Erstellen oder Öffnen der PDF:\n{str(e)}")
+            QMessageBox.critical(self, "Fehler", f"Fehler beim Öffnen der PDF:\n{str(e)}")
+
+    def _ask_export_target(self) -> Optional[Tuple[str, str]]:
+        """Fragt Klasse (leer für alle) und Zielordner eines Sammelexports ab."""
+        if not REPORTLAB_AVAILABLE:
+            QMessageBox.warning(self, "Fehler", 
+                                "Reportlab-Bibliothek nicht verfügbar. Bitte installieren Sie 'reportlab' mit dem Befehl:\npip install reportlab")
+            return None
+        if self._export_worker is not None:
+            return None
+        
+        class_filter = self.class_filter_combo.currentText()
+        if class_filter == "Alle Klassen":
+            class_filter = ""
+        if not class_filter:
+            reply = QMessageBox.question(
+                self, "Alle Schüler exportieren",
+                "Es ist keine Klasse ausgewählt. Sollen alle Schüler exportiert werden?",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+            )
+            if reply != QMessageBox.StandardButton.Yes:
+                return None
+        
+        output_dir = QFileDialog.getExistingDirectory(self, "Zielordner für die PDF-Dateien wählen")
+        if not output_dir:
+            return None
+        return class_filter, output_dir
+
+    def export_class_to_pdf(self) -> None:
+        """Exportiert alle Schüler der gewählten Klasse parallel als einzelne PDFs"""
+        target = self._ask_export_target()
+        if target is None:
+            return
+        class_filter, output_dir = target
+        
+        self.db_worker.submit(
+            "get_students", class_filter or None,
+            on_result=lambda students: self._start_batch_export(students, output_dir),
+            on_error=lambda e: QMessageBox.critical(
+                self, "Fehler", f"Fehler beim Laden der Schüler:\n{str(e)}")
+        )
+
+    def _start_batch_export(self, students: List[Tuple], output_dir: str) -> None:
+        if not students:
+            QMessageBox.information(self, "Hinweis", "Keine Schüler zum Exportieren gefunden.")
+            return
+        
+        # Der Exportthread liest die Daten blockweise, die Export-Prozesse
+        # erstellen nur die PDFs und öffnen die Datenbank nicht
+        worker = BatchExportWorker(self.db_worker.db_path, students, output_dir, self)
+        worker.export_finished.connect(self._on_batch_export_finished)
+        worker.export_failed.connect(self._on_batch_export_failed)
+        self._start_export_worker(worker, "Klasse exportieren", len(students))
+
+    def export_class_booklet(self) -> None:
+        """Erstellt ein gemeinsames PDF-Heft aller Schüler der gewählten Klasse"""
+        target = self._ask_export_target()
+        if target is None:
+            return
+        class_filter, output_dir = target
+        
+        worker = BookletExportWorker(self.db_worker.db_path, class_filter, output_dir, self)
+        worker.booklet_finished.connect(self._on_booklet_finished)
+        worker.export_failed.connect(self._on_batch_export_failed)
+        self._start_export_worker(worker, "Klassenheft erstellen", 0)
+
+    def _start_export_worker(self, worker: QThread, title: str, total: int) -> None:
+        """Startet einen Export-Thread mit abbrechbarem Fortschrittsdialog."""
+        self._export_progress = QProgressDialog(
+            "PDF wird erstellt...", "Abbrechen", 0, total, self)
+        self._export_progress.setWindowTitle(title)
+        self._export_progress.setWindowModality(Qt.WindowModality.WindowModal)
+        self._export_progress.setMinimumDuration(0)
+        self._export_progress.setValue(0)
+        
+        worker.progress_changed.connect(self._on_export_progress)
+        worker.finished.connect(worker.deleteLater)
+        self._export_progress.canceled.connect(worker.cancel)
+        self._export_worker = worker
+        self.export_class_button.setEnabled(False)
+        self.export_booklet_button.setEnabled(False)
+        worker.start()
+
+    def _on_export_progress(self, done: int, total: int) -> None:
+        if self._export_progress is not None:
+            self._export_progress.setMaximum(total)
+            self._export_progress.setLabelText(f"PDF wird erstellt... ({done} von {total} Schülern)")
+            self._export_progress.setValue(done)
+
+    def _end_export(self) -> None:
+        if self._export_progress is not None:
+            self._export_progress.close()
+            self._export_progress = None
+        self._export_worker = None
+        self.export_class_button.setEnabled(REPORTLAB_AVAILABLE)
+        self.export_booklet_button.setEnabled(REPORTLAB_AVAILABLE)
+
+    def _on_batch_export_finished(self, filenames: List[str], errors: List[Tuple[Tuple, str]],
+                                  cancelled: bool) -> None:
+        self._end_export()
+        message = f"{len(filenames)} PDF-Dateien wurden erstellt."
+        if cancelled:
+            message = f"Export abgebrochen. {message}"
+        if filenames and not cancelled:
+            # Alle PDFs der Klasse in der Vorschau durchblättern
+            self.show_pdf_preview(sorted(filenames))
+        if errors:
+            # Nur die ersten Fehler auflisten, damit die Meldung lesbar bleibt
+            details = "\n".join(
+                f"{student[1]} {student[2]}: {error}" for student, error in errors[:10])
+            QMessageBox.warning(
+                self, "Warnung", f"{message}\n{len(errors)} Fehler:\n{details}")
+        else:
+            QMessageBox.information(self, "Erfolg", message)
+
+    def _on_booklet_finished(self, filename: str, cancelled: bool) -> None:
+        self._end_export()
+        if cancelled:
+            QMessageBox.information(self, "Hinweis", "Das Klassenheft wurde abgebrochen.")
+            return
+        self.statusBar().showMessage(f"Klassenheft wurde erfolgreich erstellt: {filename}", 10000)
+        self.open_pdf_viewer(filename)
+
+    def _on_batch_export_failed(self, error: Exception) -> None:
+        self._end_export()
+        QMessageBox.critical(self, "Fehler", f"Fehler beim Exportieren der Klasse:\n{str(error)}")
 
     def add_student(self) -> None:
         firstname = self.firstname_edit.text().strip()
         lastname = self.lastname_edit.text().strip()
         klass = self.class_edit.text().strip().upper()
         
-        try:
-            # Validierung in der Datenbank-Klasse
-            self.db_manager.add_student(firstname, lastname, klass)
-            self.firstname_edit.clear()
-            self.lastname_edit.clear()
-            self.class_edit.clear()
-            
-            # Klassenfilter aktualisieren, falls neue Klasse hinzugefügt wurde
-            self.update_class_filter()
-            
-            self.load_students()
-        except ValueError as e:
-            QMessageBox.warning(self, "Warnung", str(e))
-        except Exception as e:
-            QMessageBox.critical(self, "Fehler", f"Fehler beim Hinzufügen des Schülers:\n{str(e)}")
+        # Validierung in der Datenbank-Klasse
+        self.db_worker.submit(
+            "add_student", firstname, lastname, klass,
+            on_result=self._on_student_added, on_error=self._on_add_student_failed
+        )
+
+    def _on_student_added(self, _student_id: int) -> None:
+        # Tabelle und Klassenfilter werden über on_data_changed aktualisiert
+        self.firstname_edit.clear()
+        self.lastname_edit.clear()
+        self.class_edit.clear()
+
+    def _on_add_student_failed(self, error: Exception) -> None:
+        if isinstance(error, ValueError):
+            QMessageBox.warning(self, "Warnung", str(error))
+        else:
+            QMessageBox.critical(self, "Fehler", f"Fehler beim Hinzufügen des Schülers:\n{str(error)}")
 
     def update_class_filter(self) -> None:
         """Aktualisiert die Klassenfilter-ComboBox mit allen vorhandenen Klassen"""
+        self.db_worker.submit(
+            "get_unique_classes", key="classes", on_result=self._fill_class_filter,
+            on_error=lambda e: QMessageBox.critical(
+                self, "Fehler", f"Fehler beim Aktualisieren des Klassenfilters:\n{str(e)}")
+        )
+
+    def _fill_class_filter(self, classes: List[str]) -> None:
         try:
             # Aktuelle Auswahl merken
             current_text = self.class_filter_combo.currentText()
             
+            # Beim Neuaufbau nicht bei jedem Eintrag neu filtern
+            self.class_filter_combo.blockSignals(True)
+            
             # ComboBox leeren
             self.class_filter_combo.clear()
             
             # "Alle Klassen" Option hinzufügen
             self.class_filter_combo.addItem("Alle Klassen")
             
-            # Alle Klassen aus der Datenbank abrufen und hinzufügen
-            classes = self.db_manager.get_unique_classes()
+            # Alle Klassen aus der Datenbank hinzufügen
             for class_name in classes:
                 self.class_filter_combo.addItem(class_name)
                 
@@ -238,99 +668,251 @@ class MainWindow(QMainWindow):
                 self.class_filter_combo.setCurrentIndex(index)
             else:
                 self.class_filter_combo.setCurrentIndex(0)  # "Alle Klassen" auswählen
+            self.class_filter_combo.blockSignals(False)
+            
+            # Nur neu laden, wenn sich der Filter dadurch tatsächlich geändert hat
+            if self._class_filter_text(current_text) != self._class_filter_text(
+                    self.class_filter_combo.currentText()):
+                self.apply_filters()
         except Exception as e:
+            self.class_filter_combo.blockSignals(False)
             QMessageBox.critical(self, "Fehler", f"Fehler beim Aktualisieren des Klassenfilters:\n{str(e)}")
 
+    @staticmethod
+    def _class_filter_text(text: str) -> str:
+        """Klassenfilter zum Text der ComboBox, leer für alle Klassen."""
+        return "" if text == "Alle Klassen" else text
+
     def load_students(self) -> None:
+        # Klassenfilterliste beim ersten Laden der App aktualisieren
+        if not self.class_filter_initialized:
+            self.update_class_filter()
+            self.class_filter_initialized = True
+        
+        if self._snapshot is not None:
+            # Filter der letzten Sitzung mit den echten Daten anwenden
+            self.apply_filters()
+            return
+        self.show_loading("Schülerdaten werden geladen...")
+        self._load_first_page("", "Fehler beim Laden der Schüler")
+
+    def _load_first_page(self, class_filter: str, error_text: str) -> None:
+        """Lädt Anzahl und erste Seite der Liste; weitere Seiten folgen beim Scrollen."""
+        # Ein neuer Ladeauftrag ersetzt jede noch laufende Abfrage der Liste
+        self.db_worker.submit(
+            lambda db: (db.get_students_page(None, STUDENT_PAGE_SIZE, class_filter or None),
+                        db.count_students(class_filter or None)),
+            key="students",
+            on_result=lambda result: self._fill_students(class_filter, *result),
+            on_error=lambda e: QMessageBox.critical(self, "Fehler", f"{error_text}:\n{str(e)}")
+        )
+
+    def _fill_students(self, class_filter: str, students: List[Tuple], total: int) -> None:
         try:
-            # Sortierung während des Ladens deaktivieren
-            self.student_table.setSortingEnabled(False)
-            
-            # Klassenfilterliste beim ersten Laden der App aktualisieren
-            if not self.class_filter_initialized:
-                self.update_class_filter()
-                self.class_filter_initialized = True
-            
-            # Restliche Logik für das Laden von Studenten...
-            students = self.db_manager.get_students()  # Bereits nach Klasse sortiert
-            self.student_table.setRowCount(0)
-            for row_index, student in enumerate(students):
-                self.student_table.insertRow(row_index)
-                # ID wird in versteckte Spalte geladen, wird für Funktionalität benötigt
-                for col_index, value in enumerate(student):
-                    self.student_table.setItem(row_index, col_index, QTableWidgetItem(str(value)))
+            roster = not class_filter and total <= FULL_ROSTER_LIMIT
+            keyword, requested_class, in_evaluations = self._requested_filter
+            in_memory = roster and not in_evaluations
+            if self._requested_filter != ("", class_filter, False) and not in_memory:
+                # Inzwischen wurde ein anderer Filter angefordert, sein Ergebnis folgt
+                return
+            self._page_class_filter = class_filter
+            self._shown_filter = ("", class_filter, False)
+            self._shown_total = total
+            has_more = len(students) < total
             
-            # Sortierung wieder aktivieren
-            self.student_table.setSortingEnabled(True)
+            # Bereits nach Klasse sortiert; die ID bleibt in der versteckten Spalte
+            top_student_id = self._end_snapshot()
+            if in_memory:
+                # Was seit dem Auftrag eingetippt wurde, filtert der Proxy in der Liste
+                self.student_proxy.set_filter(keyword, requested_class)
+            else:
+                self.student_proxy.set_filter("", "")
+            self.student_model.set_students(students, has_more=has_more, sorted_column=3)
+            self._roster_loading = roster and has_more
             
             # Standardsortierung nach Klasse (Spalte 3)
-            self.student_table.sortItems(3, Qt.SortOrder.AscendingOrder)
+            self.student_table.sortByColumn(3, Qt.SortOrder.AscendingOrder)
+            if top_student_id is not None:
+                self._scroll_to_student(top_student_id)
+            self.hide_loading()
+            self._show_count()
+            
+            if not has_more:
+                self._on_list_complete()
+            elif roster:
+                # Rest der Schülerliste im Hintergrund laden, danach wird lokal gefiltert
+                self.student_model.load_remaining()
         except Exception as e:
             QMessageBox.critical(self, "Fehler", f"Fehler beim Laden der Schüler:\n{str(e)}")
 
+    def load_more_students(self, after: Optional[Tuple], load_all: bool) -> None:
+        """Lädt die nächste Seite (oder alle restlichen Zeilen) der aktuellen Liste."""
+        limit = -1 if load_all else STUDENT_PAGE_SIZE
+        self.db_worker.submit(
+            "get_students_page", after, limit, self._page_class_filter or None,
+            key="students",
+            on_result=lambda students: self._append_students(students, limit),
+            on_error=self._on_load_more_failed
+        )
+
+    def _on_load_more_failed(self, error: Exception) -> None:
+        # Die Liste bleibt unvollständig, Suchen laufen wieder über die Datenbank
+        self._roster_loading = False
+        QMessageBox.critical(self, "Fehler", f"Fehler beim Laden der Schüler:\n{str(error)}")
+
+    def _append_students(self, students: List[Tuple], limit: int) -> None:
+        has_more = limit > 0 and len(students) == limit
+        self.student_model.append_students(students, has_more)
+        if not has_more:
+            self._on_list_complete()
+
+    def _on_list_complete(self) -> None:
+        """Alle Zeilen der aktuellen Liste liegen im Speicher."""
+        self._roster_loading = False
+        if self._roster_in_memory():
+            # Vollständige Schülerliste: ab jetzt filtert der Proxy ohne Datenbank
+            self._last_result = None
+            self.student_model.reveal_all()
+            self.student_proxy.build_search_keys()
+            self._show_count()
+        else:
+            self._last_result = ("", self._page_class_filter, False, self.student_model.rows())
+
+    def _roster_in_memory(self) -> bool:
+        """True, wenn das Modell alle Schüler ungefiltert und vollständig enthält."""
+        return (self._snapshot is None and self._shown_filter == ("", "", False)
+                and self.student_model.is_loaded() and self.student_model.is_complete())
+
+    def _roster_available(self) -> bool:
+        """True, wenn das Modell die ungefilterte Schülerliste enthält oder gerade vervollständigt."""
+        return self._roster_loading or self._roster_in_memory()
+
     def search_students(self) -> None:
         """Veraltete Methode, wird durch apply_filters ersetzt"""
         self.apply_filters()
 
+    def schedule_search(self) -> None:
+        """Startet die Suche nach einer Tipp-Pause neu und verwirft laufende Suchen."""
+        # Das Laden der Liste läuft unter eigenem Schlüssel weiter
+        self.db_worker.cancel_key("search")
+        self.search_timer.start()
+
     def apply_filters(self) -> None:
         """Wendet sowohl den Textfilter als auch den Klassenfilter auf die Schülerliste an"""
+        self.search_timer.stop()
+        keyword = self.search_edit.text().strip()
+        class_filter = self.class_filter_combo.currentText()
+        # Ohne Suchbegriff spielt die Suche in Bewertungen keine Rolle
+        in_evaluations = self.search_evaluations_check.isChecked() and bool(keyword)
+        
+        # Wenn "Alle Klassen" gewählt ist oder leer, dann keine Klassenfilterung
+        if class_filter == "Alle Klassen":
+            class_filter = ""
+        self._requested_filter = (keyword, class_filter, in_evaluations)
+        
+        # Liegt die ganze Schülerliste im Speicher (oder wird sie gerade
+        # vervollständigt), filtert der Proxy ohne Datenbank
+        if not in_evaluations and self._roster_available():
+            self.db_worker.cancel_key("search")
+            self.student_proxy.set_filter(keyword, class_filter)
+            self._show_count()
+            return
+        
+        # Wurde der Suchbegriff nur verlängert, das letzte Ergebnis im Speicher eingrenzen
+        narrowed = self._narrow_last_result(keyword, class_filter, in_evaluations)
+        if narrowed is not None:
+            self.db_worker.cancel_key("search")
+            self.db_worker.cancel_key("students")
+            self._show_filtered_students(narrowed, keyword, class_filter, in_evaluations)
+            return
+        
+        if keyword:
+            # Volltextsuche, Ergebnisse nach Relevanz sortiert; das Laden der
+            # Liste läuft unter "students" weiter, bis das Ergebnis da ist
+            self.db_worker.submit(
+                "search_students_ranked", keyword, in_evaluations,
+                class_filter or None, key="search",
+                on_result=lambda students: self._on_search_result(
+                    students, keyword, class_filter, in_evaluations),
+                on_error=lambda e: QMessageBox.critical(
+                    self, "Fehler", f"Fehler beim Anwenden der Filter:\n{str(e)}")
+            )
+        else:
+            self.db_worker.cancel_key("search")
+            self._load_first_page(class_filter, "Fehler beim Anwenden der Filter")
+
+    def _on_search_result(self, students: List[Tuple], keyword: str,
+                          class_filter: str, in_evaluations: bool) -> None:
+        if (keyword, class_filter, in_evaluations) != self._requested_filter:
+            # Veraltet, inzwischen wurde ein anderer Filter angefordert
+            return
+        if not in_evaluations and self._roster_available():
+            # Die Schülerliste ist inzwischen da und wird schon im Proxy gefiltert
+            return
+        # Das Ergebnis ersetzt die Liste, ihr Nachladen ist überflüssig
+        self.db_worker.cancel_key("students")
+        self._show_filtered_students(students, keyword, class_filter, in_evaluations)
+
+    def _narrow_last_result(self, keyword: str, class_filter: str,
+                            in_evaluations: bool) -> Optional[List[Tuple]]:
+        """
+        Grenzt das letzte Ergebnis ein, wenn es die neue Suche vollständig enthält.
+
+        Das gilt, wenn Klasse und Modus gleich sind und der neue Suchbegriff
+        den alten verlängert. Bewertungstexte liegen nicht im Speicher, daher
+        wird bei der Suche in Bewertungen immer die Datenbank gefragt.
+        """
+        if self._last_result is None or in_evaluations:
+            return None
+        last_keyword, last_class, last_in_evaluations, rows = self._last_result
+        if last_in_evaluations or last_class != class_filter:
+            return None
+        needle = keyword.casefold()
+        if not needle.startswith(last_keyword.casefold()) or needle == last_keyword.casefold():
+            return None
+        return [
+            row for row in rows
+            if needle in str(row[1]).casefold() or needle in str(row[2]).casefold()
+        ]
+
+    def _show_filtered_students(self, students: List[Tuple], keyword: str,
+                                class_filter: str, in_evaluations: bool) -> None:
+        self._last_result = (keyword, class_filter, in_evaluations, students)
+        self._shown_filter = (keyword, class_filter, in_evaluations)
+        self._shown_total = len(students)
+        self._fill_filtered_students(students, keyword)
+
+    def _fill_filtered_students(self, students: List[Tuple], keyword: str) -> None:
         try:
-            # Sortierung während des Filterns deaktivieren
-            self.student_table.setSortingEnabled(False)
-            
-            keyword = self.search_edit.text().strip()
-            class_filter = self.class_filter_combo.currentText()
-            
-            # Wenn "Alle Klassen" gewählt ist oder leer, dann keine Klassenfilterung
-            if class_filter == "Alle Klassen" or not class_filter:
-                if not keyword:
-                    # Weder Name- noch Klassenfilter aktiv
-                    students = self.db_manager.get_students()
-                else:
-                    # Nur Namenfilter aktiv
-                    students = self.db_manager.search_students(keyword)
-            else:
-                # Klassenfilter (und optional Namenfilter) aktiv
-                cursor = self.db_manager.conn.cursor()
-                if not keyword:
-                    # Nur Klassenfilter
-                    cursor.execute("""
-                        SELECT id, firstname, lastname, class FROM students
-                        WHERE class = ? ORDER BY class
-                    """, (class_filter,))
-                else:
-                    # Klassen- und Namenfilter
-                    cursor.execute("""
-                        SELECT id, firstname, lastname, class FROM students
-                        WHERE (firstname LIKE ? OR lastname LIKE ?) AND class = ?
-                        ORDER BY class
-                    """, (f"%{keyword}%", f"%{keyword}%", class_filter))
-                students = cursor.fetchall()
-            
             # Tabelle mit gefilterten Ergebnissen aktualisieren
-            self.student_table.setRowCount(0)
-            for row_index, student in enumerate(students):
-                self.student_table.insertRow(row_index)
-                for col_index, value in enumerate(student):
-                    self.student_table.setItem(row_index, col_index, QTableWidgetItem(str(value)))
+            top_student_id = self._end_snapshot()
+            self._roster_loading = False
+            self.student_proxy.set_filter("", "")
+            self.student_model.set_students(students)
+            self.hide_loading()
+            self._show_count()
                     
-            # Sortierung wieder aktivieren
-            self.student_table.setSortingEnabled(True)
-            
-            # Standardsortierung nach Klasse
-            self.student_table.sortItems(3, Qt.SortOrder.AscendingOrder)
+            if keyword:
+                # Ohne Sortierspalte bleibt die Relevanzreihenfolge erhalten
+                self.student_table.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+            else:
+                # Standardsortierung nach Klasse
+                self.student_table.sortByColumn(3, Qt.SortOrder.AscendingOrder)
+            if top_student_id is not None:
+                self._scroll_to_student(top_student_id)
         except Exception as e:
             QMessageBox.critical(self, "Fehler", f"Fehler beim Anwenden der Filter:\n{str(e)}")
 
     def delete_student(self) -> None:
         try:
-            selected_row = self.student_table.currentRow()
-            if selected_row == -1:
+            student = self.student_proxy.student_at(self.student_table.currentIndex().row())
+            if student is None:
                 QMessageBox.warning(self, "Warnung", "Bitte wählen Sie einen Schüler aus.")
                 return
                 
             # Bestätigung anfordern
-            student_name = f"{self.student_table.item(selected_row, 1).text()} {self.student_table.item(selected_row, 2).text()}"
+            student_id, firstname, lastname, _klass = student
+            student_name = f"{firstname} {lastname}"
             reply = QMessageBox.question(
                 self, "Schüler löschen",
                 f"Möchten Sie den Schüler '{student_name}' wirklich löschen?\nDies löscht auch alle zugehörigen Arbeitstitel.",
@@ -339,27 +921,100 @@ class MainWindow(QMainWindow):
             )
             
             if reply == QMessageBox.StandardButton.Yes:
-                student_id = int(self.student_table.item(selected_row, 0).text())
-                self.db_manager.delete_student(student_id)
-                # Klassenfilter aktualisieren, falls sich Klassen geändert haben
-                self.update_class_filter()
-                self.load_students()
+                self.db_worker.submit(
+                    "delete_student", student_id,
+                    on_error=lambda e: QMessageBox.critical(
+                        self, "Fehler", f"Fehler beim Löschen des Schülers:\n{str(e)}")
+                )
         except Exception as e:
             QMessageBox.critical(self, "Fehler", f"Fehler beim Löschen des Schülers:\n{str(e)}")
 
-    def open_student_details(self, row: int, column: int) -> None:
+    def open_student_details(self, index: QModelIndex) -> None:
         try:
-            student_id = int(self.student_table.item(row, 0).text())
-            firstname = self.student_table.item(row, 1).text()
-            lastname = self.student_table.item(row, 2).text()
-            klass = self.student_table.item(row, 3).text()
-            student_data = (student_id, firstname, lastname, klass)
-            dialog = StudentDetailDialog(student_data, self.db_manager)
+            student_data = self.student_proxy.student_at(index.row())
+            if student_data is None:
+                return
+            # Änderungen im Dialog kommen einzeln über on_data_changed zurück
+            dialog = StudentDetailDialog(student_data, self.db_worker)
             dialog.exec()
-            self.load_students()
+            
+            # Nur eine Suche in Bewertungstexten kann sich durch den Dialog ändern
+            if dialog.changed_entities and self._shown_filter[2]:
+                self.apply_filters()
         except Exception as e:
             QMessageBox.critical(self, "Fehler", f"Fehler beim Öffnen der Schülerdetails:\n{str(e)}")
 
+    def on_data_changed(self, entity: str, action: str, record_id: int, payload: object) -> None:
+        """Pflegt einzelne Änderungen aus der Datenbank ein, ohne die Liste neu zu laden."""
+        if entity != "student" or payload is None:
+            # Arbeitstitel und Schülerdetails erscheinen nicht in der Liste
+            return
+        student = payload
+        
+        # Das zwischengespeicherte Suchergebnis passt nicht mehr zur Datenbank
+        self._last_result = None
+        
+        if action == "insert":
+            if self._matches_shown_filter(student):
+                self.student_model.insert_student(student)
+                self._set_shown_total(self._shown_total + 1)
+            self._add_class_to_filter(student[3])
+        elif action == "delete":
+            if self.student_model.row_of(record_id) >= 0:
+                self.student_model.remove_student(record_id)
+                self._set_shown_total(self._shown_total - 1)
+            self._remove_class_if_empty(student[3])
+        elif action == "update":
+            self.student_model.update_student(student)
+            self._add_class_to_filter(student[3])
+
+    def _matches_shown_filter(self, student: Tuple) -> bool:
+        keyword, class_filter, in_evaluations = self._shown_filter
+        if class_filter and student[3] != class_filter:
+            return False
+        if not keyword:
+            return True
+        # Ein neuer Schüler hat noch keine Bewertungstexte, nur Namen und Klasse
+        needle = keyword.casefold()
+        fields = (student[1], student[2], student[3]) if in_evaluations else (student[1], student[2])
+        return any(needle in str(value).casefold() for value in fields)
+
+    def _set_shown_total(self, total: int) -> None:
+        self._shown_total = max(total, 0)
+        self._show_count()
+
+    def _show_count(self) -> None:
+        if self.student_proxy.is_filtering():
+            self.statusBar().showMessage(f"{self.student_proxy.rowCount()} Schüler gefunden")
+        elif self._shown_filter != ("", "", False):
+            self.statusBar().showMessage(f"{self._shown_total} Schüler gefunden")
+        else:
+            self.statusBar().showMessage(f"{self._shown_total} Schüler")
+
+    def _add_class_to_filter(self, klass: str) -> None:
+        """Fügt eine neue Klasse sortiert in den Klassenfilter ein (Index 0 ist "Alle Klassen")."""
+        if not klass or self.class_filter_combo.findText(klass) >= 0:
+            return
+        position = 1
+        while (position < self.class_filter_combo.count()
+               and self.class_filter_combo.itemText(position) < klass):
+            position += 1
+        self.class_filter_combo.insertItem(position, klass)
+
+    def _remove_class_if_empty(self, klass: str) -> None:
+        """Entfernt eine Klasse aus dem Klassenfilter, wenn sie keine Schüler mehr hat."""
+        if not klass:
+            return
+        
+        def remove(count: int) -> None:
+            index = self.class_filter_combo.findText(klass)
+            if count == 0 and index > 0:
+                if self.class_filter_combo.currentIndex() == index:
+                    self.class_filter_combo.setCurrentIndex(0)
+                self.class_filter_combo.removeItem(index)
+        
+        self.db_worker.submit("count_students", klass, on_result=remove)
+
     def close_application(self) -> None:
         # Bestätigungsdialog anzeigen
         reply = QMessageBox.question(
@@ -370,9 +1025,33 @@ class MainWindow(QMainWindow):
         )
         
         if reply == QMessageBox.StandardButton.Yes:
-            # Datenbank-Verbindung sauber schließen
-            try:
-                self.db_manager.close()
-            except:
-                pass
+            self.shutdown()
             QApplication.instance().quit()
+
+    def closeEvent(self, event: QCloseEvent) -> None:
+        self.shutdown()
+        super().closeEvent(event)
+
+    def shutdown(self) -> None:
+        """Schreibt ausstehende Aufträge und schließt die Datenbank-Verbindung sauber."""
+        try:
+            # Laufenden Sammelexport abbrechen und auf die Prozesse warten
+            if self._export_worker is not None:
+                self._export_worker.cancel()
+                self._export_worker.wait()
+            for worker in list(self._student_exports):
+                worker.wait()
+            # Wird vor dem Beenden noch vom Worker geschrieben
+            self._save_snapshot()
+            self.db_worker.stop()
+        except Exception:
+            pass
+
+    def on_database_error(self, error: Exception) -> None:
+        """Fehler von Hintergrundaufträgen ohne eigene Fehlerbehandlung."""
+        self.statusBar().showMessage(f"Datenbankfehler: {str(error)}", 10000)
+
+    def on_connection_failed(self, error: Exception) -> None:
+        self.show_loading("Datenbank konnte nicht geöffnet werden.")
+        self.loading_bar.setVisible(False)
+        QMessageBox.critical(self, "Fehler", f"Datenbank konnte nicht geöffnet werden:\n{str(error)}")
@@ -0,0 +1,226 @@
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import cm
+from reportlab.lib.utils import simpleSplit
+from reportlab.pdfbase.pdfmetrics import getDescent, stringWidth
+from reportlab.pdfgen import canvas
+
+from pdf_export import ReportTemplate
+
+# Eine Textzeile einer Tabellenzelle: (Schriftart, Größe, Zeilen)
+_CellText = Tuple[str, float, List[str]]
+
+class CanvasReportRenderer:
+    """
+    Zeichnet den Schülerbericht direkt auf einen reportlab-Canvas.
+
+    Der Bericht hat immer dieselbe Form (Titel, Detailtabelle, je Arbeitstitel
+    eine Tabelle). Statt ihn wie platypus für jeden Schüler neu zu setzen,
+    sind Ränder, Spaltenpositionen, Schriften und die umbrochenen
+    Zeilenbeschriftungen hier vorberechnet; pro Schüler werden nur die Werte
+    umbrochen und Zeile für Zeile von oben nach unten gezeichnet. Das Layout
+    entspricht dem der platypus-Vorlage (ReportTemplate), lange Werte werden
+    zusätzlich innerhalb der Zelle umbrochen.
+    """
+
+    PAGE_WIDTH, PAGE_HEIGHT = A4
+    # Seitenränder wie in _create_document plus der Innenabstand des platypus-Frames
+    FRAME_PADDING = 6
+    LEFT = 1.5*cm + FRAME_PADDING
+    RIGHT = PAGE_WIDTH - 1.5*cm - FRAME_PADDING
+    TOP = PAGE_HEIGHT - 1*cm - FRAME_PADDING
+    BOTTOM = 1*cm + FRAME_PADDING
+
+    LABEL_WIDTH = 5*cm
+    VALUE_WIDTH = 11*cm
+    # Tabellen werden wie bei platypus im Frame zentriert
+    TABLE_X = LEFT + (RIGHT - LEFT - LABEL_WIDTH - VALUE_WIDTH) / 2
+    PADDING_X = 6
+    PADDING_TOP = 3
+    PADDING_BOTTOM = 3
+    LEADING = 12
+
+    FONT = "Helvetica"
+    BOLD_FONT = "Helvetica-Bold"
+
+    def __init__(self) -> None:
+        # Wortbreiten je (Schriftart, Größe); Bewertungstexte wiederholen viele Wörter
+        self._word_widths: Dict[Tuple[str, float], Dict[str, float]] = {}
+        self._label_text_width = self.LABEL_WIDTH - 2 * self.PADDING_X
+        self._value_text_width = self.VALUE_WIDTH - 2 * self.PADDING_X
+        # Beschriftungen sind fest und werden nur einmal umbrochen;
+        # die erste Zeile jeder Tabelle ist fett wie in der Vorlage
+        self._detail_labels = self._label_cells(ReportTemplate.DETAIL_LABELS, 10)
+        self._work_labels = self._label_cells(ReportTemplate.WORK_TITLE_LABELS, 8)
+
+    def _label_cells(self, labels: Sequence[str], body_size: float) -> List[_CellText]:
+        cells = []
+        for row, label in enumerate(labels):
+            font, size = (self.BOLD_FONT, 10) if row == 0 else (self.FONT, body_size)
+            cells.append((font, size, simpleSplit(label, font, size, self._label_text_width)))
+        return cells
+
+    def render(self, filename: str, firstname: str, lastname: str, klass: str,
+               student_details: Optional[Tuple], work_titles: List[Tuple]) -> None:
+        """Schreibt den Bericht eines Schülers nach filename."""
+        canv = canvas.Canvas(filename, pagesize=A4)
+        canv.setStrokeColor(colors.black)
+        canv.setLineWidth(1)
+        page = _PageCursor(canv, self.TOP, self.BOTTOM)
+
+        # Titel: zentriert, fett, 18/22, danach 12 pt Abstand und Spacer 0,5 cm
+        title = f"Schülerdaten: {firstname} {lastname}, Klasse: {klass}"
+        self._heading(page, title, self.BOLD_FONT, 18, 22, 0, 12, centred=True)
+        page.y -= 0.5*cm
+
+        if student_details:
+            self._heading(page, "Schülerdetails:", self.BOLD_FONT, 14, 18, 6, 6)
+            # Erste Zeile beider Spalten fett, unten 6 pt Innenabstand
+            self._table(page, self._detail_labels, student_details, 10, bold_first_value=True)
+            page.y -= 0.5*cm
+
+        if work_titles:
+            self._heading(page, "Arbeitstitel:", self.BOLD_FONT, 14, 18, 6, 6)
+            for work in work_titles:
+                self._heading(page, "Arbeitstitel:", "Helvetica-BoldOblique", 12, 14, 4, 4)
+                # Spalte 0 ist die ID
+                self._table(page, self._work_labels, work[1:], 8, bold_first_value=False)
+                page.y -= 0.3*cm
+
+        canv.showPage()
+        canv.save()
+
+    def _heading(self, page: "_PageCursor", text: str, font: str, size: float,
+                 leading: float, space_before: float, space_after: float,
+                 centred: bool = False) -> None:
+        lines = simpleSplit(text, font, size, self.RIGHT - self.LEFT)
+        # Überschrift nicht allein am Seitenende stehen lassen
+        page.ensure_space(space_before + len(lines) * leading + 2 * self.LEADING)
+        if not page.at_top:
+            page.y -= space_before
+        canv = page.canv
+        canv.setFont(font, size)
+        for line in lines:
+            page.y -= leading
+            baseline = page.y + leading - size
+            if centred:
+                canv.drawCentredString((self.LEFT + self.RIGHT) / 2, baseline, line)
+            else:
+                canv.drawString(self.LEFT, baseline, line)
+        page.y -= space_after
+        page.at_top = False
+
+    def _table(self, page: "_PageCursor", labels: List[_CellText], values: Sequence,
+               body_size: float, bold_first_value: bool) -> None:
+        for row, label in enumerate(labels):
+            value = values[row] if row < len(values) and values[row] else ""
+            if row == 0:
+                font, size = (self.BOLD_FONT, 10) if bold_first_value else (self.FONT, 10)
+            else:
+                font, size = self.FONT, body_size
+            value_cell = (font, size, self._wrap(value, font, size, self._value_text_width))
+            bottom_padding = 6 if row == 0 else self.PADDING_BOTTOM
+            self._row(page, label, value_cell, bottom_padding, label_grey=row == 0)
+
+    def _wrap(self, text: str, font: str, size: float, width: float) -> List[str]:
+        """Bricht text wie simpleSplit um, misst aber jedes Wort nur einmal."""
+        widths = self._word_widths.setdefault((font, size), {})
+        space = widths.get(" ")
+        if space is None:
+            space = widths[" "] = stringWidth(" ", font, size)
+        lines: List[str] = []
+        for paragraph in str(text).split("\n"):
+            line: List[str] = []
+            line_width = 0.0
+            for word in paragraph.split():
+                word_width = widths.get(word)
+                if word_width is None:
+                    word_width = widths[word] = stringWidth(word, font, size)
+                if line and line_width + space + word_width > width:
+                    lines.append(" ".join(line))
+                    line, line_width = [word], word_width
+                elif line:
+                    line.append(word)
+                    line_width += space + word_width
+                else:
+                    line, line_width = [word], word_width
+            lines.append(" ".join(line))
+        # Wie simpleSplit: leerer Text ergibt keine Zeilen
+        return [] if lines == [""] else lines
+
+    def _row(self, page: "_PageCursor", label: _CellText, value: _CellText,
+             bottom_padding: float, label_grey: bool) -> None:
+        """Zeichnet eine Tabellenzeile; zu hohe Zeilen werden über Seiten fortgesetzt."""
+        label_lines, value_lines = list(label[2]), list(value[2])
+        while True:
+            available = page.y - page.bottom - self.PADDING_TOP - bottom_padding
+            fit = max(int(available // self.LEADING), 0)
+            needed = max(len(label_lines), len(value_lines), 1)
+            if fit == 0 or (fit < needed and not page.at_top and needed * self.LEADING < page.height):
+                # Zeile passt nicht mehr, auf der nächsten Seite beginnen
+                page.new_page()
+                continue
+            count = min(fit, needed)
+            height = count * self.LEADING + self.PADDING_TOP + bottom_padding
+            bottom = page.y - height
+            self._cell(page.canv, self.TABLE_X, bottom, self.LABEL_WIDTH, height,
+                       (label[0], label[1], label_lines[:count]), bottom_padding,
+                       colors.lightgrey if label_grey else colors.white)
+            self._cell(page.canv, self.TABLE_X + self.LABEL_WIDTH, bottom, self.VALUE_WIDTH, height,
+                       (value[0], value[1], value_lines[:count]), bottom_padding,
+                       None if label_grey else colors.white)
+            page.y = bottom
+            page.at_top = False
+            del label_lines[:count]
+            del value_lines[:count]
+            if not label_lines and not value_lines:
+                return
+            page.new_page()
+
+    def _cell(self, canv: canvas.Canvas, x: float, bottom: float, width: float, height: float,
+              text: _CellText, bottom_padding: float,
+              background: Optional[colors.Color]) -> None:
+        # Hintergrund und Gitterlinie in einem Pfad
+        if background is not None:
+            canv.setFillColor(background)
+        canv.rect(x, bottom, width, height, stroke=1, fill=int(background is not None))
+
+        font, size, lines = text
+        if not lines:
+            return
+        canv.setFillColor(colors.black)
+        # Text unten ausrichten (VALIGN BOTTOM wie bei platypus-Tabellen),
+        # alle Zeilen einer Zelle in einem Textobjekt
+        baseline = bottom + bottom_padding - getDescent(font, size) + (len(lines) - 1) * self.LEADING
+        text_object = canv.beginText(x + self.PADDING_X, baseline)
+        text_object.setFont(font, size, self.LEADING)
+        text_object.textLines(lines, trim=0)
+        canv.drawText(text_object)
+
+class _PageCursor:
+    """Aktuelle Schreibposition von oben nach unten, mit Seitenumbruch."""
+
+    def __init__(self, canv: canvas.Canvas, top: float, bottom: float) -> None:
+        self.canv = canv
+        self.top = top
+        self.bottom = bottom
+        self.height = top - bottom
+        self.y = top
+        self.at_top = True
+
+    def ensure_space(self, height: float) -> None:
+        if not self.at_top and self.y - height < self.bottom:
+            self.new_page()
+
+    def new_page(self) -> None:
+        self.canv.showPage()
+        self.y = self.top
+        self.at_top = True
+
+@lru_cache(maxsize=None)
+def get_canvas_renderer() -> CanvasReportRenderer:
+    """Gibt den Canvas-Renderer dieses Prozesses zurück."""
+    return CanvasReportRenderer()
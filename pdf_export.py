@@ -1,17 +1,130 @@
+import hashlib
+import importlib.util
+import json
 import os
 import sys
-from typing import List, Tuple, Optional
-
-# Importieren der reportlab-Bibliothek für PDF-Erstellung
-try:
-    from reportlab.lib.pagesizes import A4
-    from reportlab.lib import colors
-    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.lib.units import cm
-    REPORTLAB_AVAILABLE = True
-except ImportError:
-    REPORTLAB_AVAILABLE = False
+import tempfile
+import threading
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Tuple, Optional
+
+# Nur prüfen, ob reportlab installiert ist; importiert wird es erst beim
+# ersten Export (load_reportlab), damit der Programmstart nichts davon merkt
+REPORTLAB_AVAILABLE: bool = importlib.util.find_spec("reportlab") is not None
+
+_reportlab_lock = threading.Lock()
+_reportlab_loaded: bool = False
+
+def load_reportlab() -> None:
+    """
+    Importiert die benötigten reportlab-Module in dieses Modul.
+    
+    Der erste Aufruf ist teuer, alle weiteren kosten nichts.
+    
+    Raises:
+        ImportError: Wenn reportlab nicht verfügbar ist
+    """
+    global _reportlab_loaded
+    global A4, colors, SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
+    global getSampleStyleSheet, ParagraphStyle, cm
+    if _reportlab_loaded:
+        return
+    with _reportlab_lock:
+        if _reportlab_loaded:
+            return
+        if not REPORTLAB_AVAILABLE:
+            raise ImportError("Reportlab-Bibliothek nicht verfügbar. Bitte installieren Sie 'reportlab'.")
+        # Importieren der reportlab-Bibliothek für PDF-Erstellung
+        from reportlab.lib.pagesizes import A4
+        from reportlab.lib import colors
+        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
+        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+        from reportlab.lib.units import cm
+        _reportlab_loaded = True
+
+def warm_up() -> None:
+    """Lädt reportlab und die Berichtsvorlage vorab, z. B. in einem Hintergrund-Thread."""
+    if REPORTLAB_AVAILABLE:
+        get_report_template()
+
+def warm_up_in_background() -> None:
+    """Startet warm_up() in einem Daemon-Thread, damit der erste Export schneller beginnt."""
+    if REPORTLAB_AVAILABLE and not _reportlab_loaded:
+        threading.Thread(target=warm_up, name="reportlab-warmup", daemon=True).start()
+
+# Bei jeder Änderung am Aussehen der Berichte erhöhen, damit der
+# Export-Cache alle bereits erstellten PDFs neu erzeugt
+TEMPLATE_VERSION: int = 1
+
+# Verfügbare Renderer für den Schülerbericht:
+#   "platypus": Seitenlayout mit SimpleDocTemplate und Table-Flowables
+#   "canvas":   festes Layout direkt auf dem Canvas (pdf_canvas), schneller bei Massenexporten
+RENDERERS: Tuple[str, ...] = ("platypus", "canvas")
+DEFAULT_RENDERER: str = "platypus"
+
+def report_hash(firstname: str, lastname: str, klass: str,
+                student_details: Optional[Tuple], work_titles: List[Tuple],
+                renderer: str = DEFAULT_RENDERER) -> str:
+    """Prüfsumme über alle Eingaben eines Schülerberichts, die Vorlagenversion und den Renderer."""
+    # Der Standard-Renderer geht nicht ein, damit bestehende Manifeste gültig bleiben
+    version = TEMPLATE_VERSION if renderer == DEFAULT_RENDERER else f"{TEMPLATE_VERSION}-{renderer}"
+    payload = json.dumps(
+        [version, firstname, lastname, klass,
+         list(student_details) if student_details else None,
+         [list(work) for work in work_titles]],
+        ensure_ascii=False, separators=(",", ":")
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class ExportCache:
+    """
+    Manifest der bereits exportierten PDFs eines Zielordners.
+    
+    Zu jeder Datei wird die Prüfsumme ihrer Eingaben gespeichert. Stimmt sie
+    beim nächsten Export überein und existiert die Datei noch, wird die PDF
+    nicht neu erstellt.
+    """
+    
+    MANIFEST_NAME = ".pdf_export_cache.json"
+    
+    def __init__(self, output_dir: str = "") -> None:
+        self.output_dir: str = output_dir
+        self.path: str = os.path.join(output_dir, self.MANIFEST_NAME)
+        self.entries: Dict[str, str] = self._load()
+    
+    def _load(self) -> Dict[str, str]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            # Fehlendes oder beschädigtes Manifest: alles neu erstellen
+            return {}
+        return entries if isinstance(entries, dict) else {}
+    
+    def is_current(self, filename: str, digest: str) -> bool:
+        return self.entries.get(os.path.basename(filename)) == digest and os.path.exists(filename)
+    
+    def record(self, filename: str, digest: str) -> None:
+        self.entries[os.path.basename(filename)] = digest
+    
+    def forget(self, filename: str) -> None:
+        self.entries.pop(os.path.basename(filename), None)
+    
+    def save(self) -> None:
+        write_json_atomic(self.path, self.entries)
+
+def write_json_atomic(path: str, data: object) -> None:
+    """Schreibt JSON über eine temporäre Datei und os.replace, nie halb geschrieben."""
+    directory = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp_", suffix=".json", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=1, sort_keys=True)
+        os.replace(tmp_path, path)
+    except Exception:
+        os.remove(tmp_path)
+        raise
 
 def export_student_to_pdf(
         student_id: int, 
@@ -19,7 +132,11 @@ def export_student_to_pdf(
         lastname: str, 
         klass: str, 
         student_details: Optional[Tuple], 
-        work_titles: List[Tuple]
+        work_titles: List[Tuple],
+        output_dir: str = "",
+        cache: Optional[ExportCache] = None,
+        renderer: str = DEFAULT_RENDERER,
+        name: Optional[str] = None
     ) -> str:
     """
     Exportiert die Daten eines Schülers als PDF und gibt den Dateinamen zurück.
@@ -31,6 +148,12 @@ def export_student_to_pdf(
         klass: Die Klasse des Schülers
         student_details: Die Details des Schülers als Tupel
         work_titles: Liste von Arbeitstiteln des Schülers
+        output_dir: Zielordner; leer für das aktuelle Arbeitsverzeichnis
+        cache: Optionaler Export-Cache; ist die vorhandene PDF aktuell, wird sie
+               nicht neu erstellt. Das Manifest speichert der Aufrufer mit save().
+        renderer: Einer von RENDERERS
+        name: Optionaler Dateiname ohne Ordner, z. B. aus unique_pdf_names;
+              sonst Vorname_Nachname_Klasse.pdf
         
     Returns:
         str: Der Dateiname der erstellten PDF
@@ -39,24 +162,180 @@ def export_student_to_pdf(
         ImportError: Wenn reportlab nicht verfügbar ist
         Exception: Bei sonstigen Fehlern während der PDF-Erstellung
     """
-    if not REPORTLAB_AVAILABLE:
-        raise ImportError("Reportlab-Bibliothek nicht verfügbar. Bitte installieren Sie 'reportlab'.")
+    if renderer not in RENDERERS:
+        raise ValueError(f"Unbekannter Renderer: {renderer}")
     
-    # Dateinamen erstellen und Sonderzeichen ersetzen
-    safe_firstname = firstname.replace(" ", "_").replace("/", "_").replace("\\", "_")
-    safe_lastname = lastname.replace(" ", "_").replace("/", "_").replace("\\", "_")
-    safe_klass = klass.replace(" ", "_").replace("/", "_").replace("\\", "_")
-    filename = f"{safe_firstname}_{safe_lastname}_{safe_klass}.pdf"
+    filename = os.path.join(output_dir, name or student_pdf_name(firstname, lastname, klass))
+    
+    digest = None
+    if cache is not None:
+        digest = report_hash(firstname, lastname, klass, student_details, work_titles, renderer)
+        if cache.is_current(filename, digest):
+            # Unverändert: reportlab wird gar nicht erst geladen
+            return filename
+        # Bis zum erfolgreichen Schreiben gilt die Datei als veraltet
+        cache.forget(filename)
     
+    load_reportlab()
     try:
-        # PDF erstellen
-        doc = SimpleDocTemplate(filename, pagesize=A4,
-                               topMargin=1*cm, bottomMargin=1*cm,
-                               leftMargin=1.5*cm, rightMargin=1.5*cm)
+        if renderer == "canvas":
+            # Festes Layout ohne platypus-Satz
+            from pdf_canvas import get_canvas_renderer
+            get_canvas_renderer().render(filename, firstname, lastname, klass, student_details, work_titles)
+        else:
+            # PDF erstellen
+            doc = _create_document(filename)
+            template = get_report_template()
+            elements = list(template.student_flowables(firstname, lastname, klass, student_details, work_titles))
+            
+            # PDF generieren
+            doc.build(elements)
+        
+        if cache is not None:
+            cache.record(filename, digest)
+        return filename
+        
+    except Exception as e:
+        raise Exception(f"Fehler beim Erstellen der PDF: {str(e)}")
+
+def export_class_booklet(
+        klass: str,
+        students: Iterable[Tuple[Tuple, Optional[Tuple], List[Tuple]]],
+        output_dir: str = ""
+    ) -> str:
+    """
+    Erstellt ein gemeinsames Heft aller übergebenen Schüler, ein Schüler pro Seite(n).
+    
+    Die Schüler werden erst beim Setzen der Seiten aus students gelesen und ihre
+    Elemente danach verworfen, sodass der Speicherbedarf des Seitenlayouts nicht
+    mit der Anzahl der Schüler wächst.
+    
+    Args:
+        klass: Die Klasse, bestimmt den Dateinamen; leer für alle Klassen
+        students: Iterable aus (Schülerzeile (id, firstname, lastname, class),
+                  Details, Arbeitstitel), z. B. DatabaseManager.iter_students_with_work_titles
+        output_dir: Zielordner; leer für das aktuelle Arbeitsverzeichnis
+        
+    Returns:
+        str: Der Dateiname der erstellten PDF
+        
+    Raises:
+        ImportError: Wenn reportlab nicht verfügbar ist
+        Exception: Bei sonstigen Fehlern während der PDF-Erstellung
+    """
+    load_reportlab()
+    
+    filename = os.path.join(output_dir, f"Klasse_{_safe_name(klass) or 'alle'}.pdf")
+    
+    def booklet_flowables() -> Iterator:
+        template = get_report_template()
+        first = True
+        for student, student_details, work_titles in students:
+            if not first:
+                yield PageBreak()
+            first = False
+            _, firstname, lastname, student_klass = student
+            yield from template.student_flowables(
+                firstname, lastname, student_klass or "", student_details, work_titles)
+    
+    try:
+        doc = _create_document(filename)
+        doc.build(_FlowableStream(booklet_flowables()))
+        return filename
+    except Exception as e:
+        raise Exception(f"Fehler beim Erstellen der PDF: {str(e)}")
+
+class _FlowableStream(list):
+    """
+    Liste für doc.build(), die sich erst bei Bedarf aus einem Generator füllt.
+    
+    reportlab arbeitet die Liste von vorne ab und schaut dabei höchstens einige
+    Elemente voraus; es werden daher nie mehr als lookahead Elemente gepuffert.
+    """
+    
+    def __init__(self, source: Iterable, lookahead: int = 32) -> None:
+        super().__init__()
+        self._source: Optional[Iterator] = iter(source)
+        self._lookahead: int = lookahead
+    
+    def _fill(self) -> None:
+        while self._source is not None and super().__len__() < self._lookahead:
+            try:
+                self.append(next(self._source))
+            except StopIteration:
+                self._source = None
+    
+    def __len__(self) -> int:
+        self._fill()
+        return super().__len__()
+    
+    def __getitem__(self, index):
+        self._fill()
+        return super().__getitem__(index)
+
+def student_pdf_name(firstname: str, lastname: str, klass: str,
+                     student_id: Optional[int] = None) -> str:
+    """Dateiname der PDF eines Schülers, mit student_id zur Unterscheidung gleicher Namen."""
+    # Dateinamen erstellen und Sonderzeichen ersetzen
+    base = f"{_safe_name(firstname)}_{_safe_name(lastname)}_{_safe_name(klass)}"
+    return f"{base}_{student_id}.pdf" if student_id is not None else f"{base}.pdf"
+
+def unique_pdf_names(students: Iterable[Tuple]) -> Dict[int, str]:
+    """
+    Dateinamen für mehrere Schüler (id, firstname, lastname, class) in einem Ordner.
+
+    Schüler mit gleichem Namen in derselben Klasse würden dieselbe Datei
+    schreiben; sie erhalten zusätzlich ihre ID. Groß- und Kleinschreibung
+    zählt dabei nicht, weil Windows sie in Dateinamen nicht unterscheidet.
+    Da der Name die Klasse enthält, bekommt ein Schüler in jedem Export,
+    der seine Klasse umfasst, denselben Dateinamen.
+    """
+    students = list(students)
+    counts = Counter(
+        student_pdf_name(firstname or "", lastname or "", klass or "").casefold()
+        for _student_id, firstname, lastname, klass in students
+    )
+    names = {}
+    for student_id, firstname, lastname, klass in students:
+        name = student_pdf_name(firstname or "", lastname or "", klass or "")
+        names[student_id] = (
+            student_pdf_name(firstname or "", lastname or "", klass or "", student_id)
+            if counts[name.casefold()] > 1 else name
+        )
+    return names
+
+def _safe_name(text: str) -> str:
+    """Ersetzt Leer- und Pfadzeichen für die Verwendung im Dateinamen."""
+    return text.replace(" ", "_").replace("/", "_").replace("\\", "_")
+
+def _create_document(filename: str) -> "SimpleDocTemplate":
+    return SimpleDocTemplate(filename, pagesize=A4,
+                             topMargin=1*cm, bottomMargin=1*cm,
+                             leftMargin=1.5*cm, rightMargin=1.5*cm)
+
+class ReportTemplate:
+    """
+    Unveränderliche Bestandteile eines Schülerberichts: Absatzstile,
+    Tabellenstile, Spaltenbreiten und Zeilenbeschriftungen.
+    
+    Wird über get_report_template() einmal pro Prozess erstellt; pro Schüler
+    werden nur noch die Daten eingesetzt.
+    """
+    
+    DETAIL_LABELS: Tuple[str, ...] = (
+        "Soziale Kompetenz", "Aktive Mitarbeit", "Sauberkeit", "Material",
+        "Pünktlichkeit", "Kommentar"
+    )
+    WORK_TITLE_LABELS: Tuple[str, ...] = (
+        "Titel", "Note", "Konzept", "Ausführung", "Technik", "Selbstbeurteilung",
+        "Hat mir gefallen/Nicht gefallen", "Kommentar"
+    )
+    
+    def __init__(self) -> None:
         styles = getSampleStyleSheet()
         
         # Eigene Styles definieren
-        title_style = ParagraphStyle(
+        self.title_style = ParagraphStyle(
             'TitleStyle',
             parent=styles['Heading1'],
             fontSize=18,
@@ -64,7 +343,7 @@ def export_student_to_pdf(
             alignment=1,  # Zentriert
             spaceAfter=12
         )
-        heading2_style = ParagraphStyle(
+        self.heading2_style = ParagraphStyle(
             'Heading2Style',
             parent=styles['Heading2'],
             fontSize=14,
@@ -72,7 +351,7 @@ def export_student_to_pdf(
             spaceBefore=6,
             spaceAfter=6
         )
-        heading3_style = ParagraphStyle(
+        self.heading3_style = ParagraphStyle(
             'Heading3Style',
             parent=styles['Heading3'],
             fontSize=12,
@@ -80,7 +359,7 @@ def export_student_to_pdf(
             spaceBefore=4,
             spaceAfter=4
         )
-        normal_style = ParagraphStyle(
+        self.normal_style = ParagraphStyle(
             'NormalStyle',
             parent=styles['Normal'],
             fontSize=10,
@@ -88,74 +367,66 @@ def export_student_to_pdf(
             spaceAfter=3
         )
         
-        elements = []
-        
+        self.col_widths = [5*cm, 11*cm]
+        self.detail_table_style = TableStyle([
+            ('BACKGROUND', (0,0), (0,-1), colors.lightgrey),
+            ('TEXTCOLOR', (0,0), (0,-1), colors.black),
+            ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0,0), (-1,0), 10),
+            ('BOTTOMPADDING', (0,0), (-1,0), 6),
+            ('BACKGROUND', (0,1), (-1,-1), colors.white),
+            ('GRID', (0,0), (-1,-1), 1, colors.black)
+        ])
+        self.work_table_style = TableStyle([
+            ('BACKGROUND', (0,0), (0,-1), colors.lightgrey),
+            ('TEXTCOLOR', (0,0), (0,-1), colors.black),
+            ('FONTNAME', (0,0), (0,0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0,0), (0,0), 10),
+            ('BOTTOMPADDING', (0,0), (0,0), 6),
+            ('BACKGROUND', (0,1), (-1,-1), colors.white),
+            ('GRID', (0,0), (-1,-1), 1, colors.black),
+            ('FONTSIZE', (0,1), (-1,-1), 8)
+        ])
+    
+    def _table(self, labels: Tuple[str, ...], values: Tuple, style: "TableStyle") -> "Table":
+        data = [[label, value if value else ""] for label, value in zip(labels, values)]
+        table = Table(data, colWidths=self.col_widths)
+        table.setStyle(style)
+        return table
+    
+    def student_flowables(
+            self,
+            firstname: str,
+            lastname: str,
+            klass: str,
+            student_details: Optional[Tuple],
+            work_titles: List[Tuple]
+        ) -> Iterator:
+        """Erzeugt nacheinander die Elemente des Berichts eines Schülers."""
         # Titel
-        elements.append(Paragraph(f"Schülerdaten: {firstname} {lastname}, Klasse: {klass}", title_style))
-        elements.append(Spacer(1, 0.5*cm))
+        yield Paragraph(f"Schülerdaten: {firstname} {lastname}, Klasse: {klass}", self.title_style)
+        yield Spacer(1, 0.5*cm)
         
         # Schülerdetails als Tabelle
         if student_details:
-            data = [
-                ["Soziale Kompetenz", student_details[0] if student_details[0] else ""],
-                ["Aktive Mitarbeit", student_details[1] if student_details[1] else ""],
-                ["Sauberkeit", student_details[2] if student_details[2] else ""],
-                ["Material", student_details[3] if student_details[3] else ""],
-                ["Pünktlichkeit", student_details[4] if student_details[4] else ""],
-                ["Kommentar", student_details[5] if student_details[5] else ""]
-            ]
-            
-            table = Table(data, colWidths=[5*cm, 11*cm])
-            table.setStyle(TableStyle([
-                ('BACKGROUND', (0,0), (0,-1), colors.lightgrey),
-                ('TEXTCOLOR', (0,0), (0,-1), colors.black),
-                ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0,0), (-1,0), 10),
-                ('BOTTOMPADDING', (0,0), (-1,0), 6),
-                ('BACKGROUND', (0,1), (-1,-1), colors.white),
-                ('GRID', (0,0), (-1,-1), 1, colors.black)
-            ]))
-            elements.append(Paragraph("<b>Schülerdetails:</b>", heading2_style))
-            elements.append(table)
-            elements.append(Spacer(1, 0.5*cm))
+            yield Paragraph("<b>Schülerdetails:</b>", self.heading2_style)
+            yield self._table(self.DETAIL_LABELS, student_details, self.detail_table_style)
+            yield Spacer(1, 0.5*cm)
         
         # Arbeitstitel: Pro Arbeitstitel eine eigene Tabelle
         if work_titles:
-            elements.append(Paragraph("<b>Arbeitstitel:</b>", heading2_style))
+            yield Paragraph("<b>Arbeitstitel:</b>", self.heading2_style)
             for work in work_titles:
-                table_data = [
-                    ["Titel", work[1] if work[1] else ""],
-                    ["Note", work[2] if work[2] else ""],
-                    ["Konzept", work[3] if work[3] else ""],
-                    ["Ausführung", work[4] if work[4] else ""],
-                    ["Technik", work[5] if work[5] else ""],
-                    ["Selbstbeurteilung", work[6] if work[6] else ""],
-                    ["Hat mir gefallen/Nicht gefallen", work[7] if work[7] else ""],
-                    ["Kommentar", work[8] if work[8] else ""]
-                ]
-                
-                work_table = Table(table_data, colWidths=[5*cm, 11*cm])
-                work_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0,0), (0,-1), colors.lightgrey),
-                    ('TEXTCOLOR', (0,0), (0,-1), colors.black),
-                    ('FONTNAME', (0,0), (0,0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0,0), (0,0), 10),
-                    ('BOTTOMPADDING', (0,0), (0,0), 6),
-                    ('BACKGROUND', (0,1), (-1,-1), colors.white),
-                    ('GRID', (0,0), (-1,-1), 1, colors.black),
-                    ('FONTSIZE', (0,1), (-1,-1), 8)
-                ]))
-                elements.append(Paragraph(f"<b>Arbeitstitel:</b>", heading3_style))
-                elements.append(work_table)
-                elements.append(Spacer(1, 0.3*cm))
-        
-        # PDF generieren
-        doc.build(elements)
-        
-        return filename
-        
-    except Exception as e:
-        raise Exception(f"Fehler beim Erstellen der PDF: {str(e)}")
+                yield Paragraph(f"<b>Arbeitstitel:</b>", self.heading3_style)
+                # Spalte 0 ist die ID
+                yield self._table(self.WORK_TITLE_LABELS, work[1:], self.work_table_style)
+                yield Spacer(1, 0.3*cm)
+
+@lru_cache(maxsize=None)
+def get_report_template() -> ReportTemplate:
+    """Gibt die Berichtsvorlage dieses Prozesses zurück und erstellt sie beim ersten Aufruf."""
+    load_reportlab()
+    return ReportTemplate()
 
 def open_pdf(filename: str) -> None:
     """
@@ -174,11 +445,12 @@ def open_pdf(filename: str) -> None:
     try:
         if sys.platform == 'win32':
             os.startfile(filename)
-        elif sys.platform == 'darwin':  # macOS
-            import subprocess
-            subprocess.call(['open', filename])
-        else:  # Linux
+        else:
+            # Betrachter losgelöst starten, ohne auf das Programm zu warten
             import subprocess
-            subprocess.call(['xdg-open', filename])
+            opener = 'open' if sys.platform == 'darwin' else 'xdg-open'  # macOS bzw. Linux
+            subprocess.Popen([opener, filename], stdin=subprocess.DEVNULL,
+                             stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                             start_new_session=True)
     except Exception as e:
         raise Exception(f"Fehler beim Öffnen der PDF: {str(e)}")
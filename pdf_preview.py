@@ -0,0 +1,284 @@
+import os
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QScrollArea, QSizePolicy
+)
+from PyQt6.QtCore import Qt, QTimer, QBuffer, QByteArray, QIODevice, QFileSystemWatcher, QSize, pyqtSignal
+from PyQt6.QtGui import QImage, QPixmap
+
+# QtPdf ist ein optionales Modul; ohne es öffnet die App PDFs extern
+try:
+    from PyQt6.QtPdf import QPdfDocument
+    QTPDF_AVAILABLE = True
+except ImportError:
+    QTPDF_AVAILABLE = False
+
+# Schlüssel einer gerenderten Seite: (Pfad, Änderungszeit, Seite, Breite in Pixeln)
+PageKey = Tuple[str, int, int, int]
+
+class PageImageCache:
+    """
+    LRU-Cache für gerenderte PDF-Seiten als QImage, begrenzt nach Speicher.
+
+    Die Änderungszeit der Datei ist Teil des Schlüssels, sodass Seiten einer
+    neu exportierten Datei nie aus dem Cache der alten Fassung kommen.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024) -> None:
+        self.max_bytes: int = max_bytes
+        self._images: "OrderedDict[PageKey, QImage]" = OrderedDict()
+        self._bytes: int = 0
+
+    def get(self, key: PageKey) -> Optional[QImage]:
+        image = self._images.get(key)
+        if image is not None:
+            self._images.move_to_end(key)
+        return image
+
+    def put(self, key: PageKey, image: QImage) -> None:
+        old = self._images.pop(key, None)
+        if old is not None:
+            self._bytes -= old.sizeInBytes()
+        self._images[key] = image
+        self._bytes += image.sizeInBytes()
+        # Am längsten nicht benutzte Seiten verwerfen, die neue aber behalten
+        while self._bytes > self.max_bytes and len(self._images) > 1:
+            _, evicted = self._images.popitem(last=False)
+            self._bytes -= evicted.sizeInBytes()
+
+    def discard_file(self, path: str) -> None:
+        """Verwirft alle Seiten einer Datei, z. B. nach einem neuen Export."""
+        for key in [key for key in self._images if key[0] == path]:
+            self._bytes -= self._images.pop(key).sizeInBytes()
+
+    def clear(self) -> None:
+        self._images.clear()
+        self._bytes = 0
+
+class PdfPreviewWidget(QWidget):
+    """
+    Vorschau für exportierte PDFs innerhalb der App (QtPdf).
+
+    Seiten werden erst gerendert, wenn sie in den sichtbaren Bereich kommen,
+    und im PageImageCache gehalten. Mehrere Dateien (z. B. eine ganze Klasse)
+    lassen sich mit Zurück/Weiter durchblättern. Wird die angezeigte Datei
+    neu geschrieben, lädt die Vorschau sie automatisch neu.
+    """
+
+    # Wird ausgelöst, wenn die aktuelle Datei extern geöffnet werden soll
+    open_external_requested = pyqtSignal(str)
+
+    PAGE_SPACING = 12
+    # Zusätzlich zum sichtbaren Bereich vorab gerenderte Höhe in Pixeln
+    PREFETCH_MARGIN = 400
+
+    def __init__(self, parent=None, cache: Optional[PageImageCache] = None) -> None:
+        super().__init__(parent)
+        self.cache: PageImageCache = cache or PageImageCache()
+        self._files: List[str] = []
+        self._index: int = -1
+        self._path: str = ""
+        self._mtime: int = 0
+        self._page_labels: List[QLabel] = []
+        self._page_sizes: List[Tuple[float, float]] = []
+        self._rendered_width: List[int] = []
+
+        # Dokument aus dem Speicher laden, damit die Datei nicht gesperrt bleibt
+        # und ein neuer Export sie ersetzen kann
+        self._document = QPdfDocument(self)
+        self._buffer: Optional[QBuffer] = None
+
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._on_file_changed)
+        self._reload_timer = QTimer(self)
+        self._reload_timer.setSingleShot(True)
+        self._reload_timer.setInterval(300)
+        self._reload_timer.timeout.connect(self.reload)
+        self._render_timer = QTimer(self)
+        self._render_timer.setSingleShot(True)
+        self._render_timer.setInterval(30)
+        self._render_timer.timeout.connect(self._render_visible_pages)
+
+        self.setup_ui()
+
+    def setup_ui(self) -> None:
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        nav_layout = QHBoxLayout()
+        self.prev_button = QPushButton("◀")
+        self.prev_button.clicked.connect(self.show_previous)
+        self.next_button = QPushButton("▶")
+        self.next_button.clicked.connect(self.show_next)
+        self.file_label = QLabel()
+        self.file_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.file_label.setSizePolicy(QSizePolicy.Policy.Ignored, QSizePolicy.Policy.Preferred)
+        self.external_button = QPushButton("Extern öffnen")
+        self.external_button.clicked.connect(
+            lambda: self._path and self.open_external_requested.emit(self._path))
+        nav_layout.addWidget(self.prev_button)
+        nav_layout.addWidget(self.file_label, 1)
+        nav_layout.addWidget(self.next_button)
+        nav_layout.addWidget(self.external_button)
+        layout.addLayout(nav_layout)
+
+        self.pages_widget = QWidget()
+        self.pages_layout = QVBoxLayout(self.pages_widget)
+        self.pages_layout.setSpacing(self.PAGE_SPACING)
+        self.pages_layout.setAlignment(Qt.AlignmentFlag.AlignTop | Qt.AlignmentFlag.AlignHCenter)
+        self.scroll_area = QScrollArea()
+        self.scroll_area.setWidgetResizable(True)
+        self.scroll_area.setWidget(self.pages_widget)
+        self.scroll_area.verticalScrollBar().valueChanged.connect(self._schedule_render)
+        layout.addWidget(self.scroll_area)
+
+        self.setLayout(layout)
+        self._update_navigation()
+
+    def show_files(self, filenames: List[str], index: int = 0) -> None:
+        """Zeigt eine Liste von PDFs an, beginnend mit filenames[index]."""
+        self._files = [os.path.abspath(f) for f in filenames]
+        self._index = index if self._files else -1
+        self._load_current()
+
+    def show_file(self, filename: str) -> None:
+        """Zeigt eine einzelne PDF an."""
+        self.show_files([filename])
+
+    def show_previous(self) -> None:
+        if self._index > 0:
+            self._index -= 1
+            self._load_current()
+
+    def show_next(self) -> None:
+        if self._index + 1 < len(self._files):
+            self._index += 1
+            self._load_current()
+
+    def current_file(self) -> str:
+        return self._path
+
+    def reload(self) -> None:
+        """Lädt die aktuelle Datei neu, z. B. nachdem sie neu exportiert wurde."""
+        if self._path:
+            self.cache.discard_file(self._path)
+            self._open(self._path)
+
+    def _load_current(self) -> None:
+        path = self._files[self._index] if 0 <= self._index < len(self._files) else ""
+        self._open(path)
+        self._update_navigation()
+
+    def _open(self, path: str) -> None:
+        if self._watcher.files():
+            self._watcher.removePaths(self._watcher.files())
+        self._document.close()
+        if self._buffer is not None:
+            self._buffer.close()
+            self._buffer.deleteLater()
+            self._buffer = None
+        self._path = path
+        self._clear_pages()
+        if not path or not os.path.exists(path):
+            self.file_label.setText("Keine PDF ausgewählt" if not path else f"Nicht gefunden: {os.path.basename(path)}")
+            return
+
+        with open(path, "rb") as f:
+            data = QByteArray(f.read())
+        self._mtime = os.stat(path).st_mtime_ns
+        self._buffer = QBuffer(self)
+        self._buffer.setData(data)
+        self._buffer.open(QIODevice.OpenModeFlag.ReadOnly)
+        self._document.load(self._buffer)
+        self._watcher.addPath(path)
+
+        if self._document.status() != QPdfDocument.Status.Ready:
+            self.file_label.setText(f"PDF konnte nicht geladen werden: {os.path.basename(path)}")
+            return
+
+        # Platzhalter in Seitengröße anlegen, gerendert wird erst bei Sichtbarkeit
+        for page in range(self._document.pageCount()):
+            size = self._document.pagePointSize(page)
+            self._page_sizes.append((size.width(), size.height()))
+            label = QLabel()
+            label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            label.setStyleSheet("background-color: white; border: 1px solid #AAAAAA;")
+            self.pages_layout.addWidget(label)
+            self._page_labels.append(label)
+            self._rendered_width.append(0)
+        self._update_navigation()
+        self._layout_placeholders()
+        self._schedule_render()
+
+    def _clear_pages(self) -> None:
+        for label in self._page_labels:
+            self.pages_layout.removeWidget(label)
+            label.deleteLater()
+        self._page_labels = []
+        self._page_sizes = []
+        self._rendered_width = []
+
+    def _update_navigation(self) -> None:
+        self.prev_button.setEnabled(self._index > 0)
+        self.next_button.setEnabled(0 <= self._index < len(self._files) - 1)
+        self.external_button.setEnabled(bool(self._path))
+        if self._path and self._page_labels:
+            position = f" ({self._index + 1}/{len(self._files)})" if len(self._files) > 1 else ""
+            self.file_label.setText(f"{os.path.basename(self._path)}{position}")
+
+    def _page_width(self) -> int:
+        margins = self.pages_layout.contentsMargins()
+        width = self.scroll_area.viewport().width() - margins.left() - margins.right()
+        return max(width, 100)
+
+    def _layout_placeholders(self) -> None:
+        width = self._page_width()
+        for label, (page_width, page_height) in zip(self._page_labels, self._page_sizes):
+            label.setFixedSize(width, int(width * page_height / page_width))
+
+    def _schedule_render(self) -> None:
+        self._render_timer.start()
+
+    def _render_visible_pages(self) -> None:
+        if not self._page_labels:
+            return
+        viewport = self.scroll_area.viewport()
+        top = self.scroll_area.verticalScrollBar().value() - self.PREFETCH_MARGIN
+        bottom = top + viewport.height() + 2 * self.PREFETCH_MARGIN
+        width = self._page_width()
+        ratio = self.devicePixelRatioF()
+        pixel_width = int(width * ratio)
+        for page, label in enumerate(self._page_labels):
+            y = label.y()
+            if y + label.height() < top or y > bottom:
+                # Weit entfernte Seiten freigeben; sie bleiben im Cache
+                if self._rendered_width[page]:
+                    label.clear()
+                    self._rendered_width[page] = 0
+                continue
+            if self._rendered_width[page] == pixel_width:
+                continue
+            key = (self._path, self._mtime, page, pixel_width)
+            image = self.cache.get(key)
+            if image is None:
+                page_width, page_height = self._page_sizes[page]
+                image = self._document.render(
+                    page, QSize(pixel_width, int(pixel_width * page_height / page_width)))
+                self.cache.put(key, image)
+            pixmap = QPixmap.fromImage(image)
+            pixmap.setDevicePixelRatio(ratio)
+            label.setPixmap(pixmap)
+            self._rendered_width[page] = pixel_width
+
+    def _on_file_changed(self, path: str) -> None:
+        # Beim Ersetzen über eine temporäre Datei verschwindet der Pfad kurz;
+        # erst nach einer kurzen Pause neu laden
+        if path == self._path:
+            self._reload_timer.start()
+
+    def resizeEvent(self, event) -> None:
+        super().resizeEvent(event)
+        self._layout_placeholders()
+        self._schedule_render()
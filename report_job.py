@@ -0,0 +1,232 @@
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from database_manager import DatabaseManager
+from pdf_export import (
+    DEFAULT_RENDERER, RENDERERS, export_student_to_pdf, unique_pdf_names, write_json_atomic
+)
+
+# Zustände eines Schülers im Auftrag
+STATE_PENDING = "pending"
+STATE_DONE = "done"
+STATE_FAILED = "failed"
+
+# Rückmeldung über den Fortschritt: (bearbeitete Schüler, Gesamtzahl, Eintrag)
+JobProgressCallback = Callable[[int, int, Dict[str, Any]], None]
+
+def file_checksum(filename: str) -> str:
+    """SHA-256 einer Datei, zum Prüfen bereits erstellter PDFs."""
+    digest = hashlib.sha256()
+    with open(filename, "rb") as f:
+        for chunk in iter(lambda: f.read(65536), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class ReportJob:
+    """
+    Fortsetzbarer Auftrag, der für viele Schüler (z. B. die ganze Schule)
+    je eine PDF erstellt.
+
+    Das Manifest im Zielordner hält pro Schüler Zustand, Ausgabedatei und
+    Prüfsumme fest und wird nach jedem Schüler atomar gespeichert. Jede PDF
+    wird erst in einen temporären Ordner geschrieben und dann umbenannt, so
+    dass nach einem Absturz nie eine halbe PDF unter dem echten Namen liegt.
+    run() setzt einen unterbrochenen Auftrag beim ersten offenen Schüler fort.
+    """
+
+    MANIFEST_NAME = "report_job.json"
+    TEMP_DIR_NAME = ".report_job_tmp"
+
+    def __init__(self, output_dir: str, manifest: Dict[str, Any]) -> None:
+        self.output_dir: str = output_dir
+        self.manifest: Dict[str, Any] = manifest
+
+    @classmethod
+    def manifest_path(cls, output_dir: str) -> str:
+        return os.path.join(output_dir, cls.MANIFEST_NAME)
+
+    @classmethod
+    def exists(cls, output_dir: str) -> bool:
+        return os.path.exists(cls.manifest_path(output_dir))
+
+    @classmethod
+    def create(cls, db_path: str, output_dir: str, class_filter: Optional[str] = None,
+               renderer: str = DEFAULT_RENDERER) -> "ReportJob":
+        """Legt einen neuen Auftrag für alle Schüler (bzw. eine Klasse) an."""
+        db = DatabaseManager(db_path, read_only=True)
+        try:
+            students = db.get_students(class_filter)
+        finally:
+            db.close()
+        # Dateinamen jetzt festlegen, gleichnamige Schüler einer Klasse erhalten ihre ID
+        names = unique_pdf_names(students)
+
+        os.makedirs(output_dir, exist_ok=True)
+        manifest = {
+            "db_path": os.path.abspath(db_path),
+            "class_filter": class_filter or "",
+            "renderer": renderer,
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "students": [
+                {
+                    "id": student_id,
+                    "firstname": firstname,
+                    "lastname": lastname,
+                    "class": klass or "",
+                    "filename": names[student_id],
+                    "state": STATE_PENDING,
+                    "output": None,
+                    "checksum": None,
+                    "error": None,
+                }
+                for student_id, firstname, lastname, klass in students
+            ],
+        }
+        job = cls(output_dir, manifest)
+        job.save()
+        return job
+
+    @classmethod
+    def load(cls, output_dir: str) -> "ReportJob":
+        """Lädt einen bestehenden Auftrag aus dem Zielordner."""
+        with open(cls.manifest_path(output_dir), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if not isinstance(manifest, dict) or "students" not in manifest:
+            raise ValueError(f"Ungültiges Auftragsmanifest in {output_dir}")
+        # Manifeste älterer Versionen ohne festgelegte Dateinamen ergänzen
+        missing = [entry for entry in manifest["students"] if "filename" not in entry]
+        if missing:
+            names = unique_pdf_names(
+                (entry["id"], entry["firstname"], entry["lastname"], entry["class"])
+                for entry in manifest["students"])
+            for entry in missing:
+                entry["filename"] = names[entry["id"]]
+        return cls(output_dir, manifest)
+
+    @property
+    def entries(self) -> List[Dict[str, Any]]:
+        return self.manifest["students"]
+
+    def save(self) -> None:
+        write_json_atomic(self.manifest_path(self.output_dir), self.manifest)
+
+    def is_done(self, entry: Dict[str, Any]) -> bool:
+        """True, wenn die PDF des Eintrags existiert und unverändert ist."""
+        if entry["state"] != STATE_DONE or not entry["output"]:
+            return False
+        filename = os.path.join(self.output_dir, entry["output"])
+        return os.path.exists(filename) and file_checksum(filename) == entry["checksum"]
+
+    def counts(self) -> Dict[str, int]:
+        result = {STATE_PENDING: 0, STATE_DONE: 0, STATE_FAILED: 0}
+        for entry in self.entries:
+            result[entry["state"]] += 1
+        return result
+
+    def run(self, progress: Optional[JobProgressCallback] = None,
+            cancel_event: Optional[threading.Event] = None,
+            retry_failed: bool = True) -> Dict[str, int]:
+        """
+        Erstellt alle noch offenen PDFs und gibt die Anzahl je Zustand zurück.
+
+        Args:
+            progress: Optionaler Callback (bearbeitet, gesamt, Eintrag)
+            cancel_event: Optionales Event; der Auftrag hält nach dem aktuellen
+                          Schüler an und kann später fortgesetzt werden
+            retry_failed: Fehlgeschlagene Schüler erneut versuchen
+        """
+        temp_dir = os.path.join(self.output_dir, self.TEMP_DIR_NAME)
+        os.makedirs(temp_dir, exist_ok=True)
+        total = len(self.entries)
+        positions = {entry["id"]: index for index, entry in enumerate(self.entries, start=1)}
+        open_entries = {
+            entry["id"]: entry for entry in self.entries
+            if not self.is_done(entry) and (retry_failed or entry["state"] != STATE_FAILED)
+        }
+        db = DatabaseManager(self.manifest["db_path"], read_only=True)
+        try:
+            # Daten aller offenen Schüler blockweise statt einzeln abfragen
+            for student, student_details, work_titles in db.iter_students_with_work_titles(
+                    ids=list(open_entries)):
+                if cancel_event is not None and cancel_event.is_set():
+                    break
+                entry = open_entries.pop(student[0])
+                self._export_entry(entry, student_details, work_titles, temp_dir)
+                self.save()
+                if progress is not None:
+                    progress(positions[entry["id"]], total, entry)
+            else:
+                # Nicht geliefert wurden nur Schüler, die inzwischen gelöscht wurden
+                for entry in open_entries.values():
+                    entry.update(state=STATE_FAILED, error="Schüler wurde inzwischen gelöscht")
+                    self.save()
+                    if progress is not None:
+                        progress(positions[entry["id"]], total, entry)
+        finally:
+            db.close()
+            shutil.rmtree(temp_dir, ignore_errors=True)
+        return self.counts()
+
+    def _export_entry(self, entry: Dict[str, Any], student_details: Optional[Tuple],
+                      work_titles: List[Tuple], temp_dir: str) -> None:
+        try:
+            temp_file = export_student_to_pdf(
+                entry["id"], entry["firstname"], entry["lastname"], entry["class"],
+                student_details, work_titles, temp_dir,
+                renderer=self.manifest.get("renderer", DEFAULT_RENDERER),
+                name=entry["filename"]
+            )
+            checksum = file_checksum(temp_file)
+            output = os.path.basename(temp_file)
+            os.replace(temp_file, os.path.join(self.output_dir, output))
+        except Exception as e:
+            entry.update(state=STATE_FAILED, error=str(e))
+            return
+        entry.update(state=STATE_DONE, output=output, checksum=checksum, error=None)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Kommandozeile: erstellt oder setzt einen Berichtsauftrag ohne Oberfläche fort."""
+    parser = argparse.ArgumentParser(
+        description="Erstellt die PDF-Berichte aller Schüler (oder einer Klasse). "
+                    "Ein unterbrochener Auftrag im Zielordner wird fortgesetzt."
+    )
+    parser.add_argument("output_dir", help="Zielordner für PDFs und Auftragsmanifest")
+    parser.add_argument("--db", default="students.db", help="Pfad zur Datenbank (Standard: students.db)")
+    parser.add_argument("--klasse", default=None, help="Nur diese Klasse exportieren")
+    parser.add_argument("--renderer", choices=RENDERERS, default=DEFAULT_RENDERER,
+                        help=f"PDF-Renderer für neue Aufträge (Standard: {DEFAULT_RENDERER})")
+    parser.add_argument("--neu", action="store_true",
+                        help="Vorhandenen Auftrag verwerfen und neu anlegen")
+    parser.add_argument("--ohne-wiederholung", action="store_true",
+                        help="Fehlgeschlagene Schüler nicht erneut versuchen")
+    args = parser.parse_args(argv)
+
+    if ReportJob.exists(args.output_dir) and not args.neu:
+        job = ReportJob.load(args.output_dir)
+        print(f"Setze Auftrag vom {job.manifest['created']} fort.")
+    else:
+        job = ReportJob.create(args.db, args.output_dir, args.klasse, args.renderer)
+        print(f"Neuer Auftrag mit {len(job.entries)} Schülern angelegt.")
+
+    def report(done: int, total: int, entry: Dict[str, Any]) -> None:
+        status = "OK" if entry["state"] == STATE_DONE else f"FEHLER: {entry['error']}"
+        print(f"[{done}/{total}] {entry['firstname']} {entry['lastname']} ({entry['class']}): {status}")
+
+    try:
+        counts = job.run(progress=report, retry_failed=not args.ohne_wiederholung)
+    except KeyboardInterrupt:
+        print("Abgebrochen. Der Auftrag kann mit demselben Aufruf fortgesetzt werden.")
+        return 130
+    print(f"Fertig: {counts[STATE_DONE]} erstellt, {counts[STATE_FAILED]} fehlgeschlagen, "
+          f"{counts[STATE_PENDING]} offen.")
+    return 1 if counts[STATE_FAILED] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+import json
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+from pdf_export import write_json_atomic
+
+# Höchstens so viele Zeilen der angezeigten Liste werden gespeichert
+SNAPSHOT_ROWS = 500
+
+class SessionSnapshot:
+    """
+    Kompakter Stand der letzten Sitzung für einen sofortigen Start.
+
+    Gespeichert werden die Filter (Suchbegriff, Klasse, Bewertungssuche), die
+    Einträge des Klassenfilters, die ersten angezeigten Zeilen der Liste in
+    Anzeigereihenfolge, Sortierung und oberste sichtbare Zeile sowie der
+    Generationszähler der Datenbank (DatabaseManager.get_generation) zum
+    Zeitpunkt des Speicherns. Stimmt der Zähler beim nächsten Start noch, sind
+    die gespeicherten Zeilen aktuell.
+    """
+
+    VERSION = 1
+
+    def __init__(self, keyword: str = "", class_filter: str = "", in_evaluations: bool = False,
+                 classes: Optional[List[str]] = None, rows: Optional[List[Tuple]] = None,
+                 total: int = 0, sort_column: int = 3, sort_descending: bool = False,
+                 top_student_id: Optional[int] = None, generation: int = -1) -> None:
+        self.keyword: str = keyword
+        self.class_filter: str = class_filter
+        self.in_evaluations: bool = in_evaluations
+        self.classes: List[str] = classes or []
+        # Zeilen (id, firstname, lastname, class)
+        self.rows: List[Tuple] = rows or []
+        self.total: int = total
+        self.sort_column: int = sort_column
+        self.sort_descending: bool = sort_descending
+        self.top_student_id: Optional[int] = top_student_id
+        self.generation: int = generation
+
+    @staticmethod
+    def path_for(db_path: str) -> str:
+        """Die Datei liegt neben der Datenbank, z. B. students.session.json."""
+        return f"{os.path.splitext(os.path.abspath(db_path))[0]}.session.json"
+
+    @classmethod
+    def load(cls, db_path: str) -> Optional["SessionSnapshot"]:
+        """Liest den Stand zur Datenbank; None, wenn keiner existiert oder er unlesbar ist."""
+        try:
+            with open(cls.path_for(db_path), "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if not isinstance(data, dict) or data.get("version") != cls.VERSION:
+                return None
+            return cls(
+                keyword=str(data["keyword"]),
+                class_filter=str(data["class_filter"]),
+                in_evaluations=bool(data["in_evaluations"]),
+                classes=[str(klass) for klass in data["classes"]],
+                rows=[(int(row[0]), str(row[1]), str(row[2]), str(row[3])) for row in data["rows"]],
+                total=int(data["total"]),
+                sort_column=int(data["sort_column"]),
+                sort_descending=bool(data["sort_descending"]),
+                top_student_id=data["top_student_id"],
+                generation=int(data["generation"]),
+            )
+        except (OSError, ValueError, KeyError, TypeError, IndexError):
+            # Fehlender oder beschädigter Stand: normal starten
+            return None
+
+    def save(self, db_path: str) -> None:
+        write_json_atomic(self.path_for(db_path), self.to_dict())
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": self.VERSION,
+            "keyword": self.keyword,
+            "class_filter": self.class_filter,
+            "in_evaluations": self.in_evaluations,
+            "classes": self.classes,
+            "rows": [list(row) for row in self.rows[:SNAPSHOT_ROWS]],
+            "total": self.total,
+            "sort_column": self.sort_column,
+            "sort_descending": self.sort_descending,
+            "top_student_id": self.top_student_id,
+            "generation": self.generation,
+        }
@@ -0,0 +1,416 @@
+from array import array
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, QSortFilterProxyModel, Qt, pyqtSignal
+
+class StudentTableModel(QAbstractTableModel):
+    """
+    Tabellenmodell für die Schülerliste ohne ein Widget-Objekt pro Zelle.
+
+    Die Zeilen liegen spaltenweise in kompakten Containern (IDs als
+    array('q'), Namen und Klassen als Listen von str). Der View bekommt die
+    Zeilen blockweise über canFetchMore/fetchMore zu sehen, sodass auch sehr
+    lange Listen sofort angezeigt werden.
+
+    Die Spalten entsprechen den Datenbankzeilen (id, firstname, lastname, class);
+    die ID steht als int unter IdRole zur Verfügung.
+
+    Liegen in der Datenbank weitere Seiten bereit (set_students mit
+    has_more=True), fordert das Modell sie beim Scrollen über
+    more_rows_requested an; der Besitzer lädt sie und übergibt sie mit
+    append_students().
+
+    row_of() schlägt Zeilen über einen Index ID -> Zeile nach. Einfügen oder
+    Entfernen mitten in der Liste verschiebt die folgenden Zeilen; dann wird
+    der Index verworfen und bei der nächsten Suche einmal neu aufgebaut.
+    Änderungen, die die Sortierposition behalten, bleiben an ihrer Zeile.
+    """
+
+    # Seitenschlüssel der letzten geladenen Zeile, True = alle restlichen Zeilen laden
+    more_rows_requested = pyqtSignal(object, bool)
+
+    IdRole = Qt.ItemDataRole.UserRole + 1
+    HEADERS = ("", "Vorname", "Nachname", "Klasse")
+    FETCH_BATCH_SIZE = 256
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self._ids = array('q')
+        self._firstnames: List[str] = []
+        self._lastnames: List[str] = []
+        self._classes: List[str] = []
+        # Anzahl der Zeilen, die der View bereits kennt
+        self._visible_rows: int = 0
+        # Zustand des seitenweisen Ladens aus der Datenbank; bis zum ersten
+        # set_students() hat das Modell noch gar keine Daten erhalten
+        self._loaded: bool = False
+        self._has_more: bool = False
+        self._request_pending: bool = False
+        # Spalte und Richtung, nach der die Zeilen aktuell sortiert sind
+        self._sorted_by: Optional[Tuple[int, Qt.SortOrder]] = None
+        self._pending_sort: Optional[Tuple[int, Qt.SortOrder]] = None
+        # ID -> Zeile; None, solange er neu aufgebaut werden muss
+        self._row_index: Optional[Dict[int, int]] = None
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._visible_rows
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid() or index.row() >= self._visible_rows:
+            return None
+        row = index.row()
+        if role == self.IdRole:
+            return self._ids[row]
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole):
+            column = index.column()
+            if column == 0:
+                return str(self._ids[row])
+            if column == 1:
+                return self._firstnames[row]
+            if column == 2:
+                return self._lastnames[row]
+            if column == 3:
+                return self._classes[row]
+        return None
+
+    def headerData(self, section: int, orientation: Qt.Orientation,
+                   role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            if 0 <= section < len(self.HEADERS):
+                return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def canFetchMore(self, parent: QModelIndex = QModelIndex()) -> bool:
+        if parent.isValid():
+            return False
+        return self._visible_rows < len(self._ids) or (self._has_more and not self._request_pending)
+
+    def fetchMore(self, parent: QModelIndex = QModelIndex()) -> None:
+        if parent.isValid():
+            return
+        remaining = len(self._ids) - self._visible_rows
+        count = min(self.FETCH_BATCH_SIZE, remaining)
+        if count <= 0:
+            self._request_rows(load_all=False)
+            return
+        self.beginInsertRows(QModelIndex(), self._visible_rows, self._visible_rows + count - 1)
+        self._visible_rows += count
+        self.endInsertRows()
+
+    def _request_rows(self, load_all: bool) -> None:
+        if self._has_more and not self._request_pending:
+            self._request_pending = True
+            self.more_rows_requested.emit(self.last_page_key(), load_all)
+
+    def set_students(self, students: Sequence[Tuple], has_more: bool = False,
+                     sorted_column: int = -1) -> None:
+        """
+        Ersetzt alle Zeilen durch students (id, firstname, lastname, class).
+
+        Args:
+            students: Die (erste Seite der) Zeilen
+            has_more: In der Datenbank liegen weitere Seiten bereit
+            sorted_column: Spalte, nach der students bereits aufsteigend
+                           sortiert ist, -1 für eine andere Reihenfolge
+        """
+        self.beginResetModel()
+        self._ids = array('q', (student[0] for student in students))
+        self._firstnames = [student[1] or "" for student in students]
+        self._lastnames = [student[2] or "" for student in students]
+        self._classes = [student[3] or "" for student in students]
+        self._visible_rows = min(self.FETCH_BATCH_SIZE, len(self._ids))
+        self._loaded = True
+        self._has_more = has_more
+        self._request_pending = False
+        self._pending_sort = None
+        self._sorted_by = (sorted_column, Qt.SortOrder.AscendingOrder) if sorted_column >= 0 else None
+        self._row_index = None
+        self.endResetModel()
+
+    def append_students(self, students: Sequence[Tuple], has_more: bool) -> None:
+        """Hängt eine nachgeladene Seite an und zeigt sie sofort an."""
+        self._request_pending = False
+        self._has_more = has_more
+        if students:
+            first = self._visible_rows
+            if self._row_index is not None:
+                for row, student in enumerate(students, len(self._ids)):
+                    self._row_index[student[0]] = row
+            self._ids.extend(student[0] for student in students)
+            self._firstnames.extend(student[1] or "" for student in students)
+            self._lastnames.extend(student[2] or "" for student in students)
+            self._classes.extend(student[3] or "" for student in students)
+            self.beginInsertRows(QModelIndex(), first, len(self._ids) - 1)
+            self._visible_rows = len(self._ids)
+            self.endInsertRows()
+        if self._pending_sort is not None and not self._has_more:
+            column, order = self._pending_sort
+            self._pending_sort = None
+            self.sort(column, order)
+
+    def load_remaining(self) -> None:
+        """Fordert alle noch nicht geladenen Zeilen aus der Datenbank an."""
+        self._request_rows(load_all=True)
+
+    def reveal_all(self) -> None:
+        """Macht alle geladenen Zeilen sofort für den View sichtbar."""
+        if self._visible_rows < len(self._ids):
+            self.beginInsertRows(QModelIndex(), self._visible_rows, len(self._ids) - 1)
+            self._visible_rows = len(self._ids)
+            self.endInsertRows()
+
+    def last_page_key(self) -> Optional[Tuple[str, str, str, int]]:
+        """Seitenschlüssel (class, lastname, firstname, id) der letzten geladenen Zeile."""
+        if not self._ids:
+            return None
+        return (self._classes[-1], self._lastnames[-1], self._firstnames[-1], self._ids[-1])
+
+    def is_loaded(self) -> bool:
+        """True, sobald das Modell mit set_students() Daten erhalten hat."""
+        return self._loaded
+
+    def is_complete(self) -> bool:
+        """True, wenn alle Zeilen aus der Datenbank geladen sind."""
+        return self._loaded and not self._has_more
+
+    def rows(self) -> List[Tuple[int, str, str, str]]:
+        """Alle geladenen Zeilen als Tupel (id, firstname, lastname, class)."""
+        return list(zip(self._ids, self._firstnames, self._lastnames, self._classes))
+
+    def student_at(self, row: int) -> Optional[Tuple[int, str, str, str]]:
+        """Gibt (id, firstname, lastname, class) der Zeile zurück oder None."""
+        if not 0 <= row < self._visible_rows:
+            return None
+        return (self._ids[row], self._firstnames[row], self._lastnames[row], self._classes[row])
+
+    def total_count(self) -> int:
+        """Anzahl aller geladenen Zeilen, auch der noch nicht angezeigten."""
+        return len(self._ids)
+
+    def sort(self, column: int, order: Qt.SortOrder = Qt.SortOrder.AscendingOrder) -> None:
+        # Spalte -1 bedeutet: vorhandene Reihenfolge (z. B. Relevanz) beibehalten
+        if not 0 <= column < len(self.HEADERS) or not self._ids:
+            return
+        if self._sorted_by == (column, order):
+            return
+        if self._has_more:
+            # Sortieren ist nur über alle Zeilen sinnvoll: Rest laden, danach sortieren
+            self._pending_sort = (column, order)
+            self._request_rows(load_all=True)
+            return
+        permutation = sorted(range(len(self._ids)),
+                             key=lambda i: self._sort_key(column, self._row(i)),
+                             reverse=order == Qt.SortOrder.DescendingOrder)
+
+        self.beginResetModel()
+        self._ids = array('q', (self._ids[i] for i in permutation))
+        self._firstnames = [self._firstnames[i] for i in permutation]
+        self._lastnames = [self._lastnames[i] for i in permutation]
+        self._classes = [self._classes[i] for i in permutation]
+        self._visible_rows = min(max(self._visible_rows, self.FETCH_BATCH_SIZE), len(self._ids))
+        self._sorted_by = (column, order)
+        self._row_index = None
+        self.endResetModel()
+
+    @staticmethod
+    def _sort_key(column: int, student: Tuple[int, str, str, str]) -> Tuple:
+        student_id, firstname, lastname, klass = student
+        if column == 0:
+            return (student_id,)
+        if column == 1:
+            return (firstname.casefold(), lastname.casefold(), student_id)
+        if column == 2:
+            return (lastname.casefold(), firstname.casefold(), student_id)
+        # Wie ORDER BY class, lastname, firstname, id in der Datenbank, damit
+        # nachgeladene Seiten und eingefügte Zeilen zur Reihenfolge passen
+        return (klass, lastname, firstname, student_id)
+
+    def _row(self, row: int) -> Tuple[int, str, str, str]:
+        return (self._ids[row], self._firstnames[row], self._lastnames[row], self._classes[row])
+
+    def row_of(self, student_id: int) -> int:
+        """Zeilenindex des Schülers im Modell oder -1."""
+        if self._row_index is None:
+            self._row_index = {student_id: row for row, student_id in enumerate(self._ids)}
+        return self._row_index.get(student_id, -1)
+
+    def _insert_position(self, student: Tuple[int, str, str, str]) -> int:
+        """Zeile, an der student nach der aktuellen Sortierung einzufügen ist."""
+        if self._sorted_by is None:
+            return len(self._ids)
+        column, order = self._sorted_by
+        key = self._sort_key(column, student)
+        descending = order == Qt.SortOrder.DescendingOrder
+        low, high = 0, len(self._ids)
+        while low < high:
+            middle = (low + high) // 2
+            middle_key = self._sort_key(column, self._row(middle))
+            if (key > middle_key) if descending else (key < middle_key):
+                high = middle
+            else:
+                low = middle + 1
+        return low
+
+    def _fits_at(self, row: int, student: Tuple[int, str, str, str]) -> bool:
+        """True, wenn student in Zeile row zwischen seinen Nachbarn sortiert bleibt."""
+        if self._sorted_by is None:
+            # Ohne Sortierung (z. B. Relevanz) behält jede Zeile ihren Platz
+            return True
+        column, order = self._sorted_by
+        key = self._sort_key(column, student)
+        before = self._sort_key(column, self._row(row - 1)) if row > 0 else None
+        after = self._sort_key(column, self._row(row + 1)) if row + 1 < len(self._ids) else None
+        if order == Qt.SortOrder.DescendingOrder:
+            before, after = after, before
+        return (before is None or before <= key) and (after is None or key <= after)
+
+    def insert_student(self, student: Tuple) -> None:
+        """Fügt eine einzelne Zeile an der passenden Sortierposition ein."""
+        student = (student[0], student[1] or "", student[2] or "", student[3] or "")
+        position = self._insert_position(student)
+        # Hinter der letzten geladenen Zeile kommt der Schüler mit einer späteren Seite
+        if position == len(self._ids) and self._has_more:
+            return
+
+        visible = position <= self._visible_rows
+        if visible:
+            self.beginInsertRows(QModelIndex(), position, position)
+        self._ids.insert(position, student[0])
+        self._firstnames.insert(position, student[1])
+        self._lastnames.insert(position, student[2])
+        self._classes.insert(position, student[3])
+        if self._row_index is not None:
+            if position == len(self._ids) - 1:
+                self._row_index[student[0]] = position
+            else:
+                # Alle folgenden Zeilen sind verschoben
+                self._row_index = None
+        if visible:
+            self._visible_rows += 1
+            self.endInsertRows()
+
+    def remove_student(self, student_id: int) -> None:
+        """Entfernt die Zeile des Schülers, falls sie geladen ist."""
+        row = self.row_of(student_id)
+        if row < 0:
+            return
+        visible = row < self._visible_rows
+        if visible:
+            self.beginRemoveRows(QModelIndex(), row, row)
+        del self._ids[row]
+        del self._firstnames[row]
+        del self._lastnames[row]
+        del self._classes[row]
+        if self._row_index is not None:
+            if row == len(self._ids):
+                del self._row_index[student_id]
+            else:
+                self._row_index = None
+        if visible:
+            self._visible_rows -= 1
+            self.endRemoveRows()
+
+    def update_student(self, student: Tuple) -> None:
+        """Aktualisiert eine Zeile; ändert sich die Sortierposition, wird sie verschoben."""
+        row = self.row_of(student[0])
+        if row < 0:
+            return
+        updated = (student[0], student[1] or "", student[2] or "", student[3] or "")
+        if self._row(row) == updated:
+            return
+        if not self._fits_at(row, updated):
+            self.remove_student(student[0])
+            self.insert_student(updated)
+            return
+        # Sortierposition unverändert: nur die Zeile selbst ändern
+        self._firstnames[row] = updated[1]
+        self._lastnames[row] = updated[2]
+        self._classes[row] = updated[3]
+        if row < self._visible_rows:
+            self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.HEADERS) - 1))
+
+
+class StudentFilterProxyModel(QSortFilterProxyModel):
+    """
+    Filtert die vollständig geladene Schülerliste im Speicher nach Klasse und Name.
+
+    Für jeden Schüler wird einmalig ein Suchschlüssel aus Vor- und Nachname in
+    Kleinschreibung (casefold) abgelegt, sodass ein Tastendruck nur noch
+    Teilstring-Vergleiche kostet. Sortiert wird nicht im Proxy, sondern im
+    Quellmodell, das auch nachgeladene Seiten berücksichtigt.
+    """
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self._keyword: str = ""
+        self._class_filter: str = ""
+        self._search_keys: Dict[int, str] = {}
+
+    def setSourceModel(self, model: StudentTableModel) -> None:
+        # Vor der Verbindung des Proxys, damit er beim Neufiltern nicht den alten Schlüssel nutzt
+        model.dataChanged.connect(self._forget_changed_rows)
+        super().setSourceModel(model)
+        model.modelReset.connect(self._search_keys.clear)
+        model.rowsAboutToBeRemoved.connect(self._forget_rows)
+
+    def set_filter(self, keyword: str, class_filter: str) -> None:
+        """Setzt Suchbegriff und Klasse; leere Werte filtern nicht."""
+        keyword = keyword.strip().casefold()
+        if (keyword, class_filter) == (self._keyword, self._class_filter):
+            return
+        self._keyword = keyword
+        self._class_filter = class_filter
+        self.invalidateFilter()
+
+    def is_filtering(self) -> bool:
+        return bool(self._keyword or self._class_filter)
+
+    def build_search_keys(self) -> None:
+        """Berechnet die Suchschlüssel aller geladenen Zeilen im Voraus."""
+        model = self.sourceModel()
+        for student in model.rows():
+            self._search_keys[student[0]] = self._make_key(student)
+
+    def student_at(self, row: int) -> Optional[Tuple[int, str, str, str]]:
+        """Gibt (id, firstname, lastname, class) der angezeigten Zeile zurück oder None."""
+        source_index = self.mapToSource(self.index(row, 0))
+        if not source_index.isValid():
+            return None
+        return self.sourceModel().student_at(source_index.row())
+
+    def filterAcceptsRow(self, source_row: int, source_parent: QModelIndex) -> bool:
+        if not self._keyword and not self._class_filter:
+            return True
+        student = self.sourceModel().student_at(source_row)
+        if student is None:
+            return False
+        if self._class_filter and student[3] != self._class_filter:
+            return False
+        if self._keyword:
+            key = self._search_keys.get(student[0])
+            if key is None:
+                key = self._search_keys[student[0]] = self._make_key(student)
+            return self._keyword in key
+        return True
+
+    def sort(self, column: int, order: Qt.SortOrder = Qt.SortOrder.AscendingOrder) -> None:
+        self.sourceModel().sort(column, order)
+
+    @staticmethod
+    def _make_key(student: Tuple) -> str:
+        # Zeilenumbruch als Trenner, damit kein Treffer über beide Namen reicht
+        return f"{student[1]}\n{student[2]}".casefold()
+
+    def _forget_changed_rows(self, top_left: QModelIndex, bottom_right: QModelIndex,
+                             roles: Optional[List[int]] = None) -> None:
+        self._forget_rows(QModelIndex(), top_left.row(), bottom_right.row())
+
+    def _forget_rows(self, parent: QModelIndex, first: int, last: int) -> None:
+        model = self.sourceModel()
+        for row in range(first, last + 1):
+            student = model.student_at(row)
+            if student is not None:
+                self._search_keys.pop(student[0], None)
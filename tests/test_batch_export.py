@@ -0,0 +1,111 @@
+import os
+import threading
+
+import pytest
+
+pytest.importorskip("reportlab")
+
+import batch_export
+from batch_export import export_students_parallel
+from database_manager import DatabaseManager
+from pdf_export import ExportCache, report_hash
+
+@pytest.fixture
+def db_path(tmp_path) -> str:
+    path = str(tmp_path / "students.db")
+    db = DatabaseManager(path)
+    for firstname, lastname in (("Anna", "Müller"), ("Ben", "Koch"), ("Clara", "Weber")):
+        student_id = db.add_student(firstname, lastname, "5a")
+        db.add_work_title(student_id, "Farbkreis", "2", "", "", "", "", "", "sorgfältig")
+    db.close()
+    return path
+
+def students(db_path: str):
+    db = DatabaseManager(db_path, read_only=True)
+    try:
+        return db.get_students()
+    finally:
+        db.close()
+
+def no_pool(*args, **kwargs):
+    raise AssertionError("Prozesspool gestartet, obwohl alle PDFs aktuell sind")
+
+def test_parent_writes_manifest(db_path, tmp_path):
+    output_dir = str(tmp_path / "pdf")
+    filenames, errors = export_students_parallel(db_path, students(db_path), output_dir, max_workers=2)
+    assert errors == []
+    assert len(filenames) == 3 and all(os.path.exists(filename) for filename in filenames)
+
+    entries = ExportCache(output_dir).entries
+    assert sorted(entries) == sorted(os.path.basename(filename) for filename in filenames)
+    db = DatabaseManager(db_path, read_only=True)
+    try:
+        for (student_id, firstname, lastname, klass), details, work_titles in \
+                db.iter_students_with_work_titles():
+            digest = report_hash(firstname, lastname, klass, details, work_titles)
+            assert digest in entries.values()
+    finally:
+        db.close()
+
+def test_unchanged_export_skips_pool(db_path, tmp_path, monkeypatch):
+    output_dir = str(tmp_path / "pdf")
+    first, _ = export_students_parallel(db_path, students(db_path), output_dir, max_workers=2)
+    mtimes = {filename: os.stat(filename).st_mtime_ns for filename in first}
+
+    monkeypatch.setattr(batch_export, "ProcessPoolExecutor", no_pool)
+    progress = []
+    second, errors = export_students_parallel(
+        db_path, students(db_path), output_dir, max_workers=2,
+        progress=lambda done, total: progress.append(done))
+    assert errors == []
+    assert sorted(second) == sorted(first)
+    assert progress == [1, 2, 3]
+    assert {filename: os.stat(filename).st_mtime_ns for filename in second} == mtimes
+
+def test_changed_student_is_rendered_again(db_path, tmp_path):
+    output_dir = str(tmp_path / "pdf")
+    rows = students(db_path)
+    first, _ = export_students_parallel(db_path, rows, output_dir, max_workers=2)
+    mtimes = {filename: os.stat(filename).st_mtime_ns for filename in first}
+
+    changed = rows[0]
+    db = DatabaseManager(db_path)
+    db.update_student_fields(changed[0], {"kommentar": "neu bewertet"})
+    db.close()
+
+    second, errors = export_students_parallel(db_path, rows, output_dir, max_workers=2)
+    assert errors == []
+    rewritten = [filename for filename in second if os.stat(filename).st_mtime_ns != mtimes[filename]]
+    assert [os.path.basename(filename) for filename in rewritten] == [f"{changed[1]}_{changed[2]}_5a.pdf"]
+
+    # Eine gelöschte PDF wird trotz gültigem Manifest neu erstellt
+    os.remove(second[0])
+    third, _ = export_students_parallel(db_path, rows, output_dir, max_workers=2)
+    assert os.path.exists(second[0]) and sorted(third) == sorted(second)
+
+def test_cancel_drops_queued_exports(tmp_path):
+    path = str(tmp_path / "many.db")
+    db = DatabaseManager(path)
+    for index in range(40):
+        db.add_student("Anna", f"Müller{index}", "5a")
+    rows = db.get_students()
+    db.close()
+
+    cancel_event = threading.Event()
+    filenames, errors = export_students_parallel(
+        path, rows, str(tmp_path / "pdf"), max_workers=1, use_cache=False,
+        progress=lambda done, total: cancel_event.set(), cancel_event=cancel_event)
+    assert errors == []
+    # Nur bereits laufende bzw. an den Prozess übergebene Exporte werden fertig
+    assert 1 <= len(filenames) < 40
+    assert len(os.listdir(str(tmp_path / "pdf"))) == len(filenames)
+
+def test_deleted_student_is_reported(db_path, tmp_path):
+    rows = students(db_path)
+    db = DatabaseManager(db_path)
+    db.delete_student(rows[1][0])
+    db.close()
+
+    filenames, errors = export_students_parallel(db_path, rows, str(tmp_path / "pdf"), max_workers=1)
+    assert len(filenames) == 2
+    assert errors == [(rows[1], "Schüler wurde inzwischen gelöscht")]
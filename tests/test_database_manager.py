@@ -0,0 +1,227 @@
+"""
+Tests für Schema-Migrationen, Volltextindex und seitenweises Laden des DatabaseManager.
+
+Aufruf aus dem Projektordner:
+    python -m pytest tests
+"""
+import sqlite3
+from typing import List, Tuple
+
+import pytest
+
+from database_manager import SCHEMA_VERSION, DatabaseManager
+
+# Schema der Datenbanken, die vor den versionierten Migrationen angelegt wurden
+BASELINE_SCHEMA = """
+    CREATE TABLE students (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        firstname TEXT NOT NULL,
+        lastname TEXT NOT NULL,
+        class TEXT,
+        soziale_kompetenz TEXT,
+        aktive_mitarbeit TEXT,
+        sauberkeit TEXT,
+        material TEXT,
+        puenktlichkeit TEXT,
+        kommentar TEXT
+    );
+    CREATE TABLE work_titles (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        student_id INTEGER,
+        title TEXT,
+        note TEXT,
+        soziale_kompetenz TEXT,
+        aktive_mitarbeit TEXT,
+        sauberkeit TEXT,
+        material TEXT,
+        puenktlichkeit TEXT,
+        kommentar TEXT,
+        FOREIGN KEY(student_id) REFERENCES students(id)
+    );
+"""
+
+@pytest.fixture
+def db(tmp_path):
+    manager = DatabaseManager(str(tmp_path / "students.db"))
+    yield manager
+    manager.close()
+
+@pytest.fixture
+def baseline_path(tmp_path) -> str:
+    """Datenbank im Schema vor Version 1, mit Schülern ohne Klasse (NULL)."""
+    path = str(tmp_path / "baseline.db")
+    conn = sqlite3.connect(path)
+    conn.executescript(BASELINE_SCHEMA)
+    conn.executemany(
+        "INSERT INTO students (firstname, lastname, class, kommentar) VALUES (?, ?, ?, ?)",
+        [
+            ("Anna", "Müller", "5a", "arbeitet sorgfältig"),
+            ("Ben", "Koch", None, "meist aufmerksam"),
+            ("Clara", "Weber", None, None),
+        ],
+    )
+    conn.execute("INSERT INTO work_titles (student_id, title, note) VALUES (1, 'Farbkreis', '2')")
+    conn.commit()
+    conn.close()
+    return path
+
+def ids(rows: List[Tuple]) -> List[int]:
+    return [row[0] for row in rows]
+
+def test_migrate_baseline_database(baseline_path):
+    db = DatabaseManager(baseline_path)
+    try:
+        assert db.get_schema_version() == SCHEMA_VERSION
+        indexes = {row[0] for row in db.conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert {"idx_work_titles_student", "idx_students_class_name"} <= indexes
+        assert db.count_students() == 3
+        assert len(db.get_work_titles(1)) == 1
+    finally:
+        db.close()
+
+    # Erneutes Öffnen migriert nichts mehr und lässt die Daten unverändert
+    db = DatabaseManager(baseline_path)
+    try:
+        assert db.get_schema_version() == SCHEMA_VERSION
+        assert db.count_students() == 3
+    finally:
+        db.close()
+
+def test_newer_schema_is_rejected(tmp_path):
+    path = str(tmp_path / "future.db")
+    conn = sqlite3.connect(path)
+    conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION + 1}")
+    conn.close()
+    with pytest.raises(RuntimeError):
+        DatabaseManager(path)
+
+def assert_fts_in_sync(db: DatabaseManager) -> None:
+    """Prüft beide Volltextindizes gegen ihre Inhaltstabellen."""
+    for fts in ("students_fts", "work_titles_fts"):
+        # Mit rank = 1 vergleicht SQLite den Index mit der externen Inhaltstabelle
+        db.conn.execute(f"INSERT INTO {fts}({fts}, rank) VALUES ('integrity-check', 1)")
+
+def test_migration_indexes_existing_rows(baseline_path):
+    db = DatabaseManager(baseline_path)
+    try:
+        assert_fts_in_sync(db)
+        assert ids(db.search_students("Müller")) == [1]
+        assert ids(db.search_students_ranked("sorgfältig", True)) == [1]
+        assert ids(db.search_students_ranked("Farbkreis", True)) == [1]
+    finally:
+        db.close()
+
+def test_fts_follows_student_changes(db):
+    student_id = db.add_student("Greta", "Hoffmann", "7b")
+    assert ids(db.search_students("Hoffm")) == [student_id]
+
+    db.update_student_fields(student_id, {"kommentar": "sehr kreativ und ideenreich"})
+    assert ids(db.search_students_ranked("ideenreich", True)) == [student_id]
+    # Nur Namen durchsucht: der Kommentar trifft nicht
+    assert db.search_students_ranked("ideenreich", False) == []
+
+    db.update_student_fields(student_id, {"kommentar": "zuverlässig"})
+    assert db.search_students_ranked("ideenreich", True) == []
+    assert ids(db.search_students_ranked("zuverlässig", True)) == [student_id]
+    assert_fts_in_sync(db)
+
+    db.delete_student(student_id)
+    assert db.search_students("Hoffm") == []
+    assert db.search_students_ranked("zuverlässig", True) == []
+    assert_fts_in_sync(db)
+
+def test_fts_follows_work_title_changes(db):
+    student_id = db.add_student("Theo", "Richter", "8c")
+    work_id = db.add_work_title(student_id, "Tonfigur", "2", "", "", "", "", "", "gut modelliert")
+    assert ids(db.search_students_ranked("Tonfigur", True)) == [student_id]
+
+    db.update_work_title_fields(work_id, {"title": "Mosaik"})
+    assert db.search_students_ranked("Tonfigur", True) == []
+    assert ids(db.search_students_ranked("Mosaik", True)) == [student_id]
+    assert_fts_in_sync(db)
+
+    db.delete_work_title(work_id)
+    assert db.search_students_ranked("Mosaik", True) == []
+    assert_fts_in_sync(db)
+
+def test_short_search_terms_match_class_in_evaluation_mode(db):
+    anna = db.add_student("Anna", "Müller", "5a")
+    db.add_student("Ben", "Koch", "6b")
+    assert ids(db.search_students_ranked("5a", True)) == [anna]
+    assert db.search_students_ranked("5a", False) == []
+    assert ids(db.get_students_page(None, 10, keyword="5a", include_evaluations=True)) == [anna]
+    assert db.count_students(keyword="5a", include_evaluations=True) == 1
+
+def test_migration_replaces_null_classes(baseline_path):
+    db = DatabaseManager(baseline_path)
+    try:
+        assert db.conn.execute("SELECT COUNT(*) FROM students WHERE class IS NULL").fetchone()[0] == 0
+        assert sorted(row[3] for row in db.get_students()) == ["", "", "5a"]
+        # Ohne NULL sind alle Zeilen über den Seitenschlüssel erreichbar
+        first = db.get_students_page(None, 1)
+        assert len(first) + len(db.get_students_page(db.page_key(first[-1]), -1)) == 3
+    finally:
+        db.close()
+
+@pytest.mark.parametrize("class_filter, keyword, include_evaluations", [
+    (None, None, False),
+    ("5a", None, False),
+    (None, "Mü", False),
+    (None, "Schmidt", False),
+    (None, "sorgfältig", True),
+])
+def test_pages_match_count(db, class_filter, keyword, include_evaluations):
+    # Gleiche Namen in einer Klasse: die ID entscheidet die Reihenfolge
+    names = [("Anna", "Müller"), ("Anna", "Müller"), ("Ben", "Schmidt"), ("Lea", "Mühle"), ("Tim", "Koch")]
+    for index in range(23):
+        firstname, lastname = names[index % len(names)]
+        student_id = db.add_student(firstname, lastname, ("5a", "5b", "")[index % 3])
+        if index % 4 == 0:
+            db.update_student_fields(student_id, {"kommentar": "arbeitet sorgfältig"})
+
+    pages: List[Tuple] = []
+    after = None
+    while True:
+        page = db.get_students_page(after, 4, class_filter, keyword, include_evaluations)
+        assert len(page) <= 4
+        pages.extend(page)
+        if len(page) < 4:
+            break
+        after = db.page_key(page[-1])
+
+    count = db.count_students(class_filter, keyword, include_evaluations)
+    assert count > 0
+    assert len(pages) == count
+    assert len(set(ids(pages))) == count
+    assert pages == db.get_students_page(None, -1, class_filter, keyword, include_evaluations)
+    assert pages == sorted(pages, key=lambda row: (row[3], row[2], row[1], row[0]))
+
+def test_students_with_work_titles_match_single_queries(db):
+    for firstname, lastname, klass in (("Ben", "Koch", "6b"), ("Anna", "Müller", "5a"),
+                                       ("Anna", "Müller", "5a"), ("Clara", "Weber", "5a")):
+        student_id = db.add_student(firstname, lastname, klass)
+        db.update_student_fields(student_id, {"kommentar": f"Kommentar {student_id}"})
+    db.add_work_title(1, "Tonfigur", "2", "", "", "", "", "", "")
+    db.add_work_title(3, "Mosaik", "1", "", "", "", "", "", "")
+    db.add_work_title(3, "Farbkreis", "3", "", "", "", "", "", "")
+
+    # Kleine Blöcke, damit auch die Grenzen zwischen den Blöcken geprüft werden
+    result = list(db.iter_students_with_work_titles(batch_size=2))
+    assert [student for student, _details, _works in result] == db.get_students()
+    assert ids([student for student, _details, _works in result]) == [2, 3, 4, 1]
+    for student, details, works in result:
+        assert details == db.get_student_details(student[0])
+        assert works == db.get_work_titles(student[0])
+
+    assert ids([student for student, _, _ in db.iter_students_with_work_titles("5a", batch_size=2)]) == [2, 3, 4]
+
+def test_students_with_work_titles_by_ids(db):
+    for name in ("Anna", "Ben", "Clara", "Dana"):
+        db.add_student(name, "Müller", "5a")
+    db.add_work_title(3, "Mosaik", "1", "", "", "", "", "", "")
+    db.delete_student(2)
+
+    # Reihenfolge der IDs bleibt, gelöschte und unbekannte IDs werden übersprungen
+    result = list(db.iter_students_with_work_titles(ids=[4, 2, 3, 99, 1], batch_size=2))
+    assert ids([student for student, _, _ in result]) == [4, 3, 1]
+    assert [len(works) for _, _, works in result] == [0, 1, 0]
@@ -0,0 +1,61 @@
+import time
+
+import pytest
+
+pytest.importorskip("PyQt6")
+
+from PyQt6.QtCore import QCoreApplication
+
+from db_worker import DatabaseWorker
+
+@pytest.fixture
+def worker(tmp_path):
+    app = QCoreApplication.instance() or QCoreApplication([])
+    db_worker = DatabaseWorker(str(tmp_path / "students.db"))
+    db_worker.start()
+    yield db_worker
+    db_worker.stop()
+    app.processEvents()
+
+def wait_for(worker: DatabaseWorker, timeout: float = 10.0) -> None:
+    """Verarbeitet Ereignisse, bis alle Ergebnisse im Hauptthread verteilt sind."""
+    deadline = time.monotonic() + timeout
+    while worker.pending_count() > 0:
+        assert time.monotonic() < deadline, "Zeitüberschreitung"
+        QCoreApplication.processEvents()
+        time.sleep(0.01)
+
+def test_failed_job_is_rolled_back(worker):
+    def half_written(db) -> None:
+        db.conn.execute("INSERT INTO students (firstname, lastname, class) VALUES ('Anna', 'Müller', '5a')")
+        raise ValueError("abgebrochen")
+
+    errors = []
+    worker.submit(half_written, on_error=errors.append)
+    worker.submit("add_student", "Ben", "Koch", "6b")
+    results = []
+    worker.submit("get_students", on_result=results.append)
+    wait_for(worker)
+
+    assert [type(error) for error in errors] == [ValueError]
+    # Der halbe Auftrag wurde nicht mit dem nächsten festgeschrieben
+    assert [row[1] for row in results[0]] == ["Ben"]
+
+def test_cancel_after_dispatch_is_ignored(worker):
+    results = []
+    job_id = worker.submit("count_students", on_result=results.append)
+    wait_for(worker)
+    worker.cancel(job_id)
+    assert results == [0]
+    assert worker._cancelled == set()
+
+def test_cancel_queued_job(worker):
+    results = []
+    # Hält den Worker auf, damit der zweite Auftrag noch in der Warteschlange liegt
+    worker.submit(lambda db: time.sleep(0.2))
+    job_id = worker.submit("count_students", on_result=results.append)
+    worker.cancel(job_id)
+    worker.submit("count_students", on_result=results.append)
+    wait_for(worker)
+    assert results == [0]
+    assert worker._cancelled == set()
@@ -0,0 +1,66 @@
+import time
+
+import pytest
+
+from database_manager import DatabaseManager
+
+@pytest.fixture
+def window(tmp_path, monkeypatch):
+    pytest.importorskip("PyQt6")
+    monkeypatch.setenv("QT_QPA_PLATFORM", "offscreen")
+    # Der Worker öffnet students.db im aktuellen Ordner
+    monkeypatch.chdir(tmp_path)
+    db = DatabaseManager(str(tmp_path / "students.db"))
+    with db.conn:
+        db.conn.executemany(
+            "INSERT INTO students (firstname, lastname, class) VALUES (?, ?, ?)",
+            [(f"Vorname{index}", f"Name{index}", f"{5 + index % 4}a") for index in range(1200)])
+    db.close()
+
+    from PyQt6.QtWidgets import QApplication
+    from main_window import MainWindow
+
+    app = QApplication.instance() or QApplication([])
+    main_window = MainWindow()
+    yield main_window
+    main_window.shutdown()
+    app.processEvents()
+
+def wait_until(condition, timeout: float = 10.0) -> None:
+    from PyQt6.QtWidgets import QApplication
+
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "Zeitüberschreitung"
+        QApplication.processEvents()
+        time.sleep(0.01)
+
+def search(window, text: str) -> None:
+    window.search_edit.setText(text)
+    # Wie nach Ablauf der Tipp-Pause
+    window.apply_filters()
+
+@pytest.mark.parametrize("wait_for_first_page", [False, True])
+def test_typing_keeps_roster_load(window, wait_for_first_page):
+    window.start_loading()
+    if wait_for_first_page:
+        wait_until(window.student_model.is_loaded)
+    search(window, "Name11")
+    wait_until(lambda: window.db_worker.pending_count() == 0 and window.student_model.is_complete())
+
+    # Die ganze Liste ist geladen, der Proxy zeigt nur die Treffer
+    assert window.student_model.total_count() == 1200
+    names = {window.student_proxy.student_at(row)[2] for row in range(window.student_proxy.rowCount())}
+    assert names == {f"Name{index}" for index in range(1200) if "Name11" in f"Name{index}"}
+
+    # Leeren braucht keine Datenbankabfrage mehr
+    search(window, "")
+    assert window.db_worker.pending_count() == 0
+    assert window.student_proxy.rowCount() == 1200
+
+def test_stale_search_result_is_dropped(window):
+    window.start_loading()
+    wait_until(lambda: window.db_worker.pending_count() == 0 and window.student_model.is_complete())
+    window._requested_filter = ("Name2", "", False)
+    window._on_search_result([(1, "Vorname0", "Name0", "5a")], "Name1", "", True)
+    assert window.student_model.total_count() == 1200
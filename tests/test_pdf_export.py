@@ -0,0 +1,66 @@
+import pytest
+
+pytest.importorskip("reportlab")
+
+from database_manager import DatabaseManager
+from pdf_export import export_class_booklet, get_report_template, unique_pdf_names
+
+@pytest.fixture
+def db_path(tmp_path) -> str:
+    path = str(tmp_path / "students.db")
+    db = DatabaseManager(path)
+    for index in range(7):
+        student_id = db.add_student("Anna", f"Müller{index}", "5a")
+        db.add_work_title(student_id, "Farbkreis", "2", "", "", "", "", "", "sorgfältig")
+    db.close()
+    return path
+
+def test_saving_while_booklet_is_built(db_path, tmp_path):
+    reader = DatabaseManager(db_path, read_only=True)
+    writer = DatabaseManager(db_path)
+    # Nicht auf die Lesesperre warten: ein Schreibfehler zeigt sie sofort
+    writer.conn.execute("PRAGMA busy_timeout = 100")
+    written = []
+
+    def reports():
+        for number, report in enumerate(reader.iter_students_with_work_titles("5a", batch_size=3)):
+            if number == 4:
+                # Mitten im Heft speichert die Oberfläche einen Schüler
+                writer.update_student_fields(report[0][0], {"kommentar": "gespeichert"})
+                written.append(report[0][0])
+            yield report
+
+    try:
+        filename = export_class_booklet("5a", reports(), str(tmp_path))
+        assert written
+        assert writer.get_student_details(written[0])[5] == "gespeichert"
+    finally:
+        reader.close()
+        writer.close()
+    assert filename.endswith("Klasse_5a.pdf")
+
+def test_unique_pdf_names():
+    names = unique_pdf_names([
+        (1, "Anna", "Müller", "5a"),
+        (2, "Anna", "Müller", "5a"),
+        # Windows unterscheidet keine Groß- und Kleinschreibung
+        (3, "ANNA", "müller", "5A"),
+        # Leerzeichen und Unterstrich ergeben denselben Dateinamen
+        (4, "Ben Luca", "Koch", "6b"),
+        (5, "Ben_Luca", "Koch", "6b"),
+        (6, "Anna", "Müller", "6b"),
+        (7, "Clara", "Weber", None),
+    ])
+    assert names == {
+        1: "Anna_Müller_5a_1.pdf",
+        2: "Anna_Müller_5a_2.pdf",
+        3: "ANNA_müller_5A_3.pdf",
+        4: "Ben_Luca_Koch_6b_4.pdf",
+        5: "Ben_Luca_Koch_6b_5.pdf",
+        6: "Anna_Müller_6b.pdf",
+        7: "Clara_Weber_.pdf",
+    }
+    assert len({name.casefold() for name in names.values()}) == len(names)
+
+def test_report_template_is_built_once():
+    assert get_report_template() is get_report_template()
@@ -0,0 +1,82 @@
+import json
+import os
+import threading
+
+import pytest
+
+pytest.importorskip("reportlab")
+
+import report_job
+from database_manager import DatabaseManager
+from report_job import STATE_DONE, STATE_FAILED, STATE_PENDING, ReportJob
+
+@pytest.fixture
+def db_path(tmp_path) -> str:
+    path = str(tmp_path / "students.db")
+    db = DatabaseManager(path)
+    # Zwei gleichnamige Schüler in derselben Klasse
+    for firstname, lastname, klass in (("Anna", "Müller", "5a"), ("Anna", "Müller", "5a"),
+                                       ("Ben", "Koch", "5a"), ("Clara", "Weber", "6b")):
+        db.add_student(firstname, lastname, klass)
+    db.close()
+    return path
+
+def pdf_files(output_dir: str):
+    return sorted(name for name in os.listdir(output_dir) if name.endswith(".pdf"))
+
+def test_cancel_and_resume(db_path, tmp_path):
+    output_dir = str(tmp_path / "job")
+    job = ReportJob.create(db_path, output_dir)
+    cancel_event = threading.Event()
+    counts = job.run(progress=lambda done, total, entry: cancel_event.set(), cancel_event=cancel_event)
+    assert counts == {STATE_PENDING: 3, STATE_DONE: 1, STATE_FAILED: 0}
+    first = pdf_files(output_dir)
+    assert len(first) == 1
+    first_mtime = os.stat(os.path.join(output_dir, first[0])).st_mtime_ns
+    assert not os.path.exists(os.path.join(output_dir, ReportJob.TEMP_DIR_NAME))
+
+    # Ein neuer Prozess setzt den Auftrag aus dem Manifest fort
+    resumed = ReportJob.load(output_dir)
+    assert resumed.run() == {STATE_PENDING: 0, STATE_DONE: 4, STATE_FAILED: 0}
+    assert os.stat(os.path.join(output_dir, first[0])).st_mtime_ns == first_mtime
+    assert len(pdf_files(output_dir)) == 4
+
+def test_same_names_get_distinct_files(db_path, tmp_path):
+    output_dir = str(tmp_path / "job")
+    job = ReportJob.create(db_path, output_dir)
+    job.run()
+    assert pdf_files(output_dir) == ["Anna_Müller_5a_1.pdf", "Anna_Müller_5a_2.pdf",
+                                     "Ben_Koch_5a.pdf", "Clara_Weber_6b.pdf"]
+    # Fortsetzen erkennt alle Dateien als fertig, nichts wird neu erstellt
+    resumed = ReportJob.load(output_dir)
+    assert all(resumed.is_done(entry) for entry in resumed.entries)
+
+def test_old_manifest_gets_filenames(db_path, tmp_path):
+    output_dir = str(tmp_path / "job")
+    ReportJob.create(db_path, output_dir)
+    path = ReportJob.manifest_path(output_dir)
+    with open(path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    for entry in manifest["students"]:
+        del entry["filename"]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+
+    names = sorted(entry["filename"] for entry in ReportJob.load(output_dir).entries)
+    assert names == ["Anna_Müller_5a_1.pdf", "Anna_Müller_5a_2.pdf", "Ben_Koch_5a.pdf", "Clara_Weber_6b.pdf"]
+
+def test_failed_export_leaves_no_partial_file(db_path, tmp_path, monkeypatch):
+    output_dir = str(tmp_path / "job")
+    job = ReportJob.create(db_path, output_dir, class_filter="6b")
+
+    def crash(student_id, firstname, lastname, klass, details, work_titles, output_dir, **kwargs):
+        # Halb geschriebene Datei im temporären Ordner, dann Absturz
+        with open(os.path.join(output_dir, kwargs["name"]), "wb") as f:
+            f.write(b"%PDF-1.4 halb")
+        raise OSError("Datenträger voll")
+
+    monkeypatch.setattr(report_job, "export_student_to_pdf", crash)
+    assert job.run() == {STATE_PENDING: 0, STATE_DONE: 0, STATE_FAILED: 1}
+    assert pdf_files(output_dir) == []
+    assert not os.path.exists(os.path.join(output_dir, ReportJob.TEMP_DIR_NAME))
+    assert "Datenträger voll" in ReportJob.load(output_dir).entries[0]["error"]
@@ -0,0 +1,117 @@
+import os
+import time
+
+import pytest
+
+from database_manager import DatabaseManager
+from session_snapshot import SNAPSHOT_ROWS, SessionSnapshot
+
+def test_round_trip(tmp_path):
+    db_path = str(tmp_path / "students.db")
+    rows = [(index, f"Vorname{index}", "Müller", "5a") for index in range(SNAPSHOT_ROWS + 10)]
+    snapshot = SessionSnapshot(keyword="Mü", class_filter="5a", in_evaluations=True, classes=["5a", "6b"],
+                               rows=rows, total=len(rows), sort_column=2, sort_descending=True,
+                               top_student_id=7, generation=12)
+    snapshot.save(db_path)
+    assert os.path.exists(str(tmp_path / "students.session.json"))
+
+    loaded = SessionSnapshot.load(db_path)
+    assert loaded is not None
+    # Gespeichert werden nur die ersten Zeilen, die Gesamtzahl bleibt
+    assert loaded.rows == rows[:SNAPSHOT_ROWS]
+    assert loaded.total == len(rows)
+    assert (loaded.keyword, loaded.class_filter, loaded.in_evaluations) == ("Mü", "5a", True)
+    assert loaded.classes == ["5a", "6b"]
+    assert (loaded.sort_column, loaded.sort_descending, loaded.top_student_id) == (2, True, 7)
+    assert loaded.generation == 12
+
+@pytest.mark.parametrize("content", ["", "{kaputt", "[]", '{"version": 99}', '{"version": 1}'])
+def test_unreadable_snapshot_is_ignored(tmp_path, content):
+    db_path = str(tmp_path / "students.db")
+    with open(SessionSnapshot.path_for(db_path), "w", encoding="utf-8") as f:
+        f.write(content)
+    assert SessionSnapshot.load(db_path) is None
+
+def test_generation_counts_changes(tmp_path):
+    db = DatabaseManager(str(tmp_path / "students.db"))
+    try:
+        start = db.get_generation()
+        student_id = db.add_student("Anna", "Müller", "5a")
+        after_insert = db.get_generation()
+        assert after_insert > start
+        db.get_students()
+        assert db.get_generation() == after_insert
+        db.add_work_title(student_id, "Farbkreis", "2", "", "", "", "", "", "")
+        assert db.get_generation() > after_insert
+    finally:
+        db.close()
+
+@pytest.fixture
+def make_window(tmp_path, monkeypatch):
+    pytest.importorskip("PyQt6")
+    monkeypatch.setenv("QT_QPA_PLATFORM", "offscreen")
+    # Der Worker öffnet students.db im aktuellen Ordner
+    monkeypatch.chdir(tmp_path)
+    from PyQt6.QtWidgets import QApplication
+    from main_window import MainWindow
+
+    app = QApplication.instance() or QApplication([])
+    windows = []
+
+    def make() -> MainWindow:
+        windows.append(MainWindow())
+        return windows[-1]
+
+    yield make
+    for main_window in windows:
+        main_window.shutdown()
+    app.processEvents()
+
+@pytest.fixture
+def window(make_window):
+    return make_window()
+
+def wait_until(condition, timeout: float = 10.0) -> None:
+    from PyQt6.QtWidgets import QApplication
+
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "Zeitüberschreitung"
+        QApplication.processEvents()
+        time.sleep(0.01)
+
+def test_snapshot_is_not_saved_with_queued_write(window, tmp_path):
+    window.start_loading()
+    wait_until(lambda: window.db_worker.pending_count() == 0 and window.student_model.is_loaded())
+
+    window.firstname_edit.setText("Anna")
+    window.lastname_edit.setText("Müller")
+    window.class_edit.setText("5a")
+    window.add_student()
+    # Die Änderung ist eingereiht, aber noch nicht in der Liste
+    window._save_snapshot()
+    wait_until(lambda: window.db_worker.pending_count() == 0)
+    assert SessionSnapshot.load("students.db") is None
+
+    window._save_snapshot()
+    wait_until(lambda: window.db_worker.pending_count() == 0)
+    snapshot = SessionSnapshot.load("students.db")
+    assert snapshot is not None
+    assert [row[1:] for row in snapshot.rows] == [("Anna", "Müller", "5A")]
+    db = DatabaseManager(str(tmp_path / "students.db"))
+    try:
+        assert snapshot.generation == db.get_generation()
+    finally:
+        db.close()
+
+def test_changed_generation_keeps_snapshot_disabled(make_window):
+    SessionSnapshot(rows=[(1, "Anna", "Müller", "5a")], total=1, generation=3).save("students.db")
+    window = make_window()
+    assert window.student_model.rowCount() == 1
+    assert not window.student_table.isEnabled()
+
+    # Geänderte Datenbank: die alten Zeilen bleiben gesperrt, bis die Liste neu geladen ist
+    window._check_snapshot(4)
+    assert not window.student_table.isEnabled()
+    window._check_snapshot(3)
+    assert window.student_table.isEnabled()
@@ -0,0 +1,70 @@
+import pytest
+
+pytest.importorskip("PyQt6")
+
+from student_model import StudentTableModel
+
+def test_unfilled_model_is_not_complete():
+    # Ein abgebrochener Ladeauftrag darf keine leere, "vollständige" Liste hinterlassen
+    model = StudentTableModel()
+    assert not model.is_loaded()
+    assert not model.is_complete()
+
+    model.set_students([(1, "Anna", "Müller", "5a")], has_more=True)
+    assert model.is_loaded()
+    assert not model.is_complete()
+
+    model.append_students([(2, "Ben", "Koch", "5b")], has_more=False)
+    assert model.is_complete()
+    assert model.rows() == [(1, "Anna", "Müller", "5a"), (2, "Ben", "Koch", "5b")]
+
+def sorted_model() -> StudentTableModel:
+    model = StudentTableModel()
+    model.set_students([(1, "Anna", "Müller", "5a"), (2, "Ben", "Koch", "5b"), (3, "Clara", "Weber", "6a")],
+                       sorted_column=3)
+    return model
+
+def test_row_of_follows_changes():
+    model = sorted_model()
+    assert [model.row_of(student_id) for student_id in (1, 2, 3, 4)] == [0, 1, 2, -1]
+
+    model.insert_student((4, "Dana", "Adler", "5a"))
+    assert [model.row_of(student_id) for student_id in (4, 1, 2, 3)] == [0, 1, 2, 3]
+    model.insert_student((5, "Emil", "Zahn", "7c"))
+    assert model.row_of(5) == 4
+
+    model.remove_student(1)
+    assert [model.row_of(student_id) for student_id in (4, 2, 3, 5, 1)] == [0, 1, 2, 3, -1]
+
+    model.sort(1)
+    assert [row[0] for row in model.rows()] == [2, 3, 4, 5]
+    assert [model.row_of(student_id) for student_id in (2, 3, 4, 5)] == [0, 1, 2, 3]
+
+def test_update_keeps_or_moves_row():
+    model = sorted_model()
+    changed = []
+    model.dataChanged.connect(lambda top_left, bottom_right, roles: changed.append(top_left.row()))
+
+    # Gleiche Klasse und Reihenfolge: die Zeile wird nur geändert
+    model.update_student((2, "Ben", "Kraus", "5b"))
+    assert changed == [1]
+    assert model.student_at(1) == (2, "Ben", "Kraus", "5b")
+
+    # Neue Klasse hinter 6a: die Zeile wandert ans Ende
+    model.update_student((1, "Anna", "Müller", "7a"))
+    assert [row[0] for row in model.rows()] == [2, 3, 1]
+    assert [model.row_of(student_id) for student_id in (2, 3, 1)] == [0, 1, 2]
+
+def test_proxy_filters_updated_name():
+    from student_model import StudentFilterProxyModel
+
+    model = sorted_model()
+    proxy = StudentFilterProxyModel()
+    proxy.setSourceModel(model)
+    proxy.set_filter("koch", "")
+    assert proxy.rowCount() == 1
+
+    model.update_student((2, "Ben", "Kraus", "5b"))
+    assert proxy.rowCount() == 0
+    proxy.set_filter("kraus", "")
+    assert proxy.rowCount() == 1